@@ -0,0 +1,44 @@
+# -*- coding: utf-8 -*-
+import argparse
+from typing import Any, Dict
+
+from queue_policy import SCHEDULE_POLICIES, apply_schedule_policy, item_size, load_queue_record, simulate_drain
+
+# 回放录制的 LLM 队列（LLM_QUEUE_RECORD_PATH），比较各派发策略的排空时间与来源公平性。
+# 有实测耗时（latency_sec）时直接使用，否则按 base + 每字符耗时估算。
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Compare LLM queue scheduling policies on a recorded queue.")
+    parser.add_argument("path", help="recorded queue JSONL (LLM_QUEUE_RECORD_PATH)")
+    parser.add_argument("--workers", type=int, default=4, help="simulated concurrent LLM workers")
+    parser.add_argument("--base-sec", type=float, default=5.0, help="fixed cost per item when latency is missing")
+    parser.add_argument("--per-char-sec", type=float, default=0.002, help="cost per content char when latency is missing")
+    parser.add_argument("--estimate", action="store_true", help="ignore recorded latency and use the length model")
+    args = parser.parse_args()
+
+    records = load_queue_record(args.path)
+    if not records:
+        print("empty queue record")
+        return 1
+
+    def service_time(item: Dict[str, Any]) -> float:
+        latency = item.get("latency_sec")
+        if latency and not args.estimate:
+            return float(latency)
+        return args.base_sec + args.per_char_sec * item_size(item)
+
+    sources = len({r.get("source_id") for r in records})
+    print(f"items={len(records)} sources={sources} workers={args.workers}")
+    print(f"{'policy':<12} {'makespan':>10} {'mean_wait':>10} {'src_first':>10} {'src_first_max':>14} {'src_last':>10}")
+    for policy in SCHEDULE_POLICIES:
+        result = simulate_drain(apply_schedule_policy(records, policy), args.workers, service_time)
+        print(
+            f"{policy:<12} {result['makespan']:>10.1f} {result['mean_wait']:>10.1f} "
+            f"{result['mean_source_first']:>10.1f} {result['max_source_first']:>14.1f} {result['mean_source_last']:>10.1f}"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
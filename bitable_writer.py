@@ -0,0 +1,145 @@
+# -*- coding: utf-8 -*-
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from feishu_client import TenantToken, batch_create_bitable_records
+
+# 飞书 batch_create 单次最多 500 条
+BATCH_CREATE_LIMIT = 500
+
+RecordCallback = Callable[[Optional[str]], None]
+
+
+# 汇总多个线程产生的记录，按条数或等待时长批量写入；
+# 记录级错误时对半拆分重试，单条坏数据只影响自己；
+# 频控、token 失效、网络异常时整批退避重试，仍失败则整批失败，且后续批次不再退避等待。
+class BatchRecordWriter:
+    def __init__(
+        self,
+        app_token: str,
+        table_id: str,
+        tenant_token: TenantToken,
+        timeout: int,
+        retries: int,
+        batch_size: int = BATCH_CREATE_LIMIT,
+        max_age_sec: float = 10.0,
+        backoff_sec: float = 1.0,
+        log: Callable[[str], None] = print,
+    ) -> None:
+        self.app_token = app_token
+        self.table_id = table_id
+        self.tenant_token = tenant_token
+        self.timeout = timeout
+        self.retries = retries
+        self.batch_size = max(1, min(batch_size, BATCH_CREATE_LIMIT))
+        self.max_age_sec = max_age_sec
+        self.backoff_sec = backoff_sec
+        self.log = log
+        self.stats = {"batches": 0, "rows_ok": 0, "rows_failed": 0, "splits": 0, "backoffs": 0}
+
+        self._pending: List[Tuple[Dict[str, Any], RecordCallback]] = []
+        self._oldest = 0.0
+        self._degraded = False
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._closed = threading.Event()
+        self._timer: Optional[threading.Thread] = None
+        if max_age_sec > 0:
+            self._timer = threading.Thread(target=self._age_loop, name="bitable-writer", daemon=True)
+            self._timer.start()
+
+    def add(self, fields: Dict[str, Any], callback: RecordCallback) -> None:
+        with self._lock:
+            if not self._pending:
+                self._oldest = time.monotonic()
+            self._pending.append((fields, callback))
+            full = len(self._pending) >= self.batch_size
+        if full:
+            self.flush()
+
+    def flush(self) -> None:
+        with self._flush_lock:
+            while True:
+                with self._lock:
+                    batch = self._pending[: self.batch_size]
+                    self._pending = self._pending[self.batch_size:]
+                    if self._pending:
+                        self._oldest = time.monotonic()
+                if not batch:
+                    return
+                self._write(batch)
+
+    def close(self) -> None:
+        self._closed.set()
+        if self._timer is not None:
+            self._timer.join(timeout=self.max_age_sec + 1)
+        self.flush()
+
+    def _age_loop(self) -> None:
+        interval = max(0.2, self.max_age_sec / 2)
+        while not self._closed.wait(interval):
+            with self._lock:
+                due = bool(self._pending) and time.monotonic() - self._oldest >= self.max_age_sec
+            if due:
+                self.flush()
+
+    def _write(self, batch: List[Tuple[Dict[str, Any], RecordCallback]]) -> None:
+        result = self._create(batch)
+        if result is None:
+            self._fail(batch)
+            return
+        ok, record_ids = result
+        if ok and len(record_ids) == len(batch):
+            self.stats["rows_ok"] += len(batch)
+            for (_, callback), record_id in zip(batch, record_ids):
+                self._notify(callback, record_id)
+            return
+
+        if len(batch) > 1:
+            self.stats["splits"] += 1
+            mid = len(batch) // 2
+            self._write(batch[:mid])
+            if self._degraded:
+                self._fail(batch[mid:])
+            else:
+                self._write(batch[mid:])
+            return
+
+        self._fail(batch)
+
+    def _create(self, batch: List[Tuple[Dict[str, Any], RecordCallback]]) -> Optional[Tuple[bool, List[Optional[str]]]]:
+        # 异常表示整批问题（频控、token 失效、网络），退避后重试整批；降级状态下只请求一次
+        attempts = 1 if self._degraded else max(1, self.retries)
+        for attempt in range(attempts):
+            if attempt:
+                self.stats["backoffs"] += 1
+                time.sleep(min(8.0, self.backoff_sec * (2 ** (attempt - 1))))
+            self.stats["batches"] += 1
+            try:
+                result = batch_create_bitable_records(
+                    self.app_token,
+                    self.table_id,
+                    self.tenant_token,
+                    [fields for fields, _ in batch],
+                    self.timeout,
+                    self.retries,
+                )
+            except Exception as exc:
+                self.log(f"[Feishu] batch create failed: {exc}")
+                continue
+            self._degraded = False
+            return result
+        self._degraded = True
+        return None
+
+    def _fail(self, batch: List[Tuple[Dict[str, Any], RecordCallback]]) -> None:
+        self.stats["rows_failed"] += len(batch)
+        for _, callback in batch:
+            self._notify(callback, None)
+
+    def _notify(self, callback: RecordCallback, record_id: Optional[str]) -> None:
+        try:
+            callback(record_id)
+        except Exception as exc:
+            self.log(f"[Feishu] batch create callback failed: {exc}")
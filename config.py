@@ -27,6 +27,10 @@ load_env_file(Path(r"F:\coding\.env"))
 
 FEISHU_APP_ID = os.getenv("FEISHU_APP_ID", "")
 FEISHU_APP_SECRET = os.getenv("FEISHU_APP_SECRET", "")
+# tenant_access_token 本地缓存文件（留空不落盘），连续运行可复用未过期的 token
+FEISHU_TOKEN_CACHE_PATH = os.getenv("FEISHU_TOKEN_CACHE_PATH", "")
+# 距过期不足该秒数时提前刷新
+FEISHU_TOKEN_REFRESH_MARGIN_SEC = int(os.getenv("FEISHU_TOKEN_REFRESH_MARGIN_SEC", "300"))
 
 # 飞书 Bitable App（同一应用可包含多个表）
 FEISHU_APP_TOKEN = os.getenv("FEISHU_APP_TOKEN", "")
@@ -52,6 +56,11 @@ CF_VECTORIZE_SIM_THRESHOLD = float(os.getenv("CF_VECTORIZE_SIM_THRESHOLD", "0.88
 CF_VECTORIZE_METRIC = os.getenv("CF_VECTORIZE_METRIC", "cosine")
 CF_EMBEDDING_MODEL = os.getenv("CF_EMBEDDING_MODEL", "@cf/baai/bge-m3")
 ENABLE_VECTORIZE_DEDUP = os.getenv("ENABLE_VECTORIZE_DEDUP", "true").lower() in {"1", "true", "yes", "y"}
+# 批量生成向量：Workers AI 单次请求最多 100 条文本；并发 worker 的请求最多等待 N 毫秒凑成一批
+ENABLE_EMBED_BATCH = os.getenv("ENABLE_EMBED_BATCH", "true").lower() in {"1", "true", "yes", "y"}
+CF_EMBED_BATCH_SIZE = min(100, int(os.getenv("CF_EMBED_BATCH_SIZE", "100")))
+CF_EMBED_BATCH_MAX_CHARS = int(os.getenv("CF_EMBED_BATCH_MAX_CHARS", "50000"))
+CF_EMBED_BATCH_WAIT_MS = int(os.getenv("CF_EMBED_BATCH_WAIT_MS", "200"))
 
 # 新闻表字段
 NEWS_FIELD_TITLE = "标题"
@@ -81,12 +90,48 @@ RSS_FIELD_LAST_ITEM_PUB_TIME = "last_item_pub_time"
 RSS_FIELD_ITEM_ID_STRATEGY = "item_id_strategy"
 RSS_FIELD_CONTENT_LANGUAGE = "content_language"
 RSS_FIELD_FAILED_ITEMS = "failed_items"
+# 源权重（可选数字字段，需手动在 RSS 源表创建；缺省为 1，越大越优先分析）
+RSS_FIELD_WEIGHT = "weight"
+# 条件请求校验字段（可选，缺失时自动创建）
+RSS_FIELD_ETAG = "etag"
+RSS_FIELD_LAST_MODIFIED = "last_modified"
+RSS_FIELD_FEED_BYTES = "feed_bytes"
+RSS_FIELD_FEED_PARSE_MS = "feed_parse_ms"
 
 DEFAULT_ITEM_ID_STRATEGY = "guid"
 DEFAULT_CONTENT_HASH_ALGO = "md5"
 DEFAULT_FETCH_INTERVAL_MIN = int(os.getenv("DEFAULT_FETCH_INTERVAL_MIN", "180"))
 MAX_ENTRIES_PER_FEED = 200
 NEWS_ITEM_KEY_PREFETCH_LIMIT = 500
+# 精确去重方式：prefetch（预取最近 N 条 item_key）/ index（本地 SQLite 索引，增量同步）
+# / search（入队后按候选 item_key 分批查询新闻表）
+DEDUP_MODE = os.getenv("DEDUP_MODE", "prefetch").strip().lower()
+CACHE_DIR = Path(os.getenv("CACHE_DIR", str(BASE_DIR / ".cache")))
+DEDUP_INDEX_PATH = os.getenv("DEDUP_INDEX_PATH", str(CACHE_DIR / "item_keys.sqlite3"))
+DEDUP_INDEX_SYNC_MAX_PAGES = int(os.getenv("DEDUP_INDEX_SYNC_MAX_PAGES", "200"))
+DEDUP_SEARCH_CHUNK = int(os.getenv("DEDUP_SEARCH_CHUNK", "50"))
+DEDUP_SEARCH_CONCURRENCY = int(os.getenv("DEDUP_SEARCH_CONCURRENCY", "4"))
+# 语义去重后端：vectorize（每条一次远端查询）/ local（进程内向量矩阵，随 .cache 持久化，需要 numpy）
+VECTOR_DEDUP_BACKEND = os.getenv("VECTOR_DEDUP_BACKEND", "vectorize").strip().lower()
+VECTOR_INDEX_PATH = os.getenv("VECTOR_INDEX_PATH", str(CACHE_DIR / "vector_index"))
+VECTOR_INDEX_WINDOW_DAYS = float(os.getenv("VECTOR_INDEX_WINDOW_DAYS", "30"))
+VECTOR_INDEX_INT8 = os.getenv("VECTOR_INDEX_INT8", "false").lower() in {"1", "true", "yes", "y"}
+# local 后端下是否仍在后台把新向量同步到 Vectorize（便于切回或跨机器共享）
+VECTOR_INDEX_SYNC_VECTORIZE = os.getenv("VECTOR_INDEX_SYNC_VECTORIZE", "false").lower() in {"1", "true", "yes", "y"}
+# Vectorize 写入由后台线程批量提交（满 N 条或最早一条等待超过 M 秒）；失败的向量保存到 spill 文件，下次运行重新提交
+VECTORIZE_UPSERT_BATCH_SIZE = int(os.getenv("VECTORIZE_UPSERT_BATCH_SIZE", "100"))
+VECTORIZE_UPSERT_MAX_AGE_SEC = float(os.getenv("VECTORIZE_UPSERT_MAX_AGE_SEC", "5"))
+VECTORIZE_UPSERT_SPILL_PATH = os.getenv("VECTORIZE_UPSERT_SPILL_PATH", str(CACHE_DIR / "vectorize_pending.jsonl"))
+# 分析前语义去重：用原始标题 + 导语生成向量，分析前丢弃与已分析文章或本轮队列近似重复的条目；
+# 原始向量与分析后向量分开存放（Vectorize 用 raw 命名空间，local 后端用单独目录），分析后的去重仍保留
+ENABLE_PRE_LLM_DEDUP = os.getenv("ENABLE_PRE_LLM_DEDUP", "false").lower() in {"1", "true", "yes", "y"}
+PRE_LLM_DEDUP_THRESHOLD = float(os.getenv("PRE_LLM_DEDUP_THRESHOLD", "0.9"))
+PRE_LLM_DEDUP_LEAD_CHARS = int(os.getenv("PRE_LLM_DEDUP_LEAD_CHARS", "400"))
+PRE_LLM_DEDUP_CONCURRENCY = int(os.getenv("PRE_LLM_DEDUP_CONCURRENCY", "4"))
+PRE_LLM_VECTOR_INDEX_PATH = os.getenv("PRE_LLM_VECTOR_INDEX_PATH", str(CACHE_DIR / "vector_index_raw"))
+# 新闻表批量写入：满 N 条或最早一条等待超过 M 秒即提交（飞书单批上限 500）
+FEISHU_BATCH_SIZE = min(500, int(os.getenv("FEISHU_BATCH_SIZE", "100")))
+FEISHU_BATCH_MAX_AGE_SEC = float(os.getenv("FEISHU_BATCH_MAX_AGE_SEC", "10"))
 
 # 单选字段选项（需与你在表格中设置一致）
 STATUS_IDLE = "idle"
@@ -99,13 +144,24 @@ FETCH_STATUS_SUCCESS = "success"
 FETCH_STATUS_TIMEOUT = "timeout"
 FETCH_STATUS_HTTP_ERROR = "http_error"
 FETCH_STATUS_PARSE_ERROR = "parse_error"
-FETCH_STATUS_OPTIONS = {FETCH_STATUS_SUCCESS, FETCH_STATUS_TIMEOUT, FETCH_STATUS_HTTP_ERROR, FETCH_STATUS_PARSE_ERROR}
+FETCH_STATUS_NOT_MODIFIED = "not_modified"
+FETCH_STATUS_OPTIONS = {
+    FETCH_STATUS_SUCCESS,
+    FETCH_STATUS_TIMEOUT,
+    FETCH_STATUS_HTTP_ERROR,
+    FETCH_STATUS_PARSE_ERROR,
+    FETCH_STATUS_NOT_MODIFIED,
+}
 
 ITEM_ID_STRATEGY_OPTIONS = {"guid", "link", "title_pubdate", "content_hash"}
 CONTENT_LANGUAGE_OPTIONS = {"zh", "en", "jp", "mixed", "other"}
 
 HTTP_TIMEOUT = 20
 HTTP_RETRIES = 3
+HTTP_POOL_SIZE = int(os.getenv("HTTP_POOL_SIZE", "16"))
+FETCH_CONCURRENCY = int(os.getenv("FETCH_CONCURRENCY", "8"))
+FETCH_PER_HOST_LIMIT = int(os.getenv("FETCH_PER_HOST_LIMIT", "2"))
+ENABLE_CONDITIONAL_GET = os.getenv("ENABLE_CONDITIONAL_GET", "true").lower() in {"1", "true", "yes", "y"}
 
 GEMINI_TIMEOUT = 180
 GEMINI_RETRIES = 10
@@ -155,4 +211,70 @@ SYSTEM_PROMPT_OVERRIDE = os.getenv("SYSTEM_PROMPT_OVERRIDE", "")
 DEEP_ANALYSIS_PROMPT_OVERRIDE = os.getenv("DEEP_ANALYSIS_PROMPT_OVERRIDE", "")
 FEATURED_PROMPT = os.getenv("FEATURED_PROMPT", "")
 LLM_CONCURRENCY = int(os.getenv("LLM_CONCURRENCY", "4"))
+# 自适应并发（AIMD）：以 LLM_CONCURRENCY 为起点，健康时逐步加并发，429 / 5xx / 超时时减半
+ENABLE_ADAPTIVE_CONCURRENCY = os.getenv("ENABLE_ADAPTIVE_CONCURRENCY", "true").lower() in {"1", "true", "yes", "y"}
+LLM_CONCURRENCY_MIN = int(os.getenv("LLM_CONCURRENCY_MIN", "1"))
+LLM_CONCURRENCY_MAX = int(os.getenv("LLM_CONCURRENCY_MAX", "12"))
+# 延迟 EWMA 超过历史最低水平的倍数后不再增加并发
+LLM_LATENCY_TOLERANCE = float(os.getenv("LLM_LATENCY_TOLERANCE", "2.0"))
+# LLM 速率上限（每分钟请求数 / token 数，0 表示不限），所有并发线程共享；
+# 可按 provider 覆盖：NVIDIA_RPM / OPENAI_TPM 等
+LLM_RPM = int(os.getenv("LLM_RPM", "0"))
+LLM_TPM = int(os.getenv("LLM_TPM", "0"))
+LLM_RATE_LIMITS = {
+    name: (
+        int(os.getenv(f"{name.upper()}_RPM", str(LLM_RPM))),
+        int(os.getenv(f"{name.upper()}_TPM", str(LLM_TPM))),
+    )
+    for name in ("gemini", "iflow", "openai", "deepseek", "zhipu", "nvidia")
+}
+# 两级级联：先用便宜的小模型按精简提示词只打分 / 分类，低于阈值直接丢弃，达到阈值才做完整分析
+# （triage provider / 模型留空沿用 LLM_PROVIDER 及其分析模型；阈值默认比入库分数低 1 分，给小模型留余量；
+# 阈值不超过 FEISHU_MIN_SCORE，否则第一级结果（没有标题 / 摘要）可能达到入库分数被直接写入）
+ENABLE_LLM_CASCADE = os.getenv("ENABLE_LLM_CASCADE", "false").lower() in {"1", "true", "yes", "y"}
+LLM_TRIAGE_PROVIDER = os.getenv("LLM_TRIAGE_PROVIDER", "").strip().lower()
+LLM_TRIAGE_MODEL = os.getenv("LLM_TRIAGE_MODEL", "")
+LLM_TRIAGE_MIN_SCORE = min(FEISHU_MIN_SCORE, float(os.getenv("LLM_TRIAGE_MIN_SCORE", str(FEISHU_MIN_SCORE - 1.0))))
+LLM_TRIAGE_MAX_CHARS = int(os.getenv("LLM_TRIAGE_MAX_CHARS", "1500"))
+# 标题初筛：分析前把队列标题按块（每次约 50 条）交给模型判断去留，只有保留的条目进入完整分析；
+# 决策写入审计 JSONL，按 TITLE_TRIAGE_AUDIT_RATE 抽检被丢弃的条目仍做完整分析，用于评估准确率
+ENABLE_TITLE_TRIAGE = os.getenv("ENABLE_TITLE_TRIAGE", "false").lower() in {"1", "true", "yes", "y"}
+TITLE_TRIAGE_CHUNK = int(os.getenv("TITLE_TRIAGE_CHUNK", "50"))
+TITLE_TRIAGE_PROVIDER = os.getenv("TITLE_TRIAGE_PROVIDER", LLM_TRIAGE_PROVIDER).strip().lower()
+TITLE_TRIAGE_MODEL = os.getenv("TITLE_TRIAGE_MODEL", LLM_TRIAGE_MODEL)
+TITLE_TRIAGE_MIN_SCORE = float(os.getenv("TITLE_TRIAGE_MIN_SCORE", str(FEISHU_MIN_SCORE - 2.0)))
+TITLE_TRIAGE_AUDIT_PATH = os.getenv("TITLE_TRIAGE_AUDIT_PATH", str(CACHE_DIR / "title_triage.jsonl"))
+TITLE_TRIAGE_AUDIT_RATE = float(os.getenv("TITLE_TRIAGE_AUDIT_RATE", "0.05"))
+# 结构化输出：支持的 provider（OpenAI / Gemini / DeepSeek / 智谱）请求 JSON 模式
+LLM_JSON_MODE = os.getenv("LLM_JSON_MODE", "true").lower() in {"1", "true", "yes", "y"}
+# JSON 解析失败时先本地修复，仍失败再请模型修复（provider / 模型留空沿用当前配置，建议配置便宜的小模型）
+ENABLE_LLM_JSON_FIX = os.getenv("ENABLE_LLM_JSON_FIX", "true").lower() in {"1", "true", "yes", "y"}
+LLM_JSON_FIX_PROVIDER = os.getenv("LLM_JSON_FIX_PROVIDER", "").strip().lower()
+LLM_JSON_FIX_MODEL = os.getenv("LLM_JSON_FIX_MODEL", "")
+LLM_JSON_FIX_MAX_CHARS = int(os.getenv("LLM_JSON_FIX_MAX_CHARS", "6000"))
+# 批量分析：多篇文章合并为一次请求（共享系统提示词），按估算 token 数切分批次
+ENABLE_LLM_BATCH = os.getenv("ENABLE_LLM_BATCH", "false").lower() in {"1", "true", "yes", "y"}
+LLM_BATCH_MAX_ITEMS = int(os.getenv("LLM_BATCH_MAX_ITEMS", "8"))
+LLM_BATCH_MAX_TOKENS = int(os.getenv("LLM_BATCH_MAX_TOKENS", "12000"))
+# LLM 分析结果缓存：按内容指纹 + 提示词 + provider/model 命中，避免重试/重跑/转载重复调用
+ENABLE_LLM_CACHE = os.getenv("ENABLE_LLM_CACHE", "true").lower() in {"1", "true", "yes", "y"}
+LLM_CACHE_PATH = os.getenv("LLM_CACHE_PATH", str(CACHE_DIR / "llm_analysis.sqlite3"))
+LLM_CACHE_TTL_DAYS = float(os.getenv("LLM_CACHE_TTL_DAYS", "30"))
+LLM_CACHE_MAX_ENTRIES = int(os.getenv("LLM_CACHE_MAX_ENTRIES", "20000"))
+# 队列优先级：源权重 ×（时效衰减 + 失败重试加成），按优先级从高到低分析；
+# 按剩余时间估算的本轮容量小于队列长度时，优先级最低的条目顺延到下一轮（放回失败池）
+ENABLE_QUEUE_PRIORITY = os.getenv("ENABLE_QUEUE_PRIORITY", "true").lower() in {"1", "true", "yes", "y"}
+PRIORITY_HALF_LIFE_HOURS = float(os.getenv("PRIORITY_HALF_LIFE_HOURS", "12"))
+PRIORITY_RETRY_BOOST = float(os.getenv("PRIORITY_RETRY_BOOST", "0.5"))
+# 单条分析的估算耗时（秒），用于估算本轮剩余容量
+LLM_EST_ITEM_SEC = float(os.getenv("LLM_EST_ITEM_SEC", "20"))
+# 队列派发策略：priority（按优先级）/ round_robin（按来源轮转）/ lpt（长文章优先）
+LLM_SCHEDULE_POLICY = os.getenv("LLM_SCHEDULE_POLICY", "priority").strip().lower()
+# 录制本轮队列（JSONL，含每条的长度与实际耗时），供 bench_scheduling.py 回放比较策略；留空不录制
+LLM_QUEUE_RECORD_PATH = os.getenv("LLM_QUEUE_RECORD_PATH", "")
+# 整轮运行截止（分钟，0 表示不限），应小于 Actions 的 timeout-minutes；
+# 最后 RUN_DEADLINE_RESERVE_SEC 秒留给写回源状态和精选，剩余不足 RUN_DEADLINE_MIN_CALL_SEC 时不再发起分析请求
+RUN_DEADLINE_MIN = float(os.getenv("RUN_DEADLINE_MIN", "25"))
+RUN_DEADLINE_RESERVE_SEC = float(os.getenv("RUN_DEADLINE_RESERVE_SEC", "120"))
+RUN_DEADLINE_MIN_CALL_SEC = float(os.getenv("RUN_DEADLINE_MIN_CALL_SEC", "15"))
 PROGRESS_BAR_WIDTH = int(os.getenv("PROGRESS_BAR_WIDTH", "20"))
@@ -0,0 +1,192 @@
+# -*- coding: utf-8 -*-
+import argparse
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+import config
+from feishu_client import TenantToken, get_tenant_access_token, list_bitable_records
+
+# 增量同步时回看的时长：飞书 ExactDate 过滤按天比较，这里多取一天避免漏掉边界记录
+SYNC_OVERLAP_MS = 24 * 60 * 60 * 1000
+
+
+def _clean_text(value: Any) -> str:
+    if value is None:
+        return ""
+    if isinstance(value, str):
+        return value
+    if isinstance(value, list):
+        return "".join(str(v.get("text") or "") if isinstance(v, dict) else str(v) for v in value)
+    if isinstance(value, dict):
+        return str(value.get("text") or "")
+    return str(value)
+
+
+def _to_ms(value: Any) -> int:
+    try:
+        return int(value or 0)
+    except (TypeError, ValueError):
+        return 0
+
+
+# 本地持久化的 item_key 索引（SQLite），启动时载入内存集合，成员判断 O(1)。
+# 对外提供与 set 相同的 `in` / add 接口，可直接替代 existing_keys：
+# add 只记入本轮内存集合（低分、去重丢弃、写入失败的条目下一轮不应被当成已存在），
+# 只有 record 的 key（飞书写入成功）才落盘，攒够 commit_every 条或 flush / close 时统一提交。
+class ItemKeyIndex:
+    def __init__(self, path: str, commit_every: int = 100) -> None:
+        self.path = Path(path)
+        self.commit_every = max(1, commit_every)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("CREATE TABLE IF NOT EXISTS item_keys (item_key TEXT PRIMARY KEY, created_ms INTEGER NOT NULL DEFAULT 0)")
+        self._conn.execute("CREATE TABLE IF NOT EXISTS meta (name TEXT PRIMARY KEY, value TEXT NOT NULL)")
+        self._conn.commit()
+        self._keys: Set[str] = {row[0] for row in self._conn.execute("SELECT item_key FROM item_keys")}
+        self._seen: Set[str] = set()
+        self._unsaved: List[Tuple[str, int]] = []
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._keys or key in self._seen
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def add(self, key: str) -> None:
+        if key:
+            self._seen.add(key)
+
+    def record(self, key: str, created_ms: int = 0) -> None:
+        if not key:
+            return
+        with self._lock:
+            if key in self._keys:
+                return
+            self._keys.add(key)
+            self._unsaved.append((key, created_ms or int(time.time() * 1000)))
+            if len(self._unsaved) >= self.commit_every:
+                self._commit_unsaved()
+
+    def flush(self) -> None:
+        with self._lock:
+            self._commit_unsaved()
+
+    def _commit_unsaved(self) -> None:
+        if not self._unsaved:
+            return
+        self._conn.executemany("INSERT OR IGNORE INTO item_keys (item_key, created_ms) VALUES (?, ?)", self._unsaved)
+        self._conn.commit()
+        self._unsaved = []
+
+    def add_many(self, rows: Iterable[tuple]) -> int:
+        added = 0
+        with self._lock:
+            for key, created_ms in rows:
+                if not key or key in self._keys:
+                    continue
+                self._keys.add(key)
+                self._conn.execute(
+                    "INSERT OR IGNORE INTO item_keys (item_key, created_ms) VALUES (?, ?)",
+                    (key, created_ms),
+                )
+                added += 1
+            self._conn.commit()
+        return added
+
+    def high_watermark(self) -> int:
+        row = self._conn.execute("SELECT value FROM meta WHERE name = 'high_watermark'").fetchone()
+        return _to_ms(row[0]) if row else 0
+
+    def set_high_watermark(self, value: int) -> None:
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO meta (name, value) VALUES ('high_watermark', ?) "
+                "ON CONFLICT(name) DO UPDATE SET value = excluded.value",
+                (str(value),),
+            )
+            self._conn.commit()
+
+    def clear(self) -> None:
+        with self._lock:
+            self._keys.clear()
+            self._unsaved = []
+            self._conn.execute("DELETE FROM item_keys")
+            self._conn.execute("DELETE FROM meta")
+            self._conn.commit()
+
+    def sync(self, tenant_token: TenantToken, full: bool = False) -> int:
+        watermark = 0 if full else self.high_watermark()
+        filter_obj: Optional[Dict[str, Any]] = None
+        if watermark > 0:
+            since = max(0, watermark - SYNC_OVERLAP_MS)
+            filter_obj = {
+                "conjunction": "and",
+                "conditions": [
+                    {
+                        "field_name": config.NEWS_FIELD_CREATED_TIME,
+                        "operator": "isGreater",
+                        "value": ["ExactDate", str(since)],
+                    }
+                ],
+            }
+        records = list_bitable_records(
+            config.FEISHU_APP_TOKEN,
+            config.FEISHU_NEWS_TABLE_ID,
+            tenant_token,
+            config.HTTP_TIMEOUT,
+            config.HTTP_RETRIES,
+            page_size=500,
+            max_pages=config.DEDUP_INDEX_SYNC_MAX_PAGES,
+            filter_obj=filter_obj,
+            sort=[{"field_name": config.NEWS_FIELD_CREATED_TIME, "order": "asc"}],
+            field_names=[config.NEWS_FIELD_ITEM_KEY, config.NEWS_FIELD_CREATED_TIME],
+            automatic_fields=False,
+        )
+        rows = []
+        latest = watermark
+        for record in records:
+            fields = record.get("fields") or {}
+            key = _clean_text(fields.get(config.NEWS_FIELD_ITEM_KEY)).strip()
+            created_ms = _to_ms(fields.get(config.NEWS_FIELD_CREATED_TIME))
+            if created_ms > latest:
+                latest = created_ms
+            if key:
+                rows.append((key, created_ms))
+        added = self.add_many(rows)
+        if latest > watermark:
+            self.set_high_watermark(latest)
+        return added
+
+    def rebuild(self, tenant_token: TenantToken) -> int:
+        self.clear()
+        return self.sync(tenant_token, full=True)
+
+    def close(self) -> None:
+        with self._lock:
+            self._commit_unsaved()
+            self._conn.close()
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Maintain the local item_key dedup index.")
+    parser.add_argument("--path", default=config.DEDUP_INDEX_PATH, help="SQLite file path.")
+    parser.add_argument("--rebuild", action="store_true", help="Drop the index and resync from the news table.")
+    args = parser.parse_args()
+
+    tenant_token = get_tenant_access_token(config.FEISHU_APP_ID, config.FEISHU_APP_SECRET, config.HTTP_TIMEOUT, config.HTTP_RETRIES)
+    index = ItemKeyIndex(args.path)
+    try:
+        added = index.rebuild(tenant_token) if args.rebuild else index.sync(tenant_token)
+        print(f"[Dedup] index={args.path} added={added} total={len(index)} high_watermark={index.high_watermark()}")
+    finally:
+        index.close()
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
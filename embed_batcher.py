@@ -0,0 +1,66 @@
+# -*- coding: utf-8 -*-
+import threading
+import time
+from typing import Callable, List, Optional, Tuple
+
+Vector = Optional[List[float]]
+
+
+class _Slot:
+    def __init__(self) -> None:
+        self.done = threading.Event()
+        self.value: Vector = None
+
+
+# 汇总多个 worker 的单条 embedding 请求，凑满一批或最早一条等待超过 max_wait_sec 后一次发出；
+# 没有后台线程：等待超时的调用方自己发出当前积压的请求，其余调用方等结果。
+class EmbeddingBatcher:
+    def __init__(
+        self,
+        embed_many: Callable[[List[str]], List[Vector]],
+        batch_size: int = 100,
+        max_wait_sec: float = 0.2,
+        log: Callable[[str], None] = print,
+    ) -> None:
+        self.embed_many = embed_many
+        self.batch_size = max(1, batch_size)
+        self.max_wait_sec = max(0.0, max_wait_sec)
+        self.log = log
+        self.stats = {"requests": 0, "texts": 0, "request_sec": 0.0}
+        self._pending: List[Tuple[str, _Slot]] = []
+        self._lock = threading.Lock()
+
+    def embed(self, text: str) -> Vector:
+        slot = _Slot()
+        with self._lock:
+            self._pending.append((text, slot))
+            full = len(self._pending) >= self.batch_size
+        if full or not slot.done.wait(self.max_wait_sec):
+            self.flush()
+        # 当前请求可能已被其他线程取走，等它返回
+        slot.done.wait()
+        return slot.value
+
+    def flush(self) -> None:
+        while True:
+            with self._lock:
+                batch = self._pending[: self.batch_size]
+                self._pending = self._pending[self.batch_size:]
+            if not batch:
+                return
+            self._run(batch)
+
+    def _run(self, batch: List[Tuple[str, _Slot]]) -> None:
+        started = time.monotonic()
+        try:
+            vectors = self.embed_many([text for text, _ in batch])
+        except Exception as exc:
+            self.log(f"[Embed] batch failed: {exc}")
+            vectors = []
+        with self._lock:
+            self.stats["requests"] += 1
+            self.stats["texts"] += len(batch)
+            self.stats["request_sec"] += time.monotonic() - started
+        for idx, (_, slot) in enumerate(batch):
+            slot.value = vectors[idx] if idx < len(vectors) else None
+            slot.done.set()
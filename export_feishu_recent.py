@@ -81,7 +81,27 @@ def load_env_file(path):
     return loaded
 
 
-def iter_recent_records(tenant_token, cutoff_ms, sort_field, page_size=200, max_pages=50):
+def export_field_names(use_distance=False):
+    # 导出只需要标题、摘要和时间列，距今模式额外带上“距今”
+    names = [
+        config.NEWS_FIELD_TITLE,
+        config.NEWS_FIELD_SUMMARY,
+        config.NEWS_FIELD_PUBLISHED_MS,
+        config.NEWS_FIELD_CREATED_TIME,
+    ]
+    if use_distance:
+        names.append("距今")
+    return names
+
+
+def apply_projection(body, field_names, automatic_fields):
+    if field_names:
+        body["field_names"] = list(field_names)
+    if automatic_fields is not None:
+        body["automatic_fields"] = automatic_fields
+
+
+def iter_recent_records(tenant_token, cutoff_ms, sort_field, page_size=200, max_pages=50, field_names=None, automatic_fields=None):
     if config is None:
         raise RuntimeError("config 未加载")
     url = f"https://open.feishu.cn/open-apis/bitable/v1/apps/{config.FEISHU_APP_TOKEN}/tables/{config.FEISHU_NEWS_TABLE_ID}/records/search"
@@ -98,6 +118,7 @@ def iter_recent_records(tenant_token, cutoff_ms, sort_field, page_size=200, max_
             body["sort"] = sort
         if page_token:
             body["page_token"] = page_token
+        apply_projection(body, field_names, automatic_fields)
         resp = http_post(url, headers, body, config.HTTP_TIMEOUT, config.HTTP_RETRIES)
         data = resp.json()
         if data.get("code") != 0:
@@ -157,7 +178,7 @@ def format_records(records, hours, now):
     return "\n".join(lines), count
 
 
-def fetch_top_records(tenant_token, sort_field, limit=10, page_size=200, max_pages=5):
+def fetch_top_records(tenant_token, sort_field, limit=10, page_size=200, max_pages=5, field_names=None, automatic_fields=None):
     if config is None:
         raise RuntimeError("config 未加载")
     url = f"https://open.feishu.cn/open-apis/bitable/v1/apps/{config.FEISHU_APP_TOKEN}/tables/{config.FEISHU_NEWS_TABLE_ID}/records/search"
@@ -175,6 +196,7 @@ def fetch_top_records(tenant_token, sort_field, limit=10, page_size=200, max_pag
             body["sort"] = sort
         if page_token:
             body["page_token"] = page_token
+        apply_projection(body, field_names, automatic_fields)
         resp = http_post(url, headers, body, config.HTTP_TIMEOUT, config.HTTP_RETRIES)
         data = resp.json()
         if data.get("code") != 0:
@@ -193,7 +215,7 @@ def fetch_top_records(tenant_token, sort_field, limit=10, page_size=200, max_pag
     return collected
 
 
-def scan_all_records(tenant_token, hours, page_size=200, max_pages=200):
+def scan_all_records(tenant_token, hours, page_size=200, max_pages=200, field_names=None, automatic_fields=None):
     if config is None:
         raise RuntimeError("config 未加载")
     url = f"https://open.feishu.cn/open-apis/bitable/v1/apps/{config.FEISHU_APP_TOKEN}/tables/{config.FEISHU_NEWS_TABLE_ID}/records/search"
@@ -214,6 +236,7 @@ def scan_all_records(tenant_token, hours, page_size=200, max_pages=200):
         body = {"page_size": page_size}
         if page_token:
             body["page_token"] = page_token
+        apply_projection(body, field_names, automatic_fields)
         resp = http_post(url, headers, body, config.HTTP_TIMEOUT, config.HTTP_RETRIES)
         data = resp.json()
         if data.get("code") != 0:
@@ -256,7 +279,7 @@ def scan_all_records(tenant_token, hours, page_size=200, max_pages=200):
     }
 
 
-def iter_distance_records(tenant_token, max_hours, sort_field="距今", page_size=200, max_pages=50):
+def iter_distance_records(tenant_token, max_hours, sort_field="距今", page_size=200, max_pages=50, field_names=None, automatic_fields=None):
     if config is None:
         raise RuntimeError("config 未加载")
     url = f"https://open.feishu.cn/open-apis/bitable/v1/apps/{config.FEISHU_APP_TOKEN}/tables/{config.FEISHU_NEWS_TABLE_ID}/records/search"
@@ -273,6 +296,7 @@ def iter_distance_records(tenant_token, max_hours, sort_field="距今", page_siz
             body["sort"] = sort
         if page_token:
             body["page_token"] = page_token
+        apply_projection(body, field_names, automatic_fields)
         resp = http_post(url, headers, body, config.HTTP_TIMEOUT, config.HTTP_RETRIES)
         data = resp.json()
         if data.get("code") != 0:
@@ -350,9 +374,23 @@ def main():
     cutoff_ms = int((now - timedelta(hours=args.hours)).timestamp() * 1000)
     sort_field = config.NEWS_FIELD_PUBLISHED_MS if args.sort_field == "published" else config.NEWS_FIELD_CREATED_TIME
     if args.use_distance:
-        records = iter_distance_records(tenant_token, args.hours, sort_field="距今", max_pages=args.max_pages)
+        records = iter_distance_records(
+            tenant_token,
+            args.hours,
+            sort_field="距今",
+            max_pages=args.max_pages,
+            field_names=export_field_names(use_distance=True),
+            automatic_fields=False,
+        )
     else:
-        records = iter_recent_records(tenant_token, cutoff_ms, sort_field, max_pages=args.max_pages)
+        records = iter_recent_records(
+            tenant_token,
+            cutoff_ms,
+            sort_field,
+            max_pages=args.max_pages,
+            field_names=export_field_names(),
+            automatic_fields=False,
+        )
     content, count = format_records(records, args.hours, now)
 
     with open(args.output, "w", encoding="utf-8-sig") as f:
@@ -389,7 +427,12 @@ def main():
             print(f"   解析 发布时间(ms)：{ts_pub}")
             print(f"   解析 创建时间(ms)：{ts_created}")
     if args.scan_all:
-        stats = scan_all_records(tenant_token, args.hours)
+        stats = scan_all_records(
+            tenant_token,
+            args.hours,
+            field_names=[config.NEWS_FIELD_PUBLISHED_MS, config.NEWS_FIELD_CREATED_TIME],
+            automatic_fields=False,
+        )
         print("---- 全量扫描 ----")
         print(f"记录总数：{stats['total']}")
         print(f"12 小时内（发布时间）：{stats['within_published']}")
@@ -1,10 +1,16 @@
 ﻿# -*- coding: utf-8 -*-
+import json
+import os
 import random
+import threading
 import time
-from typing import Any, Dict, List, Optional, Tuple
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple, Union
 
 import requests
 
+import http_pool
+
 
 def _sleep_backoff(attempt: int) -> None:
     time.sleep(min(8.0, 0.8 * (2 ** attempt) + random.random() * 0.3))
@@ -14,7 +20,7 @@ def http_get(url: str, headers: Dict[str, str], timeout: int, retries: int, para
     last_err: Optional[Exception] = None
     for i in range(retries):
         try:
-            return requests.get(url, headers=headers, params=params, timeout=timeout)
+            return http_pool.get(url, headers=headers, params=params, timeout=timeout)
         except Exception as exc:
             last_err = exc
             _sleep_backoff(i)
@@ -25,7 +31,7 @@ def http_post(url: str, headers: Dict[str, str], json_body: Dict[str, Any], time
     last_err: Optional[Exception] = None
     for i in range(retries):
         try:
-            return requests.post(url, headers=headers, json=json_body, timeout=timeout)
+            return http_pool.post(url, headers=headers, json=json_body, timeout=timeout)
         except Exception as exc:
             last_err = exc
             _sleep_backoff(i)
@@ -36,14 +42,26 @@ def http_put(url: str, headers: Dict[str, str], json_body: Dict[str, Any], timeo
     last_err: Optional[Exception] = None
     for i in range(retries):
         try:
-            return requests.put(url, headers=headers, json=json_body, timeout=timeout)
+            return http_pool.put(url, headers=headers, json=json_body, timeout=timeout)
         except Exception as exc:
             last_err = exc
             _sleep_backoff(i)
     raise RuntimeError(f"HTTP PUT failed after retries: {last_err}")
 
 
-def get_tenant_access_token(app_id: str, app_secret: str, timeout: int, retries: int) -> str:
+# 飞书返回的 token 无效/过期错误码，遇到时刷新 token 后重试一次
+INVALID_TOKEN_CODES = {99991661, 99991663, 99991668, 99991677}
+# 飞书频控错误码：99991400 为网关频控（HTTP 429 时响应体里也是这个 code），
+# 1254290 为多维表格 TooManyRequest，1254291 为多维表格写冲突
+RATE_LIMIT_CODES = {99991400, 1254290, 1254291}
+
+
+# 频控、token 失效属于整批请求的问题，拆成小批重试只会放大请求量
+def is_batch_level_error(code: Any) -> bool:
+    return code in RATE_LIMIT_CODES or code in INVALID_TOKEN_CODES
+
+
+def request_tenant_access_token(app_id: str, app_secret: str, timeout: int, retries: int) -> Tuple[str, int]:
     url = "https://open.feishu.cn/open-apis/auth/v3/tenant_access_token/internal"
     payload = {"app_id": app_id, "app_secret": app_secret}
     headers = {"Content-Type": "application/json; charset=utf-8"}
@@ -54,22 +72,134 @@ def get_tenant_access_token(app_id: str, app_secret: str, timeout: int, retries:
     token = data.get("tenant_access_token")
     if not token:
         raise RuntimeError(f"[Feishu] token missing: {data}")
+    return token, int(data.get("expire") or 0)
+
+
+def get_tenant_access_token(app_id: str, app_secret: str, timeout: int, retries: int) -> str:
+    token, _ = request_tenant_access_token(app_id, app_secret, timeout, retries)
     return token
 
 
+# 缓存 tenant_access_token 及过期时间，临近过期时在锁内主动刷新，多线程共享同一实例。
+# 指定 cache_path 时把 token 落盘，连续运行可跳过鉴权请求。
+class TenantTokenProvider:
+    def __init__(
+        self,
+        app_id: str,
+        app_secret: str,
+        timeout: int,
+        retries: int,
+        cache_path: str = "",
+        refresh_margin_sec: int = 300,
+    ) -> None:
+        self.app_id = app_id
+        self.app_secret = app_secret
+        self.timeout = timeout
+        self.retries = retries
+        self.cache_path = Path(cache_path) if cache_path else None
+        self.refresh_margin_sec = refresh_margin_sec
+        self.refreshes = 0
+        self._token = ""
+        self._expires_at = 0.0
+        self._lock = threading.Lock()
+        self._load_cache()
+
+    def get(self) -> str:
+        with self._lock:
+            if not self._fresh():
+                self._refresh()
+            return self._token
+
+    def invalidate(self, token: str) -> None:
+        # 只作废调用方手上的那个 token，避免并发线程重复刷新
+        with self._lock:
+            if token == self._token:
+                self._token = ""
+                self._expires_at = 0.0
+
+    def _fresh(self) -> bool:
+        return bool(self._token) and time.time() < self._expires_at - self.refresh_margin_sec
+
+    def _refresh(self) -> None:
+        token, expire = request_tenant_access_token(self.app_id, self.app_secret, self.timeout, self.retries)
+        self._token = token
+        self._expires_at = time.time() + (expire or 7200)
+        self.refreshes += 1
+        self._save_cache()
+
+    def _load_cache(self) -> None:
+        if not self.cache_path:
+            return
+        try:
+            data = json.loads(self.cache_path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return
+        if data.get("app_id") != self.app_id:
+            return
+        self._token = str(data.get("tenant_access_token") or "")
+        self._expires_at = float(data.get("expires_at") or 0)
+
+    def _save_cache(self) -> None:
+        if not self.cache_path:
+            return
+        data = {"app_id": self.app_id, "tenant_access_token": self._token, "expires_at": self._expires_at}
+        try:
+            self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = self.cache_path.with_suffix(self.cache_path.suffix + ".tmp")
+            tmp.write_text(json.dumps(data), encoding="utf-8")
+            os.chmod(tmp, 0o600)
+            os.replace(tmp, self.cache_path)
+        except OSError as exc:
+            print(f"[Feishu] token cache write failed: {exc}", flush=True)
+
+
+TenantToken = Union[str, TenantTokenProvider]
+
+
+def resolve_tenant_token(tenant_token: TenantToken) -> str:
+    if isinstance(tenant_token, TenantTokenProvider):
+        return tenant_token.get()
+    return tenant_token
+
+
+def feishu_request(
+    method: str,
+    url: str,
+    tenant_token: TenantToken,
+    timeout: int,
+    retries: int,
+    json_body: Optional[Dict[str, Any]] = None,
+    params: Optional[Dict[str, Any]] = None,
+) -> Dict[str, Any]:
+    data: Dict[str, Any] = {}
+    for attempt in range(2):
+        token = resolve_tenant_token(tenant_token)
+        headers = {"Authorization": f"Bearer {token}"}
+        if method == "GET":
+            resp = http_get(url, headers, timeout, retries, params=params)
+        else:
+            headers["Content-Type"] = "application/json; charset=utf-8"
+            send = http_put if method == "PUT" else http_post
+            resp = send(url, headers, json_body or {}, timeout, retries)
+        data = resp.json()
+        if attempt == 0 and data.get("code") in INVALID_TOKEN_CODES and isinstance(tenant_token, TenantTokenProvider):
+            print(f"[Feishu] token rejected (code={data.get('code')}), refreshing", flush=True)
+            tenant_token.invalidate(token)
+            continue
+        break
+    return data
+
+
 def list_bitable_fields(
     app_token: str,
     table_id: str,
-    tenant_token: str,
+    tenant_token: TenantToken,
     timeout: int,
     retries: int,
     page_size: int = 200,
     max_pages: int = 20,
 ) -> List[Dict[str, Any]]:
     url = f"https://open.feishu.cn/open-apis/bitable/v1/apps/{app_token}/tables/{table_id}/fields"
-    headers = {
-        "Authorization": f"Bearer {tenant_token}",
-    }
 
     items: List[Dict[str, Any]] = []
     page_token: Optional[str] = None
@@ -78,8 +208,7 @@ def list_bitable_fields(
         params: Dict[str, Any] = {"page_size": page_size}
         if page_token:
             params["page_token"] = page_token
-        resp = http_get(url, headers, timeout, retries, params=params)
-        data = resp.json()
+        data = feishu_request("GET", url, tenant_token, timeout, retries, params=params)
         if data.get("code") != 0:
             raise RuntimeError(f"[Feishu] list fields error: {data}")
         data_block = data.get("data") or {}
@@ -96,7 +225,7 @@ def list_bitable_fields(
 def create_bitable_field(
     app_token: str,
     table_id: str,
-    tenant_token: str,
+    tenant_token: TenantToken,
     field_name: str,
     field_type: int,
     timeout: int,
@@ -104,10 +233,6 @@ def create_bitable_field(
     field_property: Optional[Dict[str, Any]] = None,
 ) -> Tuple[bool, Dict[str, Any]]:
     url = f"https://open.feishu.cn/open-apis/bitable/v1/apps/{app_token}/tables/{table_id}/fields"
-    headers = {
-        "Authorization": f"Bearer {tenant_token}",
-        "Content-Type": "application/json; charset=utf-8",
-    }
     body: Dict[str, Any] = {
         "field_name": field_name,
         "type": field_type,
@@ -115,8 +240,7 @@ def create_bitable_field(
     if field_property:
         body["property"] = field_property
 
-    resp = http_post(url, headers, body, timeout, retries)
-    data = resp.json()
+    data = feishu_request("POST", url, tenant_token, timeout, retries, json_body=body)
     if data.get("code") != 0:
         return False, data
     return True, data
@@ -125,19 +249,17 @@ def create_bitable_field(
 def list_bitable_records(
     app_token: str,
     table_id: str,
-    tenant_token: str,
+    tenant_token: TenantToken,
     timeout: int,
     retries: int,
     page_size: int = 500,
     max_pages: int = 50,
     filter_obj: Optional[Dict[str, Any]] = None,
     sort: Optional[List[Dict[str, Any]]] = None,
+    field_names: Optional[List[str]] = None,
+    automatic_fields: Optional[bool] = None,
 ) -> List[Dict[str, Any]]:
     url = f"https://open.feishu.cn/open-apis/bitable/v1/apps/{app_token}/tables/{table_id}/records/search"
-    headers = {
-        "Authorization": f"Bearer {tenant_token}",
-        "Content-Type": "application/json; charset=utf-8",
-    }
 
     items: List[Dict[str, Any]] = []
     page_token: Optional[str] = None
@@ -150,9 +272,12 @@ def list_bitable_records(
             body["filter"] = filter_obj
         if sort:
             body["sort"] = sort
+        if field_names:
+            body["field_names"] = field_names
+        if automatic_fields is not None:
+            body["automatic_fields"] = automatic_fields
 
-        resp = http_post(url, headers, body, timeout, retries)
-        data = resp.json()
+        data = feishu_request("POST", url, tenant_token, timeout, retries, json_body=body)
         if data.get("code") != 0:
             raise RuntimeError(f"[Feishu] list records error: {data}")
 
@@ -170,41 +295,85 @@ def list_bitable_records(
 def update_bitable_record_fields(
     app_token: str,
     table_id: str,
-    tenant_token: str,
+    tenant_token: TenantToken,
     record_id: str,
     fields: Dict[str, Any],
     timeout: int,
     retries: int,
 ) -> bool:
     url = f"https://open.feishu.cn/open-apis/bitable/v1/apps/{app_token}/tables/{table_id}/records/{record_id}"
-    headers = {
-        "Authorization": f"Bearer {tenant_token}",
-        "Content-Type": "application/json; charset=utf-8",
-    }
     body = {"fields": fields}
-    resp = http_put(url, headers, body, timeout, retries)
-    data = resp.json()
+    data = feishu_request("PUT", url, tenant_token, timeout, retries, json_body=body)
     if data.get("code") != 0:
         return False
     return True
 
 
+def batch_update_bitable_records(
+    app_token: str,
+    table_id: str,
+    tenant_token: TenantToken,
+    records: List[Dict[str, Any]],
+    timeout: int,
+    retries: int,
+    batch_size: int = 500,
+) -> Tuple[int, List[str]]:
+    url = f"https://open.feishu.cn/open-apis/bitable/v1/apps/{app_token}/tables/{table_id}/records/batch_update"
+
+    degraded = False
+
+    def send(chunk: List[Dict[str, Any]]) -> Tuple[int, List[str]]:
+        nonlocal degraded
+        body = {"records": [{"record_id": r["record_id"], "fields": r["fields"]} for r in chunk]}
+        data: Dict[str, Any] = {}
+        # 频控、token 失效、网络异常时整批退避重试，不拆分；降级后每批只请求一次
+        for attempt in range(1 if degraded else max(1, retries)):
+            if attempt:
+                _sleep_backoff(attempt - 1)
+            try:
+                data = feishu_request("POST", url, tenant_token, timeout, retries, json_body=body)
+            except Exception as exc:
+                data = {"code": -1, "msg": str(exc)}
+            if data.get("code") == 0:
+                degraded = False
+                return len(chunk), []
+            if data.get("code") != -1 and not is_batch_level_error(data.get("code")):
+                break
+        else:
+            degraded = True
+            print(f"[Feishu] batch update error: {len(chunk)} records code={data.get('code')} msg={data.get('msg')}", flush=True)
+            return 0, [r["record_id"] for r in chunk]
+        if len(chunk) > 1:
+            mid = len(chunk) // 2
+            ok_a, failed_a = send(chunk[:mid])
+            if degraded:
+                return ok_a, failed_a + [r["record_id"] for r in chunk[mid:]]
+            ok_b, failed_b = send(chunk[mid:])
+            return ok_a + ok_b, failed_a + failed_b
+        print(f"[Feishu] batch update error: record_id={chunk[0]['record_id']} code={data.get('code')} msg={data.get('msg')}", flush=True)
+        return 0, [chunk[0]["record_id"]]
+
+    ok_count = 0
+    failed: List[str] = []
+    size = max(1, min(batch_size, 500))
+    for i in range(0, len(records), size):
+        ok, bad = send(records[i : i + size])
+        ok_count += ok
+        failed.extend(bad)
+    return ok_count, failed
+
+
 def create_bitable_record(
     app_token: str,
     table_id: str,
-    tenant_token: str,
+    tenant_token: TenantToken,
     fields: Dict[str, Any],
     timeout: int,
     retries: int,
 ) -> bool:
     url = f"https://open.feishu.cn/open-apis/bitable/v1/apps/{app_token}/tables/{table_id}/records"
-    headers = {
-        "Authorization": f"Bearer {tenant_token}",
-        "Content-Type": "application/json; charset=utf-8",
-    }
     body = {"fields": fields}
-    resp = http_post(url, headers, body, timeout, retries)
-    data = resp.json()
+    data = feishu_request("POST", url, tenant_token, timeout, retries, json_body=body)
     if data.get("code") != 0:
         print(f"[Feishu] create record error: {data}", flush=True)
         return False
@@ -214,19 +383,14 @@ def create_bitable_record(
 def create_bitable_record_with_id(
     app_token: str,
     table_id: str,
-    tenant_token: str,
+    tenant_token: TenantToken,
     fields: Dict[str, Any],
     timeout: int,
     retries: int,
 ) -> Tuple[bool, Optional[str]]:
     url = f"https://open.feishu.cn/open-apis/bitable/v1/apps/{app_token}/tables/{table_id}/records"
-    headers = {
-        "Authorization": f"Bearer {tenant_token}",
-        "Content-Type": "application/json; charset=utf-8",
-    }
     body = {"fields": fields}
-    resp = http_post(url, headers, body, timeout, retries)
-    data = resp.json()
+    data = feishu_request("POST", url, tenant_token, timeout, retries, json_body=body)
     if data.get("code") != 0:
         print(f"[Feishu] create record error: {data}", flush=True)
         return False, None
@@ -234,6 +398,26 @@ def create_bitable_record_with_id(
     return True, record.get("record_id")
 
 
+def batch_create_bitable_records(
+    app_token: str,
+    table_id: str,
+    tenant_token: TenantToken,
+    records: List[Dict[str, Any]],
+    timeout: int,
+    retries: int,
+) -> Tuple[bool, List[Optional[str]]]:
+    url = f"https://open.feishu.cn/open-apis/bitable/v1/apps/{app_token}/tables/{table_id}/records/batch_create"
+    body = {"records": [{"fields": fields} for fields in records]}
+    data = feishu_request("POST", url, tenant_token, timeout, retries, json_body=body)
+    if data.get("code") != 0:
+        print(f"[Feishu] batch create error: code={data.get('code')} msg={data.get('msg')}", flush=True)
+        if is_batch_level_error(data.get("code")):
+            raise RuntimeError(f"[Feishu] batch create rejected: code={data.get('code')}")
+        return False, []
+    created = (data.get("data") or {}).get("records") or []
+    return True, [record.get("record_id") for record in created]
+
+
 def send_feishu_webhook(webhook_url: str, text: str, timeout: int, retries: int) -> bool:
     headers = {"Content-Type": "application/json"}
     body = {"msg_type": "text", "content": {"text": text}}
@@ -0,0 +1,113 @@
+# -*- coding: utf-8 -*-
+import threading
+from typing import Any, Dict
+from urllib.parse import urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+from urllib3.util import make_headers
+
+import config
+
+_LOCK = threading.Lock()
+_SESSIONS: Dict[str, requests.Session] = {}
+_COUNTERS = {"requests": 0, "new_connections": 0}
+
+# 安装 brotli / brotlicffi 后 urllib3 会自动声明 br
+ACCEPT_ENCODING = make_headers(accept_encoding=True)["accept-encoding"]
+
+
+def _bump(name: str) -> None:
+    with _LOCK:
+        _COUNTERS[name] += 1
+
+
+class _CountingHTTPConnection(HTTPConnection):
+    def connect(self) -> None:
+        _bump("new_connections")
+        super().connect()
+
+
+class _CountingHTTPSConnection(HTTPSConnection):
+    def connect(self) -> None:
+        _bump("new_connections")
+        super().connect()
+
+
+class _CountingHTTPConnectionPool(HTTPConnectionPool):
+    ConnectionCls = _CountingHTTPConnection
+
+
+class _CountingHTTPSConnectionPool(HTTPSConnectionPool):
+    ConnectionCls = _CountingHTTPSConnection
+
+
+class PooledAdapter(HTTPAdapter):
+    def init_poolmanager(self, *args: Any, **kwargs: Any) -> None:
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {
+            "http": _CountingHTTPConnectionPool,
+            "https": _CountingHTTPSConnectionPool,
+        }
+
+    def send(self, request, **kwargs):
+        _bump("requests")
+        return super().send(request, **kwargs)
+
+
+def _new_session() -> requests.Session:
+    session = requests.Session()
+    adapter = PooledAdapter(pool_connections=1, pool_maxsize=config.HTTP_POOL_SIZE)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    session.headers["Accept-Encoding"] = ACCEPT_ENCODING
+    session.headers["Connection"] = "keep-alive"
+    return session
+
+
+def get_session(url: str) -> requests.Session:
+    parsed = urlparse(url)
+    key = f"{parsed.scheme}://{(parsed.netloc or '').lower()}"
+    with _LOCK:
+        session = _SESSIONS.get(key)
+        if session is None:
+            session = _new_session()
+            _SESSIONS[key] = session
+        return session
+
+
+def request(method: str, url: str, **kwargs: Any) -> requests.Response:
+    return get_session(url).request(method, url, **kwargs)
+
+
+def get(url: str, **kwargs: Any) -> requests.Response:
+    return request("GET", url, **kwargs)
+
+
+def post(url: str, **kwargs: Any) -> requests.Response:
+    return request("POST", url, **kwargs)
+
+
+def put(url: str, **kwargs: Any) -> requests.Response:
+    return request("PUT", url, **kwargs)
+
+
+def delete(url: str, **kwargs: Any) -> requests.Response:
+    return request("DELETE", url, **kwargs)
+
+
+def connection_stats() -> Dict[str, int]:
+    with _LOCK:
+        total = _COUNTERS["requests"]
+        new = _COUNTERS["new_connections"]
+    return {"requests": total, "new": new, "reused": max(0, total - new)}
+
+
+def close_all() -> None:
+    with _LOCK:
+        sessions = list(_SESSIONS.values())
+        _SESSIONS.clear()
+    for session in sessions:
+        session.close()
@@ -0,0 +1,116 @@
+# -*- coding: utf-8 -*-
+import json
+from typing import Any, List, Optional, Tuple
+
+# LLM 输出 JSON 的本地修复：去掉代码块和前后说明文字、尾逗号、字符串内未转义的引号 / 换行，
+# 以及输出被截断时补齐字符串和括号（必要时丢弃最后一个不完整的成员）。
+
+_CLOSERS = {"{": "}", "[": "]"}
+_MAX_CANDIDATES = 64
+
+
+def _strip_wrapper(text: str) -> str:
+    t = (text or "").strip()
+    t = t.replace("```json", "").replace("```JSON", "").replace("```", "").strip()
+    starts = [pos for pos in (t.find("{"), t.find("[")) if pos != -1]
+    return t[min(starts):] if starts else t
+
+
+def _next_significant(text: str, pos: int) -> Optional[str]:
+    while pos < len(text):
+        if not text[pos].isspace():
+            return text[pos]
+        pos += 1
+    return None
+
+
+def _drop_trailing_comma(out: List[str]) -> None:
+    while out and out[-1].isspace():
+        out.pop()
+    if out and out[-1] == ",":
+        out.pop()
+
+
+def _close(prefix: str, stack: List[str]) -> str:
+    body = prefix.rstrip()
+    if body.endswith(","):
+        body = body[:-1]
+    return body + "".join(_CLOSERS[opener] for opener in reversed(stack))
+
+
+def _scan(text: str) -> Tuple[str, List[str], bool, List[Tuple[int, Tuple[str, ...]]]]:
+    out: List[str] = []
+    stack: List[str] = []
+    checkpoints: List[Tuple[int, Tuple[str, ...]]] = []
+    in_str = False
+    escape = False
+    for pos, ch in enumerate(text):
+        if in_str:
+            if escape:
+                out.append(ch)
+                escape = False
+            elif ch == "\\":
+                out.append(ch)
+                escape = True
+            elif ch == '"':
+                # 引号后面不是 , : } ] 时视为字符串内部未转义的引号
+                if _next_significant(text, pos + 1) in {",", ":", "}", "]", None}:
+                    in_str = False
+                    out.append(ch)
+                else:
+                    out.append('\\"')
+            elif ch == "\n":
+                out.append("\\n")
+            elif ch == "\r":
+                continue
+            elif ch == "\t":
+                out.append("\\t")
+            else:
+                out.append(ch)
+            continue
+
+        if ch == '"':
+            in_str = True
+            out.append(ch)
+        elif ch in _CLOSERS:
+            stack.append(ch)
+            out.append(ch)
+        elif ch in "}]":
+            _drop_trailing_comma(out)
+            if stack and _CLOSERS[stack[-1]] == ch:
+                stack.pop()
+            out.append(ch)
+            if not stack:
+                break
+        elif ch == ",":
+            checkpoints.append((len(out), tuple(stack)))
+            out.append(ch)
+        else:
+            out.append(ch)
+    if escape and out:
+        out.pop()
+    return "".join(out), stack, in_str, checkpoints
+
+
+def repair_json_detail(text: str) -> Tuple[Optional[Any], bool]:
+    # 返回 (结果, 是否按截断处理过)；截断补齐得到的结果可能缺字段或字段不完整，由调用方决定是否采用
+    body = _strip_wrapper(text)
+    if not body:
+        return None, False
+    repaired, stack, in_str, checkpoints = _scan(body)
+    truncated = in_str or bool(stack)
+    candidates = [_close(repaired + ('"' if in_str else ""), stack)]
+    # 截断在某个成员中间时，从最后一个逗号处截掉不完整的成员再补齐括号
+    for cut, snapshot in reversed(checkpoints[-_MAX_CANDIDATES:]):
+        candidates.append(_close(repaired[:cut], list(snapshot)))
+    for pos, candidate in enumerate(candidates):
+        try:
+            return json.loads(candidate), truncated or pos > 0
+        except ValueError:
+            continue
+    return None, truncated
+
+
+def repair_json(text: str) -> Optional[Any]:
+    # 修复后仍无法解析时返回 None
+    return repair_json_detail(text)[0]
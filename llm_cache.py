@@ -0,0 +1,167 @@
+# -*- coding: utf-8 -*-
+import hashlib
+import json
+import re
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional, Tuple
+
+
+def _sha256(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def normalize_text(text: str) -> str:
+    return re.sub(r"\s+", " ", text or "").strip().lower()
+
+
+def analysis_cache_key(title: str, content: str, prompt: str, provider: str, model: str) -> str:
+    # 内容指纹 + 提示词版本 + provider/model，任一变化都视为新的分析请求
+    fingerprint = _sha256(normalize_text(title) + "\n" + normalize_text(content))
+    return f"{fingerprint}:{_sha256(prompt or '')[:16]}:{provider}:{model}"
+
+
+class _InFlight:
+    def __init__(self) -> None:
+        self.event = threading.Event()
+        self.result: Optional[str] = None
+        self.error: Optional[BaseException] = None
+
+
+# 持久化的 LLM 分析结果缓存（SQLite），按 TTL 和条数上限淘汰；
+# 同一轮内相同 key 的并发请求合并为一次调用。
+class AnalysisCache:
+    def __init__(self, path: str, ttl_sec: float, max_entries: int) -> None:
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.ttl_sec = ttl_sec
+        self.max_entries = max_entries
+        self.stats = {"hit": 0, "miss": 0, "coalesced": 0, "stored": 0}
+        self._lock = threading.Lock()
+        self._inflight: Dict[str, _InFlight] = {}
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS analyses ("
+            "cache_key TEXT PRIMARY KEY, result TEXT NOT NULL, created_at REAL NOT NULL, last_used REAL NOT NULL)"
+        )
+        self._conn.commit()
+        self.evict()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM analyses").fetchone()[0]
+
+    def _load(self, key: str) -> Optional[str]:
+        row = self._conn.execute("SELECT result, created_at FROM analyses WHERE cache_key = ?", (key,)).fetchone()
+        if not row:
+            return None
+        if self.ttl_sec > 0 and time.time() - row[1] > self.ttl_sec:
+            self._conn.execute("DELETE FROM analyses WHERE cache_key = ?", (key,))
+            self._conn.commit()
+            return None
+        self._conn.execute("UPDATE analyses SET last_used = ? WHERE cache_key = ?", (time.time(), key))
+        self._conn.commit()
+        return row[0]
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            raw = self._load(key)
+        return json.loads(raw) if raw is not None else None
+
+    def reserve(self, key: str, *fallback_keys: str) -> Tuple[Optional[Dict[str, Any]], Optional[_InFlight]]:
+        # 依次尝试 key 和 fallback_keys，整体只计一次命中 / 未命中：
+        # (结果, None) 命中；(None, waiter) 同 key 正在别处计算，用 wait_for 取结果；
+        # (None, None) 由调用方计算，完成后必须调用 complete
+        with self._lock:
+            for candidate in (key,) + fallback_keys:
+                raw = self._load(candidate)
+                if raw is not None:
+                    self.stats["hit"] += 1
+                    return json.loads(raw), None
+            waiter = self._inflight.get(key)
+            if waiter is not None:
+                self.stats["coalesced"] += 1
+                return None, waiter
+            self._inflight[key] = _InFlight()
+            self.stats["miss"] += 1
+            return None, None
+
+    def complete(
+        self,
+        key: str,
+        result: Optional[Dict[str, Any]],
+        error: Optional[BaseException] = None,
+        store_key: str = "",
+    ) -> None:
+        # 发布 reserve 认领的计算结果并唤醒等待者；store_key 非空时同时写入缓存
+        if result is not None and store_key:
+            self.put(store_key, result)
+        with self._lock:
+            waiter = self._inflight.pop(key, None)
+        if waiter is None:
+            return
+        if result is not None:
+            waiter.result = json.dumps(result, ensure_ascii=False)
+        waiter.error = error
+        waiter.event.set()
+
+    @staticmethod
+    def wait_for(waiter: _InFlight) -> Dict[str, Any]:
+        waiter.event.wait()
+        if waiter.error is not None:
+            raise waiter.error
+        return json.loads(waiter.result or "{}")
+
+    def put(self, key: str, result: Dict[str, Any]) -> None:
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO analyses (cache_key, result, created_at, last_used) VALUES (?, ?, ?, ?)",
+                (key, json.dumps(result, ensure_ascii=False), now, now),
+            )
+            self._conn.commit()
+            self.stats["stored"] += 1
+
+    def get_or_compute(
+        self,
+        key: str,
+        compute: Callable[[], Dict[str, Any]],
+        should_store: Callable[[Dict[str, Any]], bool] = lambda result: True,
+    ) -> Dict[str, Any]:
+        cached, waiter = self.reserve(key)
+        if cached is not None:
+            return cached
+        if waiter is not None:
+            return self.wait_for(waiter)
+
+        try:
+            result = compute()
+        except BaseException as exc:
+            self.complete(key, None, error=exc)
+            raise
+        self.complete(key, result, store_key=key if should_store(result) else "")
+        return result
+
+    def evict(self) -> int:
+        with self._lock:
+            removed = 0
+            if self.ttl_sec > 0:
+                cur = self._conn.execute("DELETE FROM analyses WHERE created_at < ?", (time.time() - self.ttl_sec,))
+                removed += cur.rowcount
+            if self.max_entries > 0:
+                cur = self._conn.execute(
+                    "DELETE FROM analyses WHERE cache_key NOT IN "
+                    "(SELECT cache_key FROM analyses ORDER BY last_used DESC LIMIT ?)",
+                    (self.max_entries,),
+                )
+                removed += cur.rowcount
+            self._conn.commit()
+            return removed
+
+    def close(self) -> None:
+        self.evict()
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,128 @@
+# -*- coding: utf-8 -*-
+import threading
+import time
+from typing import Any, Callable, Dict
+
+import config
+
+# 请求结果分类：ok 参与加性增长；overload（429 / 5xx / 超时）触发乘性下降；
+# error（鉴权、4xx 等与容量无关的失败）不调整
+OUTCOME_OK = "ok"
+OUTCOME_OVERLOAD = "overload"
+OUTCOME_ERROR = "error"
+
+
+# AIMD 并发控制：健康时每经过约一个“窗口”的成功请求把上限 +1，
+# 过载时上限减半（冷却期内只减一次），始终夹在 [min_limit, max_limit]。
+class AIMDController:
+    def __init__(
+        self,
+        name: str,
+        initial: int,
+        min_limit: int,
+        max_limit: int,
+        decrease: float = 0.5,
+        latency_tolerance: float = 2.0,
+        cooldown_sec: float = 5.0,
+        clock: Callable[[], float] = time.monotonic,
+        log: Callable[[str], None] = print,
+    ) -> None:
+        self.name = name
+        self.min_limit = max(1, min_limit)
+        self.max_limit = max(self.min_limit, max_limit)
+        self.limit = float(min(self.max_limit, max(self.min_limit, initial)))
+        self.decrease = decrease
+        self.latency_tolerance = latency_tolerance
+        self.cooldown_sec = cooldown_sec
+        self.clock = clock
+        self.log = log
+        self.in_flight = 0
+        self.stats = {"increases": 0, "decreases": 0, "peak": int(self.limit)}
+        self._latency_ewma = 0.0
+        self._latency_floor = 0.0
+        self._last_cut = float("-inf")
+        self._cond = threading.Condition()
+
+    @property
+    def current(self) -> int:
+        return int(self.limit)
+
+    def acquire(self) -> None:
+        with self._cond:
+            while self.in_flight >= int(self.limit):
+                self._cond.wait()
+            self.in_flight += 1
+
+    def release(self, outcome: str, latency: float) -> None:
+        with self._cond:
+            self.in_flight = max(0, self.in_flight - 1)
+            before = int(self.limit)
+            if outcome == OUTCOME_OVERLOAD:
+                now = self.clock()
+                if now - self._last_cut >= self.cooldown_sec:
+                    self._last_cut = now
+                    self.limit = max(float(self.min_limit), self.limit * self.decrease)
+            elif outcome == OUTCOME_OK:
+                if self._healthy_latency(latency):
+                    self.limit = min(float(self.max_limit), self.limit + 1.0 / max(1.0, self.limit))
+            after = int(self.limit)
+            if after != before:
+                key = "increases" if after > before else "decreases"
+                self.stats[key] += 1
+                self.stats["peak"] = max(self.stats["peak"], after)
+                reason = "healthy" if after > before else "overload"
+                self.log(f"[Concurrency] provider={self.name} {before} -> {after} ({reason}) in_flight={self.in_flight}")
+            self._cond.notify_all()
+
+    def _healthy_latency(self, latency: float) -> bool:
+        # 延迟 EWMA 明显高于历史最低水平时视为开始排队，不再加并发
+        if latency <= 0:
+            return True
+        self._latency_ewma = latency if self._latency_ewma == 0 else 0.8 * self._latency_ewma + 0.2 * latency
+        if self._latency_floor == 0 or self._latency_ewma < self._latency_floor:
+            self._latency_floor = self._latency_ewma
+        return self._latency_ewma <= self._latency_floor * self.latency_tolerance
+
+
+_CONTROLLERS: Dict[str, AIMDController] = {}
+_CONTROLLERS_LOCK = threading.Lock()
+
+
+def get_concurrency_controller(name: str, log: Callable[[str], None] = print) -> AIMDController:
+    with _CONTROLLERS_LOCK:
+        controller = _CONTROLLERS.get(name)
+        if controller is None:
+            if config.ENABLE_ADAPTIVE_CONCURRENCY:
+                min_limit, max_limit = config.LLM_CONCURRENCY_MIN, config.LLM_CONCURRENCY_MAX
+            else:
+                min_limit = max_limit = config.LLM_CONCURRENCY
+            controller = AIMDController(
+                name,
+                initial=config.LLM_CONCURRENCY,
+                min_limit=min_limit,
+                max_limit=max_limit,
+                latency_tolerance=config.LLM_LATENCY_TOLERANCE,
+                log=log,
+            )
+            _CONTROLLERS[name] = controller
+        return controller
+
+
+def worker_count() -> int:
+    # 线程池按上限开，实际在途请求数由控制器约束
+    if config.ENABLE_ADAPTIVE_CONCURRENCY:
+        return max(config.LLM_CONCURRENCY, config.LLM_CONCURRENCY_MAX)
+    return config.LLM_CONCURRENCY
+
+
+def controller_stats() -> Dict[str, Dict[str, Any]]:
+    with _CONTROLLERS_LOCK:
+        return {
+            name: dict(controller.stats, final=controller.current, min=controller.min_limit, max=controller.max_limit)
+            for name, controller in _CONTROLLERS.items()
+        }
+
+
+def reset_controllers() -> None:
+    with _CONTROLLERS_LOCK:
+        _CONTROLLERS.clear()
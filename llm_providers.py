@@ -0,0 +1,255 @@
+# -*- coding: utf-8 -*-
+import re
+from typing import Any, Dict, List, Optional
+
+import config
+
+# task: "summary"（单篇分析）/ "featured"（精选筛选）
+TASK_SUMMARY = "summary"
+TASK_FEATURED = "featured"
+
+
+# provider 适配器：只负责鉴权、模型、请求体、响应解析和状态分类，
+# 重试 / 退避 / 告警由 rss_ingest.run_llm_request 统一处理。
+class ProviderAdapter:
+    name = ""
+    service = ""
+    key_env = ""
+
+    def api_key(self) -> str:
+        return getattr(config, self.key_env, "") or ""
+
+    def model(self, task: str) -> str:
+        raise NotImplementedError
+
+    def url(self, model: str) -> str:
+        raise NotImplementedError
+
+    def timeout(self) -> int:
+        raise NotImplementedError
+
+    def retries(self) -> int:
+        raise NotImplementedError
+
+    def headers(self) -> Dict[str, str]:
+        return {"Content-Type": "application/json", "Authorization": f"Bearer {self.api_key()}"}
+
+    def build_payload(self, prompt: str, model: str, task: str) -> Dict[str, Any]:
+        raise NotImplementedError
+
+    def parse_text(self, data: Dict[str, Any]) -> str:
+        raise NotImplementedError
+
+    def enable_json_mode(self, payload: Dict[str, Any]) -> bool:
+        # 支持结构化输出的 provider 在请求体里打开 JSON 模式，返回是否生效
+        return False
+
+    def classify_status(self, status_code: int) -> str:
+        if status_code == 200:
+            return "ok"
+        if status_code in (401, 403):
+            return "auth"
+        if status_code == 429:
+            return "rate_limit"
+        if status_code in (500, 502, 503, 504):
+            return "server_error"
+        return "bad_status"
+
+
+class ChatCompletionsAdapter(ProviderAdapter):
+    base_url_env = ""
+    model_env = ""
+    timeout_env = ""
+    retries_env = ""
+    # 是否支持 response_format={"type": "json_object"}
+    json_object_mode = False
+
+    def model(self, task: str) -> str:
+        return getattr(config, self.model_env)
+
+    def url(self, model: str) -> str:
+        return f"{getattr(config, self.base_url_env)}/chat/completions"
+
+    def timeout(self) -> int:
+        return getattr(config, self.timeout_env)
+
+    def retries(self) -> int:
+        return getattr(config, self.retries_env)
+
+    def build_payload(self, prompt: str, model: str, task: str) -> Dict[str, Any]:
+        return {"model": model, "messages": [{"role": "user", "content": prompt}]}
+
+    def parse_text(self, data: Dict[str, Any]) -> str:
+        choices = data.get("choices") or []
+        if not choices:
+            raise ValueError("empty choices")
+        message = choices[0].get("message") or {}
+        return (message.get("content") or "").strip()
+
+    def enable_json_mode(self, payload: Dict[str, Any]) -> bool:
+        if not self.json_object_mode:
+            return False
+        payload["response_format"] = {"type": "json_object"}
+        return True
+
+
+class IFlowAdapter(ChatCompletionsAdapter):
+    name = "iflow"
+    service = "iFlow"
+    key_env = "IFLOW_API_KEY"
+    base_url_env = "IFLOW_BASE_URL"
+    model_env = "IFLOW_MODEL"
+    timeout_env = "IFLOW_TIMEOUT"
+    retries_env = "IFLOW_RETRIES"
+
+
+class DeepSeekAdapter(ChatCompletionsAdapter):
+    name = "deepseek"
+    service = "DeepSeek"
+    key_env = "DEEPSEEK_API_KEY"
+    base_url_env = "DEEPSEEK_BASE_URL"
+    model_env = "DEEPSEEK_MODEL"
+    timeout_env = "DEEPSEEK_TIMEOUT"
+    retries_env = "DEEPSEEK_RETRIES"
+    json_object_mode = True
+
+    def build_payload(self, prompt: str, model: str, task: str) -> Dict[str, Any]:
+        payload = super().build_payload(prompt, model, task)
+        payload["stream"] = False
+        return payload
+
+
+class ZhipuAdapter(ChatCompletionsAdapter):
+    name = "zhipu"
+    service = "Zhipu"
+    key_env = "ZHIPU_API_KEY"
+    base_url_env = "ZHIPU_BASE_URL"
+    model_env = "ZHIPU_MODEL"
+    timeout_env = "ZHIPU_TIMEOUT"
+    retries_env = "ZHIPU_RETRIES"
+    json_object_mode = True
+
+
+class NvidiaAdapter(ChatCompletionsAdapter):
+    name = "nvidia"
+    service = "NVIDIA"
+    key_env = "NVIDIA_API_KEY"
+
+    def model(self, task: str) -> str:
+        return config.QWEN_MODEL_NAME_SUMMARY if task == TASK_SUMMARY else config.QWEN_MODEL_NAME_PRO
+
+    def url(self, model: str) -> str:
+        return "https://integrate.api.nvidia.com/v1/chat/completions"
+
+    def timeout(self) -> int:
+        return 300
+
+    def retries(self) -> int:
+        return config.NVIDIA_RETRIES
+
+    def build_payload(self, prompt: str, model: str, task: str) -> Dict[str, Any]:
+        payload = super().build_payload(prompt, model, task)
+        if task == TASK_SUMMARY:
+            payload.update({"temperature": 0.6, "top_p": 0.7, "max_tokens": 4096, "stream": False})
+        return payload
+
+    def parse_text(self, data: Dict[str, Any]) -> str:
+        raw_text = super().parse_text(data)
+        # Drop <think> blocks to keep final JSON only (align with test.py behavior)
+        raw_text = re.sub(r"<think>.*?</think>", "", raw_text, flags=re.S)
+        if "<think>" in raw_text:
+            raw_text = raw_text.split("<think>", 1)[0]
+        return raw_text.strip()
+
+
+class OpenAIAdapter(ProviderAdapter):
+    name = "openai"
+    service = "OpenAI"
+    key_env = "OPENAI_API_KEY"
+
+    def model(self, task: str) -> str:
+        return config.OPENAI_MODEL
+
+    def url(self, model: str) -> str:
+        return f"{config.OPENAI_BASE_URL}/responses"
+
+    def timeout(self) -> int:
+        return config.OPENAI_TIMEOUT
+
+    def retries(self) -> int:
+        return config.OPENAI_RETRIES
+
+    def build_payload(self, prompt: str, model: str, task: str) -> Dict[str, Any]:
+        return {"model": model, "input": prompt}
+
+    def enable_json_mode(self, payload: Dict[str, Any]) -> bool:
+        payload["text"] = {"format": {"type": "json_object"}}
+        return True
+
+    def parse_text(self, data: Dict[str, Any]) -> str:
+        if isinstance(data.get("output_text"), str) and data["output_text"]:
+            return data["output_text"]
+        parts: List[str] = []
+        outputs = data.get("output") or []
+        if isinstance(outputs, list):
+            for item in outputs:
+                if not isinstance(item, dict):
+                    continue
+                if isinstance(item.get("text"), str):
+                    parts.append(item["text"])
+                content = item.get("content") or []
+                if isinstance(content, list):
+                    for piece in content:
+                        if isinstance(piece, dict) and isinstance(piece.get("text"), str):
+                            parts.append(piece["text"])
+        return "".join(parts)
+
+
+class GeminiAdapter(ProviderAdapter):
+    name = "gemini"
+    service = "Gemini"
+    key_env = "GEMINI_API_KEY"
+
+    def model(self, task: str) -> str:
+        return config.GEMINI_MODEL_NAME_SUMMARY if task == TASK_SUMMARY else config.GEMINI_MODEL_NAME_PRO
+
+    def url(self, model: str) -> str:
+        return f"https://generativelanguage.googleapis.com/v1beta/models/{model}:generateContent"
+
+    def timeout(self) -> int:
+        return config.GEMINI_TIMEOUT
+
+    def retries(self) -> int:
+        return config.GEMINI_RETRIES
+
+    def headers(self) -> Dict[str, str]:
+        return {"Content-Type": "application/json", "x-goog-api-key": self.api_key()}
+
+    def build_payload(self, prompt: str, model: str, task: str) -> Dict[str, Any]:
+        return {"contents": [{"parts": [{"text": prompt}]}]}
+
+    def enable_json_mode(self, payload: Dict[str, Any]) -> bool:
+        payload.setdefault("generationConfig", {})["responseMimeType"] = "application/json"
+        return True
+
+    def parse_text(self, data: Dict[str, Any]) -> str:
+        parts = data["candidates"][0]["content"]["parts"]
+        return "".join(p.get("text", "") for p in parts).strip()
+
+
+PROVIDERS: Dict[str, ProviderAdapter] = {
+    adapter.name: adapter
+    for adapter in (
+        GeminiAdapter(),
+        IFlowAdapter(),
+        OpenAIAdapter(),
+        DeepSeekAdapter(),
+        ZhipuAdapter(),
+        NvidiaAdapter(),
+    )
+}
+DEFAULT_PROVIDER = "gemini"
+
+
+def get_provider(name: str) -> Optional[ProviderAdapter]:
+    return PROVIDERS.get((name or "").strip().lower())
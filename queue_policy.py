@@ -0,0 +1,101 @@
+# -*- coding: utf-8 -*-
+import heapq
+import json
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Callable, Dict, List
+
+# LLM 队列派发顺序（线程池按提交顺序取任务）：
+# priority    —— 按优先级（调用方已排序，原样保留）
+# round_robin —— 按 source_id 轮转，单个源不会独占所有 worker；源内保持原有顺序
+# lpt         —— 最长处理时间优先（按正文长度），避免长文章压在队尾拉长整轮耗时
+POLICY_PRIORITY = "priority"
+POLICY_ROUND_ROBIN = "round_robin"
+POLICY_LPT = "lpt"
+
+
+def item_size(item: Dict[str, Any]) -> int:
+    # 录制的队列只保存长度
+    if "content_len" in item:
+        return int(item["content_len"])
+    article = item.get("article") or {}
+    return len(article.get("title") or "") + len(article.get("content") or "")
+
+
+def round_robin_order(queue: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    groups: "OrderedDict[str, List[Dict[str, Any]]]" = OrderedDict()
+    for item in queue:
+        groups.setdefault(item.get("source_id") or "", []).append(item)
+    ordered: List[Dict[str, Any]] = []
+    depth = 0
+    while len(ordered) < len(queue):
+        for items in groups.values():
+            if depth < len(items):
+                ordered.append(items[depth])
+        depth += 1
+    return ordered
+
+
+def lpt_order(queue: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    return sorted(queue, key=item_size, reverse=True)
+
+
+SCHEDULE_POLICIES: Dict[str, Callable[[List[Dict[str, Any]]], List[Dict[str, Any]]]] = {
+    POLICY_PRIORITY: list,
+    POLICY_ROUND_ROBIN: round_robin_order,
+    POLICY_LPT: lpt_order,
+}
+
+
+def resolve_schedule_policy(policy: str) -> str:
+    name = (policy or "").strip().lower()
+    return name if name in SCHEDULE_POLICIES else POLICY_PRIORITY
+
+
+def apply_schedule_policy(queue: List[Dict[str, Any]], policy: str) -> List[Dict[str, Any]]:
+    return SCHEDULE_POLICIES[resolve_schedule_policy(policy)](queue)
+
+
+def write_queue_record(path: str, records: List[Dict[str, Any]]) -> None:
+    target = Path(path)
+    target.parent.mkdir(parents=True, exist_ok=True)
+    with target.open("w", encoding="utf-8") as f:
+        for record in records:
+            f.write(json.dumps(record, ensure_ascii=False) + "\n")
+
+
+def load_queue_record(path: str) -> List[Dict[str, Any]]:
+    with open(path, "r", encoding="utf-8") as f:
+        records = [json.loads(line) for line in f if line.strip()]
+    return sorted(records, key=lambda r: r.get("rank", 0))
+
+
+def simulate_drain(
+    queue: List[Dict[str, Any]],
+    workers: int,
+    service_time: Callable[[Dict[str, Any]], float],
+) -> Dict[str, float]:
+    # 按提交顺序把任务派给最早空闲的 worker，返回整轮耗时与各源完成情况
+    free_at = [0.0] * max(1, workers)
+    heapq.heapify(free_at)
+    makespan = 0.0
+    first_done: Dict[str, float] = {}
+    last_done: Dict[str, float] = {}
+    total_wait = 0.0
+    for item in queue:
+        start = heapq.heappop(free_at)
+        end = start + max(0.0, service_time(item))
+        heapq.heappush(free_at, end)
+        total_wait += start
+        makespan = max(makespan, end)
+        source_id = item.get("source_id") or ""
+        first_done.setdefault(source_id, end)
+        last_done[source_id] = end
+    sources = max(1, len(first_done))
+    return {
+        "makespan": makespan,
+        "mean_wait": total_wait / max(1, len(queue)),
+        "mean_source_first": sum(first_done.values()) / sources,
+        "max_source_first": max(first_done.values(), default=0.0),
+        "mean_source_last": sum(last_done.values()) / sources,
+    }
@@ -0,0 +1,166 @@
+# -*- coding: utf-8 -*-
+import re
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from typing import Any, Callable, Dict, Mapping, Optional
+
+import config
+
+# 未返回 Retry-After 时的 429 全局退避（秒），连续 429 时指数增长
+DEFAULT_BACKOFF_SEC = 2.0
+MAX_BACKOFF_SEC = 60.0
+
+
+def parse_retry_after(value: Any, now: Optional[float] = None) -> Optional[float]:
+    if value is None or value == "":
+        return None
+    text = str(value).strip()
+    try:
+        return max(0.0, float(text))
+    except ValueError:
+        pass
+    try:
+        when = parsedate_to_datetime(text)
+    except (TypeError, ValueError):
+        return None
+    current = time.time() if now is None else now
+    return max(0.0, when.timestamp() - current)
+
+
+def parse_reset_duration(value: Any) -> Optional[float]:
+    # OpenAI 风格的重置时长："1s" / "6m0s" / "20ms" / "1h2m3.5s"，也兼容纯数字秒
+    if value is None or value == "":
+        return None
+    text = str(value).strip()
+    try:
+        return max(0.0, float(text))
+    except ValueError:
+        pass
+    parts = re.findall(r"(\d+(?:\.\d+)?)(ms|h|m|s)", text)
+    if not parts:
+        return None
+    scale = {"ms": 0.001, "s": 1.0, "m": 60.0, "h": 3600.0}
+    return sum(float(num) * scale[unit] for num, unit in parts)
+
+
+class TokenBucket:
+    def __init__(self, per_minute: float, burst_sec: float = 10.0) -> None:
+        self.rate = per_minute / 60.0
+        self.capacity = max(1.0, self.rate * burst_sec)
+        self.level = self.capacity
+        self.updated: Optional[float] = None
+
+    def _refill(self, now: float) -> None:
+        if self.updated is not None:
+            self.level = min(self.capacity, self.level + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def wait_for(self, amount: float, now: float) -> float:
+        self._refill(now)
+        amount = min(amount, self.capacity)
+        if self.level >= amount:
+            return 0.0
+        return (amount - self.level) / self.rate
+
+    def take(self, amount: float) -> None:
+        self.level -= min(amount, self.capacity)
+
+
+# 单个 provider 共享的限流器：请求数 / token 数两个令牌桶，
+# 外加一个全局暂停点（429、Retry-After、x-ratelimit-remaining=0 时所有线程一起等待）。
+class ProviderRateLimiter:
+    def __init__(
+        self,
+        name: str,
+        rpm: int = 0,
+        tpm: int = 0,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+    ) -> None:
+        self.name = name
+        self.requests = TokenBucket(rpm) if rpm > 0 else None
+        self.tokens = TokenBucket(tpm) if tpm > 0 else None
+        self.clock = clock
+        self.sleep = sleep
+        self.stats = {"acquired": 0, "wait_sec": 0.0, "throttled": 0}
+        self._paused_until = 0.0
+        self._consecutive_429 = 0
+        self._lock = threading.Lock()
+
+    def acquire(self, tokens: int = 0) -> float:
+        start = self.clock()
+        while True:
+            with self._lock:
+                now = self.clock()
+                wait = max(0.0, self._paused_until - now)
+                if wait <= 0:
+                    if self.requests is not None:
+                        wait = max(wait, self.requests.wait_for(1, now))
+                    if self.tokens is not None and tokens > 0:
+                        wait = max(wait, self.tokens.wait_for(tokens, now))
+                if wait <= 0:
+                    if self.requests is not None:
+                        self.requests.take(1)
+                    if self.tokens is not None and tokens > 0:
+                        self.tokens.take(tokens)
+                    waited = now - start
+                    self.stats["acquired"] += 1
+                    self.stats["wait_sec"] += waited
+                    return waited
+            self.sleep(min(wait, 5.0))
+
+    def pause(self, seconds: float) -> None:
+        with self._lock:
+            self._paused_until = max(self._paused_until, self.clock() + max(0.0, seconds))
+
+    def observe(self, status_code: int, headers: Optional[Mapping[str, Any]] = None) -> Optional[float]:
+        # 返回本次设置的全局暂停秒数（没有暂停时为 None）
+        lowered = {str(k).lower(): v for k, v in (headers or {}).items()}
+        delay: Optional[float] = None
+
+        for kind in ("requests", "tokens"):
+            remaining = lowered.get(f"x-ratelimit-remaining-{kind}")
+            if remaining is not None and str(remaining).strip() in {"0", "0.0"}:
+                reset = parse_reset_duration(lowered.get(f"x-ratelimit-reset-{kind}"))
+                if reset is not None:
+                    delay = max(delay or 0.0, reset)
+
+        if status_code == 429:
+            retry_after = parse_retry_after(lowered.get("retry-after"))
+            with self._lock:
+                self._consecutive_429 += 1
+                self.stats["throttled"] += 1
+                backoff = min(MAX_BACKOFF_SEC, DEFAULT_BACKOFF_SEC * (2 ** (self._consecutive_429 - 1)))
+            delay = max(delay or 0.0, retry_after if retry_after is not None else backoff)
+        elif 200 <= status_code < 300:
+            with self._lock:
+                self._consecutive_429 = 0
+
+        if delay is not None:
+            self.pause(delay)
+        return delay
+
+
+_LIMITERS: Dict[str, ProviderRateLimiter] = {}
+_LIMITERS_LOCK = threading.Lock()
+
+
+def get_rate_limiter(name: str) -> ProviderRateLimiter:
+    with _LIMITERS_LOCK:
+        limiter = _LIMITERS.get(name)
+        if limiter is None:
+            rpm, tpm = config.LLM_RATE_LIMITS.get(name, (config.LLM_RPM, config.LLM_TPM))
+            limiter = ProviderRateLimiter(name, rpm=rpm, tpm=tpm)
+            _LIMITERS[name] = limiter
+        return limiter
+
+
+def limiter_stats() -> Dict[str, Dict[str, Any]]:
+    with _LIMITERS_LOCK:
+        return {name: dict(limiter.stats) for name, limiter in _LIMITERS.items()}
+
+
+def reset_limiters() -> None:
+    with _LIMITERS_LOCK:
+        _LIMITERS.clear()
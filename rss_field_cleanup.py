@@ -1,14 +1,13 @@
 ﻿# -*- coding: utf-8 -*-
-import requests
-
 import config
+import http_pool
 from feishu_client import get_tenant_access_token, list_bitable_fields
 
 
 def delete_bitable_field(app_token: str, table_id: str, tenant_token: str, field_id: str) -> bool:
     url = f"https://open.feishu.cn/open-apis/bitable/v1/apps/{app_token}/tables/{table_id}/fields/{field_id}"
     headers = {"Authorization": f"Bearer {tenant_token}"}
-    resp = requests.delete(url, headers=headers, timeout=config.HTTP_TIMEOUT)
+    resp = http_pool.delete(url, headers=headers, timeout=config.HTTP_TIMEOUT)
     try:
         data = resp.json()
     except Exception:
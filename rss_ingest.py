@@ -2,26 +2,55 @@
 import datetime as dt
 import hashlib
 import json
+import random
 import re
 import sys
 import threading
 import time
-from concurrent.futures import ThreadPoolExecutor, as_completed
-from typing import Any, Dict, Iterable, List, Optional
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, as_completed, wait
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+from urllib.parse import urlparse
 
 import requests
 
 import config
+import http_pool
+from bitable_writer import BatchRecordWriter
+from dedup_index import ItemKeyIndex
+from embed_batcher import EmbeddingBatcher
 from feishu_client import (
+    TenantToken,
+    TenantTokenProvider,
+    batch_update_bitable_records,
+    create_bitable_field,
     create_bitable_record,
-    create_bitable_record_with_id,
-    get_tenant_access_token,
+    list_bitable_fields,
     list_bitable_records,
     update_bitable_record_fields,
 )
+from json_repair import repair_json, repair_json_detail
+from llm_cache import AnalysisCache, analysis_cache_key
+from llm_concurrency import (
+    OUTCOME_ERROR,
+    OUTCOME_OK,
+    OUTCOME_OVERLOAD,
+    controller_stats,
+    get_concurrency_controller,
+    worker_count,
+)
+from llm_providers import DEFAULT_PROVIDER, PROVIDERS, TASK_FEATURED, TASK_SUMMARY, ProviderAdapter, get_provider
+from queue_policy import apply_schedule_policy, item_size, resolve_schedule_policy, write_queue_record
+from rate_limiter import get_rate_limiter, limiter_stats
 from rss_parser import build_item_key, entry_published_ts, entry_text_content, fetch_feed
+from run_deadline import get_run_deadline, start_run_deadline
+from title_triage import TriageAudit, build_title_triage_prompt, parse_title_triage, should_drop
+from vector_index import LocalVectorIndex, VectorSet, vector_index_available
+from vectorize_writer import VectorUpsertWriter
 
-FAILED_CATEGORIES = {"调用失败", "调用异常", "解析失败", "JSON解析失败", "异常"}
+# 因整轮截止未完成分析：回填失败池但不计失败次数
+DEADLINE_CATEGORY = "截止未处理"
+FAILED_CATEGORIES = {"调用失败", "调用异常", "解析失败", "JSON解析失败", "异常", DEADLINE_CATEGORY}
 
 SYSTEM_PROMPT = """
 # Role
@@ -191,10 +220,10 @@ def render_progress(done: int, total: int, width: int = 20) -> str:
 
 
 ROOT_CAUSE_RECORDED = False
-NOTIFY_TENANT_TOKEN: Optional[str] = None
+NOTIFY_TENANT_TOKEN: Optional[TenantToken] = None
 
 
-def set_notify_tenant_token(token: str) -> None:
+def set_notify_tenant_token(token: TenantToken) -> None:
     global NOTIFY_TENANT_TOKEN
     NOTIFY_TENANT_TOKEN = token
 
@@ -303,49 +332,15 @@ def response_snippet(resp: requests.Response) -> str:
     return f"HTTP {resp.status_code}: {truncate_text(text.strip(), 300)}"
 
 
-def _post_with_retries(
-    url: str,
-    headers: Dict[str, str],
-    payload: Dict[str, Any],
-    timeout: int,
-    retries: int,
-    service: str,
-    parse_text,
-) -> Optional[str]:
-    last_err: Optional[Exception] = None
-    last_status_type: Optional[str] = None
-    last_status_detail = ""
-    for attempt in range(retries):
-        try:
-            resp = requests.post(url, headers=headers, json=payload, timeout=timeout)
-            if resp.status_code in (401, 403):
-                notify_auth_failure(service, response_snippet(resp))
-                return None
-            if resp.status_code in (429, 500, 502, 503, 504):
-                last_status_type = "rate_limit" if resp.status_code == 429 else "server_error"
-                last_status_detail = response_snippet(resp)
-                time.sleep(1.2 * (attempt + 1))
-                continue
-            if resp.status_code != 200:
-                return None
-            try:
-                return parse_text(resp)
-            except Exception as exc:
-                notify_parse_error(service, str(exc))
-                return None
-        except Exception as exc:
-            last_err = exc
-            if "timeout" in str(exc).lower():
-                last_status_type = "timeout"
-            time.sleep(1.0 + attempt)
-
-    if last_status_type == "rate_limit":
-        notify_rate_limit(service, last_status_detail or "HTTP 429")
-    elif last_status_type == "server_error":
-        notify_server_error(service, last_status_detail or "HTTP 5xx")
-    elif last_status_type == "timeout":
-        notify_timeout(service, str(last_err) if last_err else "timeout")
-    return None
+def is_json_mode_rejection(resp: requests.Response) -> bool:
+    # 只有 400 且报错内容指向 JSON 模式参数时才认为模型不支持，其余状态按普通错误处理
+    if resp.status_code != 400:
+        return False
+    try:
+        text = (resp.text or "").lower()
+    except Exception:
+        return False
+    return "response_format" in text or "json" in text
 
 
 def clean_feishu_value(value: Any) -> str:
@@ -477,45 +472,24 @@ def derive_overall_status(consecutive_fail: int, enabled: bool) -> str:
     return config.STATUS_OK
 
 
-def gemini_headers() -> Dict[str, str]:
-    return {"Content-Type": "application/json", "x-goog-api-key": config.GEMINI_API_KEY}
-
-
-def gemini_api_url(model_name: str) -> str:
-    return f"https://generativelanguage.googleapis.com/v1beta/models/{model_name}:generateContent"
-
-
-def iflow_headers() -> Dict[str, str]:
-    return {"Content-Type": "application/json", "Authorization": f"Bearer {config.IFLOW_API_KEY}"}
-
-
-def openai_headers(api_key: str) -> Dict[str, str]:
-    return {"Content-Type": "application/json", "Authorization": f"Bearer {api_key}"}
-
-
-def deepseek_headers() -> Dict[str, str]:
-    return {"Content-Type": "application/json", "Authorization": f"Bearer {config.DEEPSEEK_API_KEY}"}
-
-
-def zhipu_headers() -> Dict[str, str]:
-    return {"Content-Type": "application/json", "Authorization": f"Bearer {config.ZHIPU_API_KEY}"}
-
-
-def nvidia_headers() -> Dict[str, str]:
-    return {"Content-Type": "application/json", "Authorization": f"Bearer {config.NVIDIA_API_KEY}"}
-
-
 def cf_headers() -> Dict[str, str]:
     return {"Authorization": f"Bearer {config.CF_API_TOKEN}", "Content-Type": "application/json"}
 
 
+# Cloudflare 返回 429 以外的 4xx：请求本身有问题，重试没有意义
+class CloudflareRequestError(RuntimeError):
+    def __init__(self, status_code: int, detail: Any) -> None:
+        super().__init__(f"CF HTTP {status_code}: {detail}")
+        self.status_code = status_code
+
+
 def cf_post(url: str, payload: Dict[str, Any], timeout: int, retries: int) -> Dict[str, Any]:
     last_err: Optional[Exception] = None
     last_status_type: Optional[str] = None
     last_status_detail = ""
     for attempt in range(retries):
         try:
-            resp = requests.post(url, headers=cf_headers(), json=payload, timeout=timeout)
+            resp = http_pool.post(url, headers=cf_headers(), json=payload, timeout=timeout)
             if resp.status_code in (429, 500, 502, 503, 504):
                 last_status_type = "rate_limit" if resp.status_code == 429 else "server_error"
                 last_status_detail = response_snippet(resp)
@@ -525,8 +499,10 @@ def cf_post(url: str, payload: Dict[str, Any], timeout: int, retries: int) -> Di
             if resp.status_code in (401, 403):
                 notify_auth_failure("Cloudflare", f"CF {response_snippet(resp)}")
             if resp.status_code >= 400:
-                raise RuntimeError(f"CF HTTP {resp.status_code}: {data}")
+                raise CloudflareRequestError(resp.status_code, data)
             return data
+        except CloudflareRequestError:
+            raise
         except Exception as exc:
             last_err = exc
             if "timeout" in str(exc).lower():
@@ -553,6 +529,112 @@ content：{article.get('content','')}
 """
 
 
+# 批量模式追加在系统提示词之后，覆盖“单个 JSON 对象”的输出约定
+BATCH_PROMPT_PROTOCOL = """
+# 批量模式
+本次输入包含多篇文章（见 Input 数组，每篇带 id）。请对每篇文章独立分析：
+- 输出一个 JSON 数组，每个元素是上述 Schema 的对象，并额外包含 "id" 字段（与输入 id 完全一致）。
+- 每篇文章恰好对应一个元素，不得遗漏、合并或新增。
+- 数组之外不要输出任何内容。
+"""
+
+
+# 级联第一级：只打分 / 分类的精简提示词，评分口径与 SYSTEM_PROMPT 一致
+TRIAGE_PROMPT = """你是 AI / 科技 / 商业资讯的初筛员，判断文章对 AI 创作者、开发者与商业决策者的实用价值。
+评分（0.0-10.0）：9-10 颠覆级（范式转移、全新架构）；7.5-8.9 高价值（可落地工具、有数据的报告、实战教程）；
+5.0-7.4 一般（常规更新、重复信息、公关稿）；0-4.9 噪音（情绪输出、八卦、臆测）。
+分类从以下标签中选 1-3 个：AI新闻、AI工具、AI教程、效率工具、科技趋势、产品思维、创作者经济、商业案例、宏观经济、深度思考、生活方式、AI提示词。
+只输出 JSON：{"score": 0.0, "categories": ["标签"]}
+"""
+
+JSON_FIX_PROMPT = """下面是一段格式不合法的 JSON（可能被截断、含尾逗号或未转义的引号）。
+请修复为合法 JSON：保留原有的键和值，不要补充或改写内容，只输出 JSON 本身。
+
+"""
+
+
+def estimate_tokens(text: str) -> int:
+    # 粗略估算：CJK 字符约 1 token/字，其余约 4 字符/token
+    if not text:
+        return 0
+    cjk = len(re.findall(r"[\u3000-\u9fff\uac00-\ud7af\uff00-\uffef]", text))
+    return cjk + (len(text) - cjk + 3) // 4
+
+
+def article_prompt_tokens(article: Dict[str, Any]) -> int:
+    return estimate_tokens(article.get("title") or "") + estimate_tokens(article.get("content") or "") + 16
+
+
+def build_batch_prompt(articles: List[Dict[str, Any]]) -> str:
+    china_tz = dt.timezone(dt.timedelta(hours=8))
+    now = dt.datetime.now(china_tz)
+    items = [
+        {"id": str(idx), "title": article.get("title") or "", "content": article.get("content") or ""}
+        for idx, article in enumerate(articles, 1)
+    ]
+    return f"""{SYSTEM_PROMPT}
+{BATCH_PROMPT_PROTOCOL}
+你所处的时间为：{now.year}年{now.month:02d}月
+
+# Input
+{json.dumps(items, ensure_ascii=False)}
+"""
+
+
+def extract_json_array(text: str) -> str:
+    if not text:
+        return ""
+    t = text.strip()
+    t = t.replace("```json", "").replace("```JSON", "").replace("```", "").strip()
+    first = t.find("[")
+    last = t.rfind("]")
+    if first != -1 and last != -1 and last > first:
+        return t[first:last + 1]
+    return t
+
+
+def is_complete_analysis(data: Any) -> bool:
+    # 修复得到的结果要求字段齐全，缺字段多半是输出被截断
+    if not isinstance(data, dict) or "score" not in data or not isinstance(data.get("categories"), list):
+        return False
+    points = data.get("points")
+    return (
+        bool(str(data.get("title_zh") or "").strip())
+        and bool(str(data.get("one_liner") or "").strip())
+        and isinstance(points, list)
+        and bool(points)
+    )
+
+
+def parse_batch_results(raw_text: str, count: int) -> Dict[int, Dict[str, Any]]:
+    # 返回 {输入下标: 分析结果}；缺失或格式不对的元素不出现在结果里，由调用方单篇回退
+    try:
+        data = json.loads(extract_json_array(raw_text))
+    except (TypeError, ValueError):
+        data, truncated = repair_json_detail(raw_text or "")
+        # 数组被截断时最后一个元素可能只剩半截，一律丢弃
+        if truncated and isinstance(data, list) and data:
+            data = data[:-1]
+    if not isinstance(data, list):
+        return {}
+    results: Dict[int, Dict[str, Any]] = {}
+    for element in data:
+        if not isinstance(element, dict):
+            continue
+        try:
+            idx = int(str(element.get("id")).strip()) - 1
+        except ValueError:
+            continue
+        if idx < 0 or idx >= count or idx in results:
+            continue
+        if not is_complete_analysis(element):
+            continue
+        analysis = dict(element)
+        analysis.pop("id", None)
+        results[idx] = analysis
+    return results
+
+
 def build_featured_prompt(items: List[Dict[str, str]]) -> str:
     prompt = (config.FEATURED_PROMPT or "").strip() or FEATURED_PROMPT_DEFAULT
     payload = {"items": items}
@@ -581,165 +663,143 @@ def parse_llm_json(raw_text: str, service: str) -> Optional[Dict[str, Any]]:
     except json.JSONDecodeError as exc:
         notify_parse_error(service, str(exc))
         return None
- 
-def _post_with_retries(
-    url: str,
-    headers: Dict[str, str],
-    payload: Dict[str, Any],
-    timeout: int,
-    retries: int,
-    service: str,
-    parse_text,
-) -> Optional[str]:
+
+
+def llm_failure(summary: str = "", category: str = "调用失败") -> Dict[str, Any]:
+    return {"categories": [category], "score": 0.0, "summary": summary, "title_zh": "", "one_liner": "", "points": []}
+
+
+def request_failure(error: str, detail: str = "") -> Dict[str, Any]:
+    # run_llm_request 没拿到输出时的失败结果
+    if error == "exhausted":
+        return llm_failure(detail, "调用异常")
+    if error == "deadline":
+        return llm_failure("run deadline", DEADLINE_CATEGORY)
+    return llm_failure()
+
+
+def resolve_provider(name: str) -> ProviderAdapter:
+    adapter = get_provider(name or DEFAULT_PROVIDER)
+    if adapter is None:
+        log(f"[LLM] unknown provider={name}, fallback to {DEFAULT_PROVIDER}")
+        adapter = PROVIDERS[DEFAULT_PROVIDER]
+    return adapter
+
+
+LLM_OUTCOMES = {"ok": OUTCOME_OK, "rate_limit": OUTCOME_OVERLOAD, "server_error": OUTCOME_OVERLOAD}
+JSON_MODE_REJECTED: set = set()
+
+# 每个 provider 的分析输出解析情况：ok 直接解析 / local_repaired 本地修复 / llm_repaired 模型修复 / failed
+LLM_PARSE_STATS: Dict[str, Dict[str, int]] = {}
+LLM_PARSE_LOCK = threading.Lock()
+
+
+def record_parse_outcome(provider: str, outcome: str) -> None:
+    with LLM_PARSE_LOCK:
+        item = LLM_PARSE_STATS.setdefault(provider, {"ok": 0, "local_repaired": 0, "llm_repaired": 0, "failed": 0})
+        item[outcome] += 1
+
+
+# 所有 provider 共用的请求循环：退避重试、状态分类、告警；返回 (text, error, detail)，成功时 error 为空
+def run_llm_request(
+    adapter: ProviderAdapter,
+    prompt: str,
+    task: str = TASK_SUMMARY,
+    service: str = "",
+    json_mode: bool = False,
+    model: str = "",
+) -> Tuple[Optional[str], str, str]:
+    service = service or adapter.service
+    model = model or adapter.model(task)
+    url = adapter.url(model)
+    payload = adapter.build_payload(prompt, model, task)
+    json_active = json_mode and config.LLM_JSON_MODE and adapter.name not in JSON_MODE_REJECTED
+    json_active = json_active and adapter.enable_json_mode(payload)
+    # 令牌桶按“输入估算 + 输出上限”扣减
+    limiter = get_rate_limiter(adapter.name)
+    controller = get_concurrency_controller(adapter.name, log=log)
+    est_tokens = estimate_tokens(prompt) + int(payload.get("max_tokens") or 1024)
+    # 单次超时和重试次数都受整轮截止约束；精选属于收尾，可以使用预留时间
+    deadline = get_run_deadline()
+    reserve = task == TASK_SUMMARY
+
     last_err: Optional[Exception] = None
     last_status_type: Optional[str] = None
     last_status_detail = ""
-    for attempt in range(retries):
+    for attempt in range(adapter.retries()):
+        if deadline.call_timeout(adapter.timeout(), reserve) is None:
+            last_status_type = "deadline"
+            break
+        limiter.acquire(est_tokens)
+        controller.acquire()
+        timeout = deadline.call_timeout(adapter.timeout(), reserve)
+        if timeout is None:
+            controller.release(OUTCOME_ERROR, 0.0)
+            last_status_type = "deadline"
+            break
+        started = time.monotonic()
         try:
-            resp = requests.post(url, headers=headers, json=payload, timeout=timeout)
-            if resp.status_code in (401, 403):
-                notify_auth_failure(service, response_snippet(resp))
-                return None
-            if resp.status_code in (429, 500, 502, 503, 504):
-                last_status_type = "rate_limit" if resp.status_code == 429 else "server_error"
-                last_status_detail = response_snippet(resp)
-                time.sleep(1.2 * (attempt + 1))
-                continue
-            if resp.status_code != 200:
-                return None
-            try:
-                return parse_text(resp)
-            except Exception as exc:
-                notify_parse_error(service, str(exc))
-                return None
+            resp = http_pool.post(url, headers=adapter.headers(), json=payload, timeout=timeout)
         except Exception as exc:
             last_err = exc
-            if "timeout" in str(exc).lower():
+            timed_out = "timeout" in str(exc).lower()
+            controller.release(OUTCOME_OVERLOAD if timed_out else OUTCOME_ERROR, time.monotonic() - started)
+            if timed_out:
                 last_status_type = "timeout"
             time.sleep(1.0 + attempt)
+            continue
 
+        limiter.observe(resp.status_code, getattr(resp, "headers", None))
+        status = adapter.classify_status(resp.status_code)
+        controller.release(LLM_OUTCOMES.get(status, OUTCOME_ERROR), time.monotonic() - started)
+        if status == "auth":
+            notify_auth_failure(service, response_snippet(resp))
+            return None, "auth", ""
+        if status == "rate_limit":
+            # 429 已让限流器全局暂停（Retry-After 或指数退避），下一次 acquire 会一起等待
+            last_status_type = status
+            last_status_detail = response_snippet(resp)
+            continue
+        if status == "server_error":
+            last_status_type = status
+            last_status_detail = response_snippet(resp)
+            time.sleep(1.2 * (attempt + 1))
+            continue
+        if status != "ok" and json_active and is_json_mode_rejection(resp):
+            # 模型不接受 JSON 模式参数时本轮不再请求 JSON 模式，改为普通请求重试
+            log(f"[{service}] json mode rejected, retry without it: {response_snippet(resp)}")
+            JSON_MODE_REJECTED.add(adapter.name)
+            payload = adapter.build_payload(prompt, model, task)
+            json_active = False
+            continue
+        if status != "ok":
+            log(f"[{service}] bad status: {response_snippet(resp)}")
+            return None, "bad_status", ""
+        try:
+            return adapter.parse_text(resp.json()), "", ""
+        except Exception as exc:
+            notify_parse_error(service, str(exc))
+            return None, "parse_error", str(exc)
+
+    if last_status_type == "deadline":
+        log(f"[{service}] run deadline reached, remaining={deadline.remaining():.0f}s")
+        return None, "deadline", ""
     if last_status_type == "rate_limit":
         notify_rate_limit(service, last_status_detail or "HTTP 429")
     elif last_status_type == "server_error":
         notify_server_error(service, last_status_detail or "HTTP 5xx")
     elif last_status_type == "timeout":
         notify_timeout(service, str(last_err) if last_err else "timeout")
-    return None
-def call_featured_llm(prompt: str) -> Optional[str]:
-    provider = config.LLM_PROVIDER
-    service = f"Featured:{provider}"
-    known = {"openai", "gemini", "iflow", "deepseek", "zhipu", "nvidia"}
-    if not provider:
-        provider = "gemini"
-        service = f"Featured:{provider}"
-    elif provider not in known:
-        log(f"[LLM] unknown provider={provider}, fallback to gemini")
-        provider = "gemini"
-        service = f"Featured:{provider}"
-
-    if provider == "openai":
-        if not config.OPENAI_API_KEY:
-            notify_auth_failure("OpenAI", "missing OPENAI_API_KEY")
-            return None
-        url = f"{config.OPENAI_BASE_URL}/responses"
-        headers = openai_headers(config.OPENAI_API_KEY)
-        payload = {"model": config.OPENAI_MODEL, "input": prompt}
-
-        def parse_text(resp: requests.Response) -> str:
-            data = resp.json()
-            if isinstance(data.get("output_text"), str):
-                return data.get("output_text", "")
-            outputs = data.get("output") or []
-            parts: List[str] = []
-            if isinstance(outputs, list):
-                for item in outputs:
-                    if isinstance(item, dict):
-                        if isinstance(item.get("text"), str):
-                            parts.append(item["text"])
-                        content = item.get("content") or []
-                        if isinstance(content, list):
-                            for piece in content:
-                                if isinstance(piece, dict) and isinstance(piece.get("text"), str):
-                                    parts.append(piece["text"])
-            return "".join(parts)
-
-        return _post_with_retries(url, headers, payload, config.OPENAI_TIMEOUT, config.OPENAI_RETRIES, service, parse_text)
-
-    if provider == "gemini":
-        if not config.GEMINI_API_KEY:
-            notify_auth_failure("Gemini", "missing GEMINI_API_KEY")
-            return None
-        url = gemini_api_url(config.GEMINI_MODEL_NAME_PRO)
-        headers = gemini_headers()
-        payload = {"contents": [{"parts": [{"text": prompt}]}]}
-
-        def parse_text(resp: requests.Response) -> str:
-            data = resp.json()
-            parts = data["candidates"][0]["content"]["parts"]
-            return "".join(p.get("text", "") for p in parts).strip()
-
-        return _post_with_retries(url, headers, payload, config.GEMINI_TIMEOUT, config.GEMINI_RETRIES, service, parse_text)
-
-    if provider == "iflow":
-        if not config.IFLOW_API_KEY:
-            notify_auth_failure("iFlow", "missing IFLOW_API_KEY")
-            return None
-        url = f"{config.IFLOW_BASE_URL}/chat/completions"
-        headers = iflow_headers()
-        payload = {"model": config.IFLOW_MODEL, "messages": [{"role": "user", "content": prompt}]}
-
-        def parse_text(resp: requests.Response) -> str:
-            data = resp.json()
-            return data["choices"][0]["message"]["content"]
-
-        return _post_with_retries(url, headers, payload, config.IFLOW_TIMEOUT, config.IFLOW_RETRIES, service, parse_text)
-
-    if provider == "deepseek":
-        if not config.DEEPSEEK_API_KEY:
-            notify_auth_failure("DeepSeek", "missing DEEPSEEK_API_KEY")
-            return None
-        url = f"{config.DEEPSEEK_BASE_URL}/chat/completions"
-        headers = deepseek_headers()
-        payload = {"model": config.DEEPSEEK_MODEL, "messages": [{"role": "user", "content": prompt}]}
-
-        def parse_text(resp: requests.Response) -> str:
-            data = resp.json()
-            return data["choices"][0]["message"]["content"]
-
-        return _post_with_retries(url, headers, payload, config.DEEPSEEK_TIMEOUT, config.DEEPSEEK_RETRIES, service, parse_text)
+    return None, "exhausted", str(last_err) if last_err else ""
 
-    if provider == "zhipu":
-        if not config.ZHIPU_API_KEY:
-            notify_auth_failure("Zhipu", "missing ZHIPU_API_KEY")
-            return None
-        url = f"{config.ZHIPU_BASE_URL}/chat/completions"
-        headers = zhipu_headers()
-        payload = {"model": config.ZHIPU_MODEL, "messages": [{"role": "user", "content": prompt}]}
 
-        def parse_text(resp: requests.Response) -> str:
-            data = resp.json()
-            return data["choices"][0]["message"]["content"]
-
-        return _post_with_retries(url, headers, payload, config.ZHIPU_TIMEOUT, config.ZHIPU_RETRIES, service, parse_text)
-
-    if provider == "nvidia":
-        if not config.NVIDIA_API_KEY:
-            notify_auth_failure("NVIDIA", "missing NVIDIA_API_KEY")
-            return None
-        url = "https://integrate.api.nvidia.com/v1/chat/completions"
-        headers = nvidia_headers()
-        payload = {
-            "model": config.QWEN_MODEL_NAME_PRO,
-            "messages": [{"role": "user", "content": prompt}],
-        }
-
-        def parse_text(resp: requests.Response) -> str:
-            data = resp.json()
-            return data["choices"][0]["message"]["content"]
-
-        return _post_with_retries(url, headers, payload, 300, config.NVIDIA_RETRIES, service, parse_text)
-
-    return None
+def call_featured_llm(prompt: str) -> Optional[str]:
+    adapter = resolve_provider(config.LLM_PROVIDER)
+    if not adapter.api_key():
+        notify_auth_failure(adapter.service, f"missing {adapter.key_env}")
+        return None
+    text, _, _ = run_llm_request(adapter, prompt, TASK_FEATURED, service=f"Featured:{adapter.name}", json_mode=True)
+    return text
 
 
 def parse_featured_ids(raw_text: str, service: str = "Featured") -> List[str]:
@@ -758,395 +818,352 @@ def parse_featured_ids(raw_text: str, service: str = "Featured") -> List[str]:
     return [str(x) for x in ids if x]
 
 
-def apply_featured(record_ids: List[str], tenant_token: str) -> None:
+def apply_featured(record_ids: List[str], tenant_token: TenantToken) -> None:
     if not record_ids:
         return
-    for record_id in record_ids:
-        update_bitable_record_fields(
-            config.FEISHU_APP_TOKEN,
-            config.FEISHU_NEWS_TABLE_ID,
-            tenant_token,
-            record_id,
-            {config.NEWS_FIELD_FEATURED: True},
-            config.HTTP_TIMEOUT,
-            config.HTTP_RETRIES,
-        )
-def analyze_with_gemini(article: Dict[str, Any]) -> Dict[str, Any]:
-    if not config.GEMINI_API_KEY:
-        notify_auth_failure("Gemini", "missing GEMINI_API_KEY")
-        return {"categories": ["调用失败"], "score": 0.0, "summary": "missing GEMINI_API_KEY", "title_zh": "", "one_liner": "", "points": []}
+    updates = [{"record_id": record_id, "fields": {config.NEWS_FIELD_FEATURED: True}} for record_id in record_ids]
+    flush_record_updates(config.FEISHU_NEWS_TABLE_ID, tenant_token, updates, "featured")
+def fix_json_with_llm(adapter: ProviderAdapter, raw_text: str) -> Optional[Dict[str, Any]]:
+    fixer = resolve_provider(config.LLM_JSON_FIX_PROVIDER) if config.LLM_JSON_FIX_PROVIDER else adapter
+    if not fixer.api_key():
+        return None
+    prompt = JSON_FIX_PROMPT + truncate_text(raw_text, config.LLM_JSON_FIX_MAX_CHARS)
+    text, _, _ = run_llm_request(
+        fixer,
+        prompt,
+        TASK_SUMMARY,
+        service=f"JSONFix:{fixer.name}",
+        json_mode=True,
+        model=config.LLM_JSON_FIX_MODEL,
+    )
+    if not text:
+        return None
+    try:
+        data = json.loads(extract_json_object(text))
+    except ValueError:
+        data = repair_json(text)
+    return data if isinstance(data, dict) else None
 
-    prompt = build_prompt(article)
-    payload = {"contents": [{"parts": [{"text": prompt}]}]}
 
-    last_err: Optional[Exception] = None
-    last_status_type: Optional[str] = None
-    last_status_detail = ""
-    for attempt in range(config.GEMINI_RETRIES):
-        try:
-            url = gemini_api_url(config.GEMINI_MODEL_NAME_SUMMARY)
-            resp = requests.post(url, headers=gemini_headers(), json=payload, timeout=config.GEMINI_TIMEOUT)
-            if resp.status_code in (401, 403):
-                notify_auth_failure("Gemini", response_snippet(resp))
-                return {"categories": ["调用失败"], "score": 0.0, "summary": "", "title_zh": "", "one_liner": "", "points": []}
-            if resp.status_code == 400:
-                return {"categories": ["调用失败"], "score": 0.0, "summary": "", "title_zh": "", "one_liner": "", "points": []}
-            if resp.status_code in (429, 500, 502, 503, 504):
-                last_status_type = "rate_limit" if resp.status_code == 429 else "server_error"
-                last_status_detail = response_snippet(resp)
-                time.sleep(1.2 * (attempt + 1))
-                continue
-            if resp.status_code != 200:
-                return {"categories": ["调用失败"], "score": 0.0, "summary": "", "title_zh": "", "one_liner": "", "points": []}
-
-            raw_json = resp.json()
-            parts = raw_json["candidates"][0]["content"]["parts"]
-            raw_text = "".join(p.get("text", "") for p in parts).strip()
-            json_str = extract_json_object(raw_text)
-            if not json_str:
-                notify_parse_error("Gemini", "empty json")
-                return {"categories": ["调用失败"], "score": 0.0, "summary": "", "title_zh": "", "one_liner": "", "points": []}
-            try:
-                result = json.loads(json_str)
-            except json.JSONDecodeError as exc:
-                notify_parse_error("Gemini", str(exc))
-                return {"categories": ["调用失败"], "score": 0.0, "summary": "", "title_zh": "", "one_liner": "", "points": []}
-            return result
-        except Exception as exc:
-            last_err = exc
-            if "timeout" in str(exc).lower():
-                last_status_type = "timeout"
-            time.sleep(1.0 + attempt)
+def parse_analysis_output(adapter: ProviderAdapter, raw_text: str) -> Optional[Dict[str, Any]]:
+    # 直接解析 -> 本地修复 -> 便宜模型修复，都失败才算解析失败
+    try:
+        data = json.loads(extract_json_object(raw_text))
+        outcome = "ok"
+    except ValueError:
+        data = None
+    if not isinstance(data, dict):
+        data, truncated = repair_json_detail(raw_text)
+        outcome = "local_repaired"
+        # 需要补齐字符串 / 括号的是截断输出，内容不完整，不能当作成功结果
+        if truncated or not is_complete_analysis(data):
+            data = None
+    if not isinstance(data, dict) and config.ENABLE_LLM_JSON_FIX and raw_text.strip():
+        data = fix_json_with_llm(adapter, raw_text)
+        outcome = "llm_repaired"
+        if not is_complete_analysis(data):
+            data = None
+    if not isinstance(data, dict):
+        record_parse_outcome(adapter.name, "failed")
+        notify_parse_error(adapter.service, "invalid json after repair")
+        return None
+    if outcome != "ok":
+        log(f"[{adapter.service}] json {outcome.replace('_', ' ')}")
+    record_parse_outcome(adapter.name, outcome)
+    return data
 
-    if last_status_type == "rate_limit":
-        notify_rate_limit("Gemini", last_status_detail or "HTTP 429")
-    elif last_status_type == "server_error":
-        notify_server_error("Gemini", last_status_detail or "HTTP 5xx")
-    elif last_status_type == "timeout":
-        notify_timeout("Gemini", str(last_err) if last_err else "timeout")
-    return {"categories": ["调用异常"], "score": 0.0, "summary": str(last_err) if last_err else "", "title_zh": "", "one_liner": "", "points": []}
 
+def analyze_with_provider(adapter: ProviderAdapter, article: Dict[str, Any]) -> Dict[str, Any]:
+    if not adapter.api_key():
+        notify_auth_failure(adapter.service, f"missing {adapter.key_env}")
+        return llm_failure(f"missing {adapter.key_env}")
 
-def analyze_with_iflow(article: Dict[str, Any]) -> Dict[str, Any]:
-    if not config.IFLOW_API_KEY:
-        notify_auth_failure("iFlow", "missing IFLOW_API_KEY")
-        return {"categories": ["调用失败"], "score": 0.0, "summary": "missing IFLOW_API_KEY", "title_zh": "", "one_liner": "", "points": []}
-
-    prompt = build_prompt(article)
-    url = f"{config.IFLOW_BASE_URL}/chat/completions"
-    payload = {
-        "model": config.IFLOW_MODEL,
-        "messages": [{"role": "user", "content": prompt}],
-    }
+    raw_text, error, detail = run_llm_request(adapter, build_prompt(article), TASK_SUMMARY, json_mode=True)
+    if raw_text is None:
+        return request_failure(error, detail)
+    result = parse_analysis_output(adapter, raw_text)
+    if result is None:
+        log(f"[{adapter.service}] parse failed, raw={truncate_text(raw_text, 300)}")
+        return llm_failure()
+    return result
 
-    last_err: Optional[Exception] = None
-    last_status_type: Optional[str] = None
-    last_status_detail = ""
-    for attempt in range(config.IFLOW_RETRIES):
-        try:
-            resp = requests.post(url, headers=iflow_headers(), json=payload, timeout=config.IFLOW_TIMEOUT)
-            if resp.status_code in (401, 403):
-                notify_auth_failure("iFlow", response_snippet(resp))
-                return {"categories": ["调用失败"], "score": 0.0, "summary": "", "title_zh": "", "one_liner": "", "points": []}
-            if resp.status_code == 400:
-                return {"categories": ["调用失败"], "score": 0.0, "summary": "", "title_zh": "", "one_liner": "", "points": []}
-            if resp.status_code in (429, 500, 502, 503, 504):
-                last_status_type = "rate_limit" if resp.status_code == 429 else "server_error"
-                last_status_detail = response_snippet(resp)
-                time.sleep(1.2 * (attempt + 1))
-                continue
-            if resp.status_code != 200:
-                log(f"[NVIDIA] bad status: {response_snippet(resp)}")
-                return {"categories": ["调用失败"], "score": 0.0, "summary": "", "title_zh": "", "one_liner": "", "points": []}
 
-            data = resp.json()
-            choices = data.get("choices") or []
-            if not choices:
-                log(f"[NVIDIA] empty choices: {truncate_text(json.dumps(data, ensure_ascii=False), 300)}")
-                return {"categories": ["调用失败"], "score": 0.0, "summary": "", "title_zh": "", "one_liner": "", "points": []}
-            message = choices[0].get("message") or {}
-            raw_text = (message.get("content") or "").strip()
-            json_str = extract_json_object(raw_text)
-            if not json_str:
-                notify_parse_error("iFlow", "empty json")
-                return {"categories": ["调用失败"], "score": 0.0, "summary": "", "title_zh": "", "one_liner": "", "points": []}
-            try:
-                result = json.loads(json_str)
-            except json.JSONDecodeError as exc:
-                notify_parse_error("iFlow", str(exc))
-                return {"categories": ["调用失败"], "score": 0.0, "summary": "", "title_zh": "", "one_liner": "", "points": []}
-            return result
-        except Exception as exc:
-            last_err = exc
-            if "timeout" in str(exc).lower():
-                last_status_type = "timeout"
-            time.sleep(1.0 + attempt)
+def analyze_with_gemini(article: Dict[str, Any]) -> Dict[str, Any]:
+    return analyze_with_provider(PROVIDERS["gemini"], article)
 
-    if last_status_type == "rate_limit":
-        notify_rate_limit("iFlow", last_status_detail or "HTTP 429")
-    elif last_status_type == "server_error":
-        notify_server_error("iFlow", last_status_detail or "HTTP 5xx")
-    elif last_status_type == "timeout":
-        notify_timeout("iFlow", str(last_err) if last_err else "timeout")
-    return {"categories": ["调用异常"], "score": 0.0, "summary": str(last_err) if last_err else "", "title_zh": "", "one_liner": "", "points": []}
+
+def analyze_with_iflow(article: Dict[str, Any]) -> Dict[str, Any]:
+    return analyze_with_provider(PROVIDERS["iflow"], article)
 
 
 def analyze_with_openai(article: Dict[str, Any]) -> Dict[str, Any]:
-    if not config.OPENAI_API_KEY:
-        notify_auth_failure("OpenAI", "missing OPENAI_API_KEY")
-        return {"categories": ["调用失败"], "score": 0.0, "summary": "missing OPENAI_API_KEY", "title_zh": "", "one_liner": "", "points": []}
+    return analyze_with_provider(PROVIDERS["openai"], article)
 
-    prompt = build_prompt(article)
-    url = f"{config.OPENAI_BASE_URL}/responses"
-    payload = {"model": config.OPENAI_MODEL, "input": prompt}
 
-    last_err: Optional[Exception] = None
-    last_status_type: Optional[str] = None
-    last_status_detail = ""
-    for attempt in range(config.OPENAI_RETRIES):
-        try:
-            resp = requests.post(url, headers=openai_headers(config.OPENAI_API_KEY), json=payload, timeout=config.OPENAI_TIMEOUT)
-            if resp.status_code in (401, 403):
-                notify_auth_failure("OpenAI", response_snippet(resp))
-                return {"categories": ["调用失败"], "score": 0.0, "summary": "", "title_zh": "", "one_liner": "", "points": []}
-            if resp.status_code in (429, 500, 502, 503, 504):
-                last_status_type = "rate_limit" if resp.status_code == 429 else "server_error"
-                last_status_detail = response_snippet(resp)
-                time.sleep(1.2 * (attempt + 1))
-                continue
-            if resp.status_code != 200:
-                return {"categories": ["调用失败"], "score": 0.0, "summary": "", "title_zh": "", "one_liner": "", "points": []}
+def analyze_with_deepseek(article: Dict[str, Any]) -> Dict[str, Any]:
+    return analyze_with_provider(PROVIDERS["deepseek"], article)
 
-            data = resp.json()
-            raw_text = ""
-            if isinstance(data.get("output_text"), str):
-                raw_text = data.get("output_text", "")
-            if not raw_text:
-                outputs = data.get("output") or []
-                if isinstance(outputs, list):
-                    parts: List[str] = []
-                    for item in outputs:
-                        if not isinstance(item, dict):
-                            continue
-                        if isinstance(item.get("text"), str):
-                            parts.append(item["text"])
-                        content = item.get("content") or []
-                        if isinstance(content, list):
-                            for piece in content:
-                                if isinstance(piece, dict):
-                                    text = piece.get("text")
-                                    if isinstance(text, str):
-                                        parts.append(text)
-                    raw_text = "".join(parts)
-
-            result = parse_llm_json(raw_text, "OpenAI")
-            if result is None:
-                return {"categories": ["调用失败"], "score": 0.0, "summary": "", "title_zh": "", "one_liner": "", "points": []}
-            return result
-        except Exception as exc:
-            last_err = exc
-            if "timeout" in str(exc).lower():
-                last_status_type = "timeout"
-            time.sleep(1.0 + attempt)
 
-    if last_status_type == "rate_limit":
-        notify_rate_limit("OpenAI", last_status_detail or "HTTP 429")
-    elif last_status_type == "server_error":
-        notify_server_error("OpenAI", last_status_detail or "HTTP 5xx")
-    elif last_status_type == "timeout":
-        notify_timeout("OpenAI", str(last_err) if last_err else "timeout")
-    return {"categories": ["调用异常"], "score": 0.0, "summary": str(last_err) if last_err else "", "title_zh": "", "one_liner": "", "points": []}
+def analyze_with_zhipu(article: Dict[str, Any]) -> Dict[str, Any]:
+    return analyze_with_provider(PROVIDERS["zhipu"], article)
 
 
-def analyze_with_deepseek(article: Dict[str, Any]) -> Dict[str, Any]:
-    if not config.DEEPSEEK_API_KEY:
-        notify_auth_failure("DeepSeek", "missing DEEPSEEK_API_KEY")
-        return {"categories": ["调用失败"], "score": 0.0, "summary": "missing DEEPSEEK_API_KEY", "title_zh": "", "one_liner": "", "points": []}
-
-    prompt = build_prompt(article)
-    url = f"{config.DEEPSEEK_BASE_URL}/chat/completions"
-    payload = {
-        "model": config.DEEPSEEK_MODEL,
-        "messages": [{"role": "user", "content": prompt}],
-        "stream": False,
-    }
+def analyze_with_nvidia(article: Dict[str, Any]) -> Dict[str, Any]:
+    return analyze_with_provider(PROVIDERS["nvidia"], article)
 
-    last_err: Optional[Exception] = None
-    last_status_type: Optional[str] = None
-    last_status_detail = ""
-    for attempt in range(config.DEEPSEEK_RETRIES):
-        try:
-            resp = requests.post(url, headers=deepseek_headers(), json=payload, timeout=config.DEEPSEEK_TIMEOUT)
-            if resp.status_code in (401, 403):
-                notify_auth_failure("DeepSeek", response_snippet(resp))
-                return {"categories": ["调用失败"], "score": 0.0, "summary": "", "title_zh": "", "one_liner": "", "points": []}
-            if resp.status_code in (429, 500, 502, 503, 504):
-                last_status_type = "rate_limit" if resp.status_code == 429 else "server_error"
-                last_status_detail = response_snippet(resp)
-                time.sleep(1.2 * (attempt + 1))
-                continue
-            if resp.status_code != 200:
-                return {"categories": ["调用失败"], "score": 0.0, "summary": "", "title_zh": "", "one_liner": "", "points": []}
 
-            data = resp.json()
-            choices = data.get("choices") or []
-            if not choices:
-                return {"categories": ["调用失败"], "score": 0.0, "summary": "", "title_zh": "", "one_liner": "", "points": []}
-            message = choices[0].get("message") or {}
-            raw_text = (message.get("content") or "").strip()
-            result = parse_llm_json(raw_text, "DeepSeek")
-            if result is None:
-                return {"categories": ["调用失败"], "score": 0.0, "summary": "", "title_zh": "", "one_liner": "", "points": []}
-            return result
-        except Exception as exc:
-            last_err = exc
-            if "timeout" in str(exc).lower():
-                last_status_type = "timeout"
-            time.sleep(1.0 + attempt)
+CASCADE_STATS = {"triaged": 0, "rejected": 0, "passed": 0, "triage_failed": 0}
+CASCADE_LOCK = threading.Lock()
 
-    if last_status_type == "rate_limit":
-        notify_rate_limit("DeepSeek", last_status_detail or "HTTP 429")
-    elif last_status_type == "server_error":
-        notify_server_error("DeepSeek", last_status_detail or "HTTP 5xx")
-    elif last_status_type == "timeout":
-        notify_timeout("DeepSeek", str(last_err) if last_err else "timeout")
-    return {"categories": ["调用异常"], "score": 0.0, "summary": str(last_err) if last_err else "", "title_zh": "", "one_liner": "", "points": []}
 
+def build_triage_prompt(article: Dict[str, Any]) -> str:
+    content = truncate_text(article.get("content") or "", config.LLM_TRIAGE_MAX_CHARS)
+    return f"{TRIAGE_PROMPT}\ntitle：{article.get('title', '')}\ncontent：{content}\n"
 
-def analyze_with_zhipu(article: Dict[str, Any]) -> Dict[str, Any]:
-    if not config.ZHIPU_API_KEY:
-        notify_auth_failure("Zhipu", "missing ZHIPU_API_KEY")
-        return {"categories": ["调用失败"], "score": 0.0, "summary": "missing ZHIPU_API_KEY", "title_zh": "", "one_liner": "", "points": []}
-
-    prompt = build_prompt(article)
-    url = f"{config.ZHIPU_BASE_URL}/chat/completions"
-    payload = {
-        "model": config.ZHIPU_MODEL,
-        "messages": [{"role": "user", "content": prompt}],
+
+def triage_article(article: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    # 级联第一级；调用或解析失败返回 None，由完整分析兜底
+    adapter = resolve_provider(config.LLM_TRIAGE_PROVIDER or config.LLM_PROVIDER)
+    if not adapter.api_key():
+        return None
+    raw_text, _, _ = run_llm_request(
+        adapter,
+        build_triage_prompt(article),
+        TASK_SUMMARY,
+        service=f"Triage:{adapter.name}",
+        json_mode=True,
+        model=config.LLM_TRIAGE_MODEL,
+    )
+    data = repair_json(raw_text or "")
+    if not isinstance(data, dict):
+        return None
+    score = parse_float(data.get("score"))
+    if score is None:
+        return None
+    categories = data.get("categories")
+    return {
+        "categories": categories if isinstance(categories, list) else [],
+        "score": score,
+        "summary": "",
+        "title_zh": "",
+        "one_liner": "",
+        "points": [],
+        "stage": "triage",
     }
 
-    last_err: Optional[Exception] = None
-    last_status_type: Optional[str] = None
-    last_status_detail = ""
-    for attempt in range(config.ZHIPU_RETRIES):
-        try:
-            resp = requests.post(url, headers=zhipu_headers(), json=payload, timeout=config.ZHIPU_TIMEOUT)
-            if resp.status_code in (401, 403):
-                notify_auth_failure("Zhipu", response_snippet(resp))
-                return {"categories": ["调用失败"], "score": 0.0, "summary": "", "title_zh": "", "one_liner": "", "points": []}
-            if resp.status_code in (429, 500, 502, 503, 504):
-                last_status_type = "rate_limit" if resp.status_code == 429 else "server_error"
-                last_status_detail = response_snippet(resp)
-                time.sleep(1.2 * (attempt + 1))
-                continue
-            if resp.status_code != 200:
-                return {"categories": ["调用失败"], "score": 0.0, "summary": "", "title_zh": "", "one_liner": "", "points": []}
 
-            data = resp.json()
-            choices = data.get("choices") or []
-            if not choices:
-                return {"categories": ["调用失败"], "score": 0.0, "summary": "", "title_zh": "", "one_liner": "", "points": []}
-            message = choices[0].get("message") or {}
-            raw_text = (message.get("content") or "").strip()
-            result = parse_llm_json(raw_text, "Zhipu")
-            if result is None:
-                return {"categories": ["调用失败"], "score": 0.0, "summary": "", "title_zh": "", "one_liner": "", "points": []}
-            return result
-        except Exception as exc:
-            last_err = exc
-            if "timeout" in str(exc).lower():
-                last_status_type = "timeout"
-            time.sleep(1.0 + attempt)
+def cascade_reject(article: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    # 返回第一级结果表示低于阈值、无需完整分析；返回 None 表示进入第二级
+    triage = triage_article(article)
+    with CASCADE_LOCK:
+        CASCADE_STATS["triaged"] += 1
+        if triage is None:
+            CASCADE_STATS["triage_failed"] += 1
+        elif triage["score"] < config.LLM_TRIAGE_MIN_SCORE:
+            CASCADE_STATS["rejected"] += 1
+        else:
+            CASCADE_STATS["passed"] += 1
+    if triage is not None and triage["score"] < config.LLM_TRIAGE_MIN_SCORE:
+        return triage
+    return None
 
-    if last_status_type == "rate_limit":
-        notify_rate_limit("Zhipu", last_status_detail or "HTTP 429")
-    elif last_status_type == "server_error":
-        notify_server_error("Zhipu", last_status_detail or "HTTP 5xx")
-    elif last_status_type == "timeout":
-        notify_timeout("Zhipu", str(last_err) if last_err else "timeout")
-    return {"categories": ["调用异常"], "score": 0.0, "summary": str(last_err) if last_err else "", "title_zh": "", "one_liner": "", "points": []}
 
+def analyze_with_llm(article: Dict[str, Any]) -> Dict[str, Any]:
+    if config.ENABLE_LLM_CASCADE:
+        rejected = cascade_reject(article)
+        if rejected is not None:
+            return rejected
+    return analyze_with_provider(resolve_provider(config.LLM_PROVIDER), article)
 
-def analyze_with_nvidia(article: Dict[str, Any]) -> Dict[str, Any]:
-    if not config.NVIDIA_API_KEY:
-        notify_auth_failure("NVIDIA", "missing NVIDIA_API_KEY")
-        return {"categories": ["调用失败"], "score": 0.0, "summary": "missing NVIDIA_API_KEY", "title_zh": "", "one_liner": "", "points": []}
-
-    prompt = build_prompt(article)
-    url = "https://integrate.api.nvidia.com/v1/chat/completions"
-    payload: Dict[str, Any] = {
-        "model": "qwen/qwen3-next-80b-a3b-instruct",
-        "messages": [{"role": "user", "content": prompt}],
-        "temperature": 0.6,
-        "top_p": 0.7,
-        "max_tokens": 4096,
-        "stream": False,
-    }
 
-    last_err: Optional[Exception] = None
-    last_status_type: Optional[str] = None
-    last_status_detail = ""
-    for attempt in range(config.NVIDIA_RETRIES):
-        try:
-            resp = requests.post(url, headers=nvidia_headers(), json=payload, timeout=300)
-            if resp.status_code in (401, 403):
-                notify_auth_failure("NVIDIA", response_snippet(resp))
-                return {"categories": ["调用失败"], "score": 0.0, "summary": "", "title_zh": "", "one_liner": "", "points": []}
-            if resp.status_code in (429, 500, 502, 503, 504):
-                last_status_type = "rate_limit" if resp.status_code == 429 else "server_error"
-                last_status_detail = response_snippet(resp)
-                time.sleep(1.2 * (attempt + 1))
-                continue
-            if resp.status_code != 200:
-                return {"categories": ["调用失败"], "score": 0.0, "summary": "", "title_zh": "", "one_liner": "", "points": []}
+def llm_model_name(provider: str) -> str:
+    return resolve_provider(provider).model(TASK_SUMMARY)
 
-            data = resp.json()
-            choices = data.get("choices") or []
-            if not choices:
-                return {"categories": ["调用失败"], "score": 0.0, "summary": "", "title_zh": "", "one_liner": "", "points": []}
-            message = choices[0].get("message") or {}
-            raw_text = (message.get("content") or "").strip()
-            if raw_text:
-                # Drop <think> blocks to keep final JSON only (align with test.py behavior)
-                raw_text = re.sub(r"<think>.*?</think>", "", raw_text, flags=re.S)
-                if "<think>" in raw_text:
-                    raw_text = raw_text.split("<think>", 1)[0]
-                raw_text = raw_text.strip()
-            result = parse_llm_json(raw_text, "NVIDIA")
-            if result is None:
-                log(f"[NVIDIA] parse failed, raw={truncate_text(raw_text, 300)}")
-                return {"categories": ["调用失败"], "score": 0.0, "summary": "", "title_zh": "", "one_liner": "", "points": []}
-            return result
-        except Exception as exc:
-            last_err = exc
-            if "timeout" in str(exc).lower():
-                last_status_type = "timeout"
-            time.sleep(1.0 + attempt)
 
-    if last_status_type == "rate_limit":
-        notify_rate_limit("NVIDIA", last_status_detail or "HTTP 429")
-    elif last_status_type == "server_error":
-        notify_server_error("NVIDIA", last_status_detail or "HTTP 5xx")
-    elif last_status_type == "timeout":
-        notify_timeout("NVIDIA", str(last_err) if last_err else "timeout")
-    return {"categories": ["调用异常"], "score": 0.0, "summary": str(last_err) if last_err else "", "title_zh": "", "one_liner": "", "points": []}
+LLM_CACHE: Optional[AnalysisCache] = None
 
 
-def analyze_with_llm(article: Dict[str, Any]) -> Dict[str, Any]:
+def open_llm_cache() -> Optional[AnalysisCache]:
+    global LLM_CACHE
+    if not config.ENABLE_LLM_CACHE:
+        return None
+    try:
+        LLM_CACHE = AnalysisCache(
+            config.LLM_CACHE_PATH,
+            ttl_sec=config.LLM_CACHE_TTL_DAYS * 86400,
+            max_entries=config.LLM_CACHE_MAX_ENTRIES,
+        )
+        log(f"[LLMCache] path={config.LLM_CACHE_PATH} entries={len(LLM_CACHE)}")
+    except Exception as exc:
+        log(f"[LLMCache] disabled: {exc}")
+        LLM_CACHE = None
+    return LLM_CACHE
+
+
+def is_cacheable_analysis(analysis: Dict[str, Any]) -> bool:
+    categories = analysis.get("categories") or []
+    return not (isinstance(categories, list) and any(c in FAILED_CATEGORIES for c in categories))
+
+
+def article_cache_key(article: Dict[str, Any], batched: bool = False) -> str:
     provider = config.LLM_PROVIDER
-    if provider == "iflow":
-        return analyze_with_iflow(article)
-    if provider == "openai":
-        return analyze_with_openai(article)
-    if provider == "deepseek":
-        return analyze_with_deepseek(article)
-    if provider == "zhipu":
-        return analyze_with_zhipu(article)
-    if provider == "nvidia":
-        return analyze_with_nvidia(article)
-    if provider and provider != "gemini":
-        log(f"[LLM] unknown provider={provider}, fallback to gemini")
-    return analyze_with_gemini(article)
+    prompt = SYSTEM_PROMPT
+    if config.ENABLE_LLM_CASCADE:
+        # 级联的初筛模型和阈值也影响结果
+        triage = f"{config.LLM_TRIAGE_PROVIDER}:{config.LLM_TRIAGE_MODEL}:{config.LLM_TRIAGE_MIN_SCORE}"
+        prompt = f"{SYSTEM_PROMPT}\n{TRIAGE_PROMPT}\n{triage}"
+    if batched:
+        # 批量提示词得到的结果与单篇分析分开缓存
+        prompt = f"{prompt}\n{BATCH_PROMPT_PROTOCOL}"
+    return analysis_cache_key(
+        article.get("title") or "",
+        article.get("content") or "",
+        prompt,
+        provider,
+        llm_model_name(provider),
+    )
+
+
+def analyze_article(article: Dict[str, Any]) -> Dict[str, Any]:
+    if LLM_CACHE is None:
+        return analyze_with_llm(article)
+    return LLM_CACHE.get_or_compute(article_cache_key(article), lambda: analyze_with_llm(article), is_cacheable_analysis)
+
+
+LLM_BATCH_STATS = {"requests": 0, "articles": 0, "fallback": 0, "failed": 0, "prompt_tokens": 0}
+LLM_BATCH_LOCK = threading.Lock()
+
+
+def analyze_batch_with_provider(
+    adapter: ProviderAdapter, articles: List[Dict[str, Any]]
+) -> Tuple[Dict[int, Dict[str, Any]], Optional[Dict[str, Any]]]:
+    # 返回 (按下标的结果, 整批失败结果)；请求本身失败（重试耗尽、截止、鉴权）时整批按失败处理，
+    # 不再逐篇重发，避免在服务限流时把请求量放大 N 倍
+    if not adapter.api_key():
+        notify_auth_failure(adapter.service, f"missing {adapter.key_env}")
+        return {}, llm_failure(f"missing {adapter.key_env}")
+    prompt = build_batch_prompt(articles)
+    raw_text, error, detail = run_llm_request(adapter, prompt, TASK_SUMMARY)
+    results = parse_batch_results(raw_text or "", len(articles))
+    with LLM_BATCH_LOCK:
+        LLM_BATCH_STATS["requests"] += 1
+        LLM_BATCH_STATS["articles"] += len(results)
+        LLM_BATCH_STATS["prompt_tokens"] += estimate_tokens(prompt)
+        if raw_text is None:
+            LLM_BATCH_STATS["failed"] += 1
+    if raw_text is None:
+        return {}, request_failure(error, detail)
+    return results, None
+
+
+def analyze_articles(articles: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    if len(articles) <= 1:
+        return [analyze_article(article) for article in articles]
+
+    results: List[Optional[Dict[str, Any]]] = [None] * len(articles)
+    keys: List[str] = []
+    batch_keys: List[str] = []
+    pending: List[int] = []
+    waiters: Dict[int, Any] = {}
+    for idx, article in enumerate(articles):
+        key = article_cache_key(article) if LLM_CACHE is not None else ""
+        batch_key = article_cache_key(article, batched=True) if LLM_CACHE is not None else ""
+        keys.append(key)
+        batch_keys.append(batch_key)
+        if LLM_CACHE is None:
+            pending.append(idx)
+            continue
+        # 同一篇文章正在其他批次分析时只等它的结果，不重复请求
+        cached, waiter = LLM_CACHE.reserve(key, batch_key)
+        if cached is not None:
+            results[idx] = cached
+        elif waiter is not None:
+            waiters[idx] = waiter
+        else:
+            pending.append(idx)
+
+    owned = list(pending)
+    store_keys: Dict[int, str] = {}
+    try:
+        # 级联模式下先逐篇初筛，只有通过的文章进入批量完整分析
+        triaged = config.ENABLE_LLM_CASCADE and len(pending) > 1
+        if triaged:
+            survivors: List[int] = []
+            for idx in pending:
+                rejected = cascade_reject(articles[idx])
+                if rejected is None:
+                    survivors.append(idx)
+                    continue
+                results[idx] = rejected
+                store_keys[idx] = keys[idx]
+            pending = survivors
+
+        if len(pending) > 1:
+            batch, failure = analyze_batch_with_provider(
+                resolve_provider(config.LLM_PROVIDER), [articles[i] for i in pending]
+            )
+            for pos, idx in enumerate(pending):
+                if failure is not None:
+                    results[idx] = dict(failure)
+                    continue
+                analysis = batch.get(pos)
+                if analysis is None:
+                    continue
+                results[idx] = analysis
+                if is_cacheable_analysis(analysis):
+                    store_keys[idx] = batch_keys[idx]
+
+        for idx in owned:
+            if results[idx] is not None:
+                continue
+            # 批量结果缺失 / 不合法的条目单篇重试
+            if len(pending) > 1:
+                with LLM_BATCH_LOCK:
+                    LLM_BATCH_STATS["fallback"] += 1
+            if triaged:
+                # 已经通过初筛，直接做完整分析
+                analysis = analyze_with_provider(resolve_provider(config.LLM_PROVIDER), articles[idx])
+            else:
+                analysis = analyze_with_llm(articles[idx])
+            results[idx] = analysis
+            if is_cacheable_analysis(analysis):
+                store_keys[idx] = keys[idx]
+    except BaseException as exc:
+        if LLM_CACHE is not None:
+            for idx in owned:
+                LLM_CACHE.complete(keys[idx], None, error=exc)
+        raise
+
+    if LLM_CACHE is not None:
+        for idx in owned:
+            LLM_CACHE.complete(keys[idx], results[idx], store_key=store_keys.get(idx, ""))
+        # 先发布自己认领的结果再等待别人的，避免两个批次互相等待
+        for idx, waiter in waiters.items():
+            try:
+                results[idx] = LLM_CACHE.wait_for(waiter)
+            except Exception as exc:
+                log(f"[LLM] 等待同篇分析结果失败: {exc}")
+                results[idx] = llm_failure()
+    return [analysis if analysis is not None else llm_failure() for analysis in results]
+
+
+def plan_llm_batches(queue: List[Dict[str, Any]]) -> List[List[Dict[str, Any]]]:
+    if not config.ENABLE_LLM_BATCH or config.LLM_BATCH_MAX_ITEMS <= 1:
+        return [[item] for item in queue]
+    budget = max(0, config.LLM_BATCH_MAX_TOKENS - estimate_tokens(SYSTEM_PROMPT))
+    batches: List[List[Dict[str, Any]]] = []
+    current: List[Dict[str, Any]] = []
+    used = 0
+    for item in queue:
+        tokens = article_prompt_tokens(item["article"])
+        if current and (len(current) >= config.LLM_BATCH_MAX_ITEMS or used + tokens > budget):
+            batches.append(current)
+            current, used = [], 0
+        current.append(item)
+        used += tokens
+    if current:
+        batches.append(current)
+    return batches
 
 
 def normalize_points(points: Any) -> List[str]:
@@ -1191,19 +1208,11 @@ def parse_featured_ids(raw_text: str, service: str = "Featured") -> List[str]:
     return [str(x) for x in ids if x]
 
 
-def apply_featured(record_ids: List[str], tenant_token: str) -> None:
+def apply_featured(record_ids: List[str], tenant_token: TenantToken) -> None:
     if not record_ids:
         return
-    for record_id in record_ids:
-        update_bitable_record_fields(
-            config.FEISHU_APP_TOKEN,
-            config.FEISHU_NEWS_TABLE_ID,
-            tenant_token,
-            record_id,
-            {config.NEWS_FIELD_FEATURED: True},
-            config.HTTP_TIMEOUT,
-            config.HTTP_RETRIES,
-        )
+    updates = [{"record_id": record_id, "fields": {config.NEWS_FIELD_FEATURED: True}} for record_id in record_ids]
+    flush_record_updates(config.FEISHU_NEWS_TABLE_ID, tenant_token, updates, "featured")
 
 
 def build_embedding_text(article: Dict[str, Any], analysis: Dict[str, Any]) -> str:
@@ -1216,31 +1225,107 @@ def build_embedding_text(article: Dict[str, Any], analysis: Dict[str, Any]) -> s
     return title
 
 
+def cf_embedding_url() -> str:
+    return f"https://api.cloudflare.com/client/v4/accounts/{config.CF_ACCOUNT_ID}/ai/run/{config.CF_EMBEDDING_MODEL}"
+
+
+def parse_embedding_rows(data: Dict[str, Any]) -> List[Optional[List[float]]]:
+    result = data.get("result") or {}
+    items = result.get("data") or result.get("result") or []
+    rows: List[Optional[List[float]]] = []
+    if not isinstance(items, list):
+        return rows
+    for row in items:
+        if isinstance(row, dict):
+            row = row.get("embedding")
+        rows.append([float(x) for x in row] if isinstance(row, list) and row else None)
+    return rows
+
+
 def cf_embed_text(text: str) -> Optional[List[float]]:
     if not text.strip():
         log("   [Vectorize] empty text, skip embedding")
         return None
-    url = f"https://api.cloudflare.com/client/v4/accounts/{config.CF_ACCOUNT_ID}/ai/run/{config.CF_EMBEDDING_MODEL}"
     payload = {"text": [text]}
     try:
-        data = cf_post(url, payload, timeout=30, retries=3)
+        data = cf_post(cf_embedding_url(), payload, timeout=30, retries=3)
     except Exception as exc:
         log(f"   [Vectorize] embedding error: {exc}")
         return None
-    result = data.get("result") or {}
-    items = result.get("data") or result.get("result") or []
-    if isinstance(items, list) and items:
-        first = items[0]
-        if isinstance(first, dict):
-            emb = first.get("embedding")
-            if isinstance(emb, list) and emb:
-                return [float(x) for x in emb]
-        if isinstance(first, list) and first:
-            return [float(x) for x in first]
+    rows = parse_embedding_rows(data)
+    if rows and rows[0]:
+        return rows[0]
     log(f"   [Vectorize] embedding response missing data: {data}")
     return None
 
 
+def plan_embedding_chunks(texts: List[str]) -> List[List[int]]:
+    # 按条数与总字符数切分，返回每批的下标
+    chunks: List[List[int]] = []
+    current: List[int] = []
+    chars = 0
+    for idx, text in enumerate(texts):
+        if current and (len(current) >= config.CF_EMBED_BATCH_SIZE or chars + len(text) > config.CF_EMBED_BATCH_MAX_CHARS):
+            chunks.append(current)
+            current, chars = [], 0
+        current.append(idx)
+        chars += len(text)
+    if current:
+        chunks.append(current)
+    return chunks
+
+
+def cf_embed_chunk(texts: List[str]) -> List[Optional[List[float]]]:
+    if len(texts) > 1:
+        try:
+            rows = parse_embedding_rows(cf_post(cf_embedding_url(), {"text": texts}, timeout=60, retries=3))
+            if len(rows) == len(texts) and all(rows):
+                return rows
+            log(f"   [Vectorize] batch embedding returned {len(rows)}/{len(texts)} rows, fallback per item")
+        except Exception as exc:
+            log(f"   [Vectorize] batch embedding error: {exc}, fallback per item")
+    return [cf_embed_text(text) for text in texts]
+
+
+def cf_embed_texts(texts: List[str], concurrency: int = 1) -> List[Optional[List[float]]]:
+    # 按顺序返回向量；空文本与失败的条目为 None
+    vectors: List[Optional[List[float]]] = [None] * len(texts)
+    indexed = [idx for idx, text in enumerate(texts) if text.strip()]
+    chunks = [[indexed[i] for i in chunk] for chunk in plan_embedding_chunks([texts[idx] for idx in indexed])]
+    if not chunks:
+        return vectors
+    with ThreadPoolExecutor(max_workers=max(1, min(concurrency, len(chunks)))) as executor:
+        results = executor.map(lambda chunk: cf_embed_chunk([texts[idx] for idx in chunk]), chunks)
+        for chunk, rows in zip(chunks, results):
+            for idx, row in zip(chunk, rows):
+                vectors[idx] = row
+    return vectors
+
+
+EMBED_BATCHER: Optional[EmbeddingBatcher] = None
+EMBED_BATCHER_LOCK = threading.Lock()
+
+
+def get_embedding_batcher() -> EmbeddingBatcher:
+    global EMBED_BATCHER
+    with EMBED_BATCHER_LOCK:
+        if EMBED_BATCHER is None:
+            EMBED_BATCHER = EmbeddingBatcher(
+                cf_embed_texts,
+                batch_size=config.CF_EMBED_BATCH_SIZE,
+                max_wait_sec=config.CF_EMBED_BATCH_WAIT_MS / 1000,
+                log=log,
+            )
+        return EMBED_BATCHER
+
+
+def embed_text_batched(text: str) -> Optional[List[float]]:
+    # worker 线程内生成单条向量：开启批量时与其他 worker 的请求合并发送
+    if not config.ENABLE_EMBED_BATCH or not text.strip():
+        return cf_embed_text(text)
+    return get_embedding_batcher().embed(text)
+
+
 def parse_failed_items(raw: Any) -> List[Dict[str, Any]]:
     if not raw:
         return []
@@ -1291,10 +1376,13 @@ def upsert_failed_item(
     link: str,
     reason: str,
     now_ms: int,
+    count_failure: bool = True,
 ) -> List[Dict[str, Any]]:
+    # count_failure=False 用于截止顺延等非失败原因，不累加 fail_count
+    increment = 1 if count_failure else 0
     for item in items:
         if item.get("item_key") == item_key:
-            item["fail_count"] = int(item.get("fail_count") or 0) + 1
+            item["fail_count"] = int(item.get("fail_count") or 0) + increment
             item["last_error"] = reason or item.get("last_error") or ""
             item["last_seen_ms"] = now_ms
             item["miss_count"] = 0
@@ -1312,7 +1400,7 @@ def upsert_failed_item(
             "title": title or "",
             "link": link or "",
             "published_ms": entry_ts_ms or 0,
-            "fail_count": 1,
+            "fail_count": increment,
             "last_error": reason or "",
             "last_seen_ms": now_ms,
             "miss_count": 0,
@@ -1340,46 +1428,325 @@ def prune_failed_items(items: List[Dict[str, Any]], now_ms: int) -> List[Dict[st
         seen_ms = int(item.get("last_seen_ms") or item.get("published_ms") or 0)
         if seen_ms and now_ms - seen_ms > max_age_ms:
             continue
-        pruned.append(item)
+        pruned.append(item)
+
+    pruned.sort(key=lambda x: int(x.get("last_seen_ms") or 0), reverse=True)
+    # 截止顺延 / 削峰的条目（fail_count=0）不受条数上限限制：抓取游标已越过它们，
+    # 截掉就再也不会被处理；它们仍按 miss_count 与最长保留天数淘汰
+    kept: List[Dict[str, Any]] = []
+    failed = 0
+    for item in pruned:
+        if int(item.get("fail_count") or 0):
+            if failed >= config.FAILED_ITEMS_MAX:
+                continue
+            failed += 1
+        kept.append(item)
+    return kept
+
+
+# 分析前原始向量（标题 + 导语）的命名空间，与分析后向量分开比较
+RAW_NAMESPACE = "raw"
+
+
+def vectorize_query(embedding: List[float], namespace: str = "") -> Optional[float]:
+    url = f"https://api.cloudflare.com/client/v4/accounts/{config.CF_ACCOUNT_ID}/vectorize/v2/indexes/{config.CF_VECTORIZE_INDEX}/query"
+    payload: Dict[str, Any] = {"vector": embedding, "topK": config.CF_VECTORIZE_TOP_K}
+    if namespace:
+        payload["namespace"] = namespace
+    elif config.ENABLE_PRE_LLM_DEDUP:
+        # 不带命名空间的查询也会命中 raw 向量，取回 metadata 过滤掉
+        payload["returnMetadata"] = "all"
+    try:
+        data = cf_post(url, payload, timeout=20, retries=3)
+    except Exception as exc:
+        log(f"   [Vectorize] query error: {exc}")
+        return None
+    result = data.get("result") or {}
+    matches = result.get("matches") or []
+    if not namespace:
+        matches = [m for m in matches if not (m.get("metadata") or {}).get("kind")]
+    if not matches:
+        return 0.0
+    best = matches[0]
+    score = best.get("score")
+    if isinstance(score, (int, float)):
+        return float(score)
+    distance = best.get("distance")
+    if isinstance(distance, (int, float)) and config.CF_VECTORIZE_METRIC == "cosine":
+        return 1.0 - float(distance)
+    return None
+
+
+def build_vectorize_vector(item_key: str, embedding: List[float], metadata: Dict[str, Any], namespace: str = "") -> Dict[str, Any]:
+    vec_key = f"{namespace}:{item_key}" if namespace else item_key
+    vec_id = hashlib.sha256(vec_key.encode("utf-8", errors="ignore")).hexdigest()
+    metadata = dict(metadata)
+    metadata["item_key"] = item_key
+    vector: Dict[str, Any] = {"id": vec_id, "values": embedding, "metadata": metadata}
+    if namespace:
+        metadata["kind"] = namespace
+        vector["namespace"] = namespace
+    return vector
+
+
+def vectorize_upsert_many(vectors: List[Dict[str, Any]]) -> bool:
+    # 返回 False 表示请求被拒（4xx，多半是某条向量有问题，可拆分定位）；
+    # 网络异常、429、5xx 和鉴权失败直接抛出，由调用方按整批失败处理
+    url = f"https://api.cloudflare.com/client/v4/accounts/{config.CF_ACCOUNT_ID}/vectorize/v2/indexes/{config.CF_VECTORIZE_INDEX}/upsert"
+    try:
+        cf_post(url, {"vectors": vectors}, timeout=30, retries=3)
+        return True
+    except CloudflareRequestError as exc:
+        if exc.status_code in (401, 403):
+            raise
+        log(f"   [Vectorize] upsert rejected ({len(vectors)} vectors): {exc}")
+        return False
+
+
+VECTORIZE_WRITER: Optional[VectorUpsertWriter] = None
+
+
+def vectorize_upsert(item_key: str, embedding: List[float], metadata: Dict[str, Any], namespace: str = "") -> bool:
+    # 开启后台写入时只入队，由 VectorUpsertWriter 批量提交
+    vector = build_vectorize_vector(item_key, embedding, metadata, namespace)
+    if VECTORIZE_WRITER is not None:
+        VECTORIZE_WRITER.add(vector)
+        return True
+    try:
+        return vectorize_upsert_many([vector])
+    except Exception as exc:
+        log(f"   [Vectorize] upsert error: {exc}")
+        return False
+
+
+def open_vectorize_writer() -> Optional[VectorUpsertWriter]:
+    global VECTORIZE_WRITER
+    if not config.ENABLE_VECTORIZE_DEDUP or not config.CF_VECTORIZE_INDEX:
+        return None
+    if VECTOR_INDEX is not None and not config.VECTOR_INDEX_SYNC_VECTORIZE:
+        return None
+    VECTORIZE_WRITER = VectorUpsertWriter(
+        vectorize_upsert_many,
+        batch_size=config.VECTORIZE_UPSERT_BATCH_SIZE,
+        max_age_sec=config.VECTORIZE_UPSERT_MAX_AGE_SEC,
+        spill_path=config.VECTORIZE_UPSERT_SPILL_PATH,
+        log=log,
+    )
+    return VECTORIZE_WRITER
+
+
+def close_vectorize_writer() -> None:
+    global VECTORIZE_WRITER
+    if VECTORIZE_WRITER is None:
+        return
+    VECTORIZE_WRITER.close()
+    stats = VECTORIZE_WRITER.stats
+    log(
+        f"[Vectorize] upsert batches={stats['batches']} ok={stats['vectors_ok']} failed={stats['vectors_failed']} "
+        f"splits={stats['splits']} dropped={stats['vectors_dropped']} restored={stats['restored']}"
+    )
+    VECTORIZE_WRITER = None
+
+
+VECTOR_INDEX: Optional[LocalVectorIndex] = None
+RAW_VECTOR_INDEX: Optional[LocalVectorIndex] = None
+
+
+def open_local_vector_index(path: str) -> Optional[LocalVectorIndex]:
+    try:
+        index = LocalVectorIndex(path, window_days=config.VECTOR_INDEX_WINDOW_DAYS, int8=config.VECTOR_INDEX_INT8)
+    except Exception as exc:
+        log(f"[VectorIndex] disabled path={path}: {exc}")
+        return None
+    log(f"[VectorIndex] path={path} size={len(index)} int8={config.VECTOR_INDEX_INT8}")
+    return index
+
+
+def open_vector_index() -> Optional[LocalVectorIndex]:
+    global VECTOR_INDEX, RAW_VECTOR_INDEX
+    if not config.ENABLE_VECTORIZE_DEDUP or config.VECTOR_DEDUP_BACKEND != "local":
+        return None
+    if not vector_index_available():
+        log("[VectorIndex] numpy not installed, fallback to Vectorize")
+        return None
+    VECTOR_INDEX = open_local_vector_index(config.VECTOR_INDEX_PATH)
+    if VECTOR_INDEX is not None and config.ENABLE_PRE_LLM_DEDUP:
+        RAW_VECTOR_INDEX = open_local_vector_index(config.PRE_LLM_VECTOR_INDEX_PATH)
+    return VECTOR_INDEX
+
+
+def close_vector_index() -> None:
+    global VECTOR_INDEX, RAW_VECTOR_INDEX
+    for index in (VECTOR_INDEX, RAW_VECTOR_INDEX):
+        if index is None:
+            continue
+        try:
+            index.save()
+        except OSError as exc:
+            log(f"[VectorIndex] save failed path={index.dir}: {exc}")
+        summary = index.summary()
+        log(
+            f"[VectorIndex] path={index.dir} size={summary['size']} added={summary['added']} expired={summary['expired']} "
+            f"queries={summary['queries']} avg_query_us={summary['avg_query_us']:.0f}"
+        )
+    VECTOR_INDEX = None
+    RAW_VECTOR_INDEX = None
 
-    pruned.sort(key=lambda x: int(x.get("last_seen_ms") or 0), reverse=True)
-    return pruned[: config.FAILED_ITEMS_MAX]
 
+def local_vector_index(namespace: str) -> Optional[LocalVectorIndex]:
+    if VECTOR_INDEX is None:
+        return None
+    return RAW_VECTOR_INDEX if namespace == RAW_NAMESPACE else VECTOR_INDEX
 
-def vectorize_query(embedding: List[float]) -> Optional[float]:
-    url = f"https://api.cloudflare.com/client/v4/accounts/{config.CF_ACCOUNT_ID}/vectorize/v2/indexes/{config.CF_VECTORIZE_INDEX}/query"
-    payload = {"vector": embedding, "topK": config.CF_VECTORIZE_TOP_K}
-    try:
-        data = cf_post(url, payload, timeout=20, retries=3)
-    except Exception as exc:
-        log(f"   [Vectorize] query error: {exc}")
+
+def semantic_dedup_query(embedding: List[float], namespace: str = "") -> Optional[float]:
+    index = local_vector_index(namespace)
+    if index is not None:
+        return index.query(embedding)
+    if VECTOR_INDEX is not None:
         return None
-    result = data.get("result") or {}
-    matches = result.get("matches") or []
-    if not matches:
-        return 0.0
-    best = matches[0]
-    score = best.get("score")
-    if isinstance(score, (int, float)):
-        return float(score)
-    distance = best.get("distance")
-    if isinstance(distance, (int, float)) and config.CF_VECTORIZE_METRIC == "cosine":
-        return 1.0 - float(distance)
-    return None
+    return vectorize_query(embedding, namespace)
+
+
+def semantic_dedup_add(item_key: str, embedding: List[float], metadata: Dict[str, Any], namespace: str = "") -> bool:
+    if VECTOR_INDEX is None:
+        return vectorize_upsert(item_key, embedding, metadata, namespace)
+    index = local_vector_index(namespace)
+    added = index.add(item_key, embedding) if index is not None else False
+    # 同步到 Vectorize 只为备份，经后台写入线程提交，不占用分析线程
+    if VECTORIZE_WRITER is not None:
+        vectorize_upsert(item_key, embedding, metadata, namespace)
+    return added
+
+
+def feishu_value_equal(current: Any, desired: Any) -> bool:
+    if isinstance(desired, bool):
+        return is_checked(current) == desired
+    if isinstance(desired, (int, float)):
+        cur = parse_float(clean_feishu_value(current))
+        return cur is not None and cur == float(desired)
+    return clean_feishu_value(current).strip() == str(desired).strip()
+
+
+def queue_record_update(
+    updates: List[Dict[str, Any]],
+    record_id: str,
+    current: Optional[Dict[str, Any]],
+    desired: Dict[str, Any],
+) -> bool:
+    current = current or {}
+    fields = {name: value for name, value in desired.items() if not feishu_value_equal(current.get(name), value)}
+    if not fields:
+        return False
+    updates.append({"record_id": record_id, "fields": fields})
+    return True
 
 
-def vectorize_upsert(item_key: str, embedding: List[float], metadata: Dict[str, Any]) -> bool:
-    vec_id = hashlib.sha256(item_key.encode("utf-8", errors="ignore")).hexdigest()
-    metadata = dict(metadata)
-    metadata["item_key"] = item_key
-    url = f"https://api.cloudflare.com/client/v4/accounts/{config.CF_ACCOUNT_ID}/vectorize/v2/indexes/{config.CF_VECTORIZE_INDEX}/upsert"
-    payload = {"vectors": [{"id": vec_id, "values": embedding, "metadata": metadata}]}
+def flush_record_updates(table_id: str, tenant_token: TenantToken, updates: List[Dict[str, Any]], label: str) -> None:
+    if not updates:
+        return
+    ok, failed = batch_update_bitable_records(
+        config.FEISHU_APP_TOKEN,
+        table_id,
+        tenant_token,
+        updates,
+        config.HTTP_TIMEOUT,
+        config.HTTP_RETRIES,
+    )
+    log(f"[Feishu] {label} batch update ok={ok} failed={len(failed)}")
+
+
+# 可选字段：字段名 -> 飞书字段类型（1=文本, 2=数字）
+RSS_OPTIONAL_FIELD_TYPES: Dict[str, int] = {
+    config.RSS_FIELD_ETAG: 1,
+    config.RSS_FIELD_LAST_MODIFIED: 1,
+    config.RSS_FIELD_FEED_BYTES: 2,
+    config.RSS_FIELD_FEED_PARSE_MS: 2,
+}
+RSS_OPTIONAL_FIELDS: set = set()
+
+# 读取订阅源表时只取流程用到的列；failed_items 是队列构建的输入，仍需读取
+RSS_READ_FIELDS = [
+    config.RSS_FIELD_NAME,
+    config.RSS_FIELD_FEED_URL,
+    config.RSS_FIELD_ENABLED,
+    config.RSS_FIELD_STATUS,
+    config.RSS_FIELD_LAST_FETCH_TIME,
+    config.RSS_FIELD_LAST_FETCH_STATUS,
+    config.RSS_FIELD_CONSECUTIVE_FAIL_COUNT,
+    config.RSS_FIELD_LAST_ITEM_GUID,
+    config.RSS_FIELD_LAST_ITEM_PUB_TIME,
+    config.RSS_FIELD_ITEM_ID_STRATEGY,
+    config.RSS_FIELD_FAILED_ITEMS,
+    config.RSS_FIELD_WEIGHT,
+]
+
+
+def list_rss_field_names(tenant_token: TenantToken) -> Optional[set]:
     try:
-        cf_post(url, payload, timeout=20, retries=3)
-        return True
+        existing = list_bitable_fields(
+            config.FEISHU_APP_TOKEN,
+            config.FEISHU_RSS_TABLE_ID,
+            tenant_token,
+            config.HTTP_TIMEOUT,
+            config.HTTP_RETRIES,
+        )
     except Exception as exc:
-        log(f"   [Vectorize] upsert error: {exc}")
-        return False
+        log(f"[RSS] list fields failed: {exc}")
+        return None
+    return {item.get("field_name") for item in existing if item.get("field_name")}
+
+
+def rss_read_field_names(table_fields: Optional[set]) -> Optional[List[str]]:
+    # 表结构未知时不做投影；投影里出现表中不存在的列会被飞书拒绝
+    if table_fields is None:
+        return None
+    wanted = RSS_READ_FIELDS + sorted(RSS_OPTIONAL_FIELDS)
+    return [name for name in wanted if name in table_fields or name in RSS_OPTIONAL_FIELDS]
+
+
+def ensure_rss_optional_fields(tenant_token: TenantToken, table_fields: Optional[set] = None) -> set:
+    global RSS_OPTIONAL_FIELDS
+    names = table_fields if table_fields is not None else list_rss_field_names(tenant_token)
+    if names is None:
+        log("[RSS] optional fields disabled")
+        RSS_OPTIONAL_FIELDS = set()
+        return RSS_OPTIONAL_FIELDS
+
+    available = set()
+    for name, field_type in RSS_OPTIONAL_FIELD_TYPES.items():
+        if name in names:
+            available.add(name)
+            continue
+        ok, data = create_bitable_field(
+            config.FEISHU_APP_TOKEN,
+            config.FEISHU_RSS_TABLE_ID,
+            tenant_token,
+            name,
+            field_type,
+            config.HTTP_TIMEOUT,
+            config.HTTP_RETRIES,
+        )
+        if ok:
+            log(f"[RSS] created field {name}")
+            available.add(name)
+        else:
+            log(f"[RSS] create field {name} failed: {data}")
+    RSS_OPTIONAL_FIELDS = available
+    return RSS_OPTIONAL_FIELDS
+
+
+def set_optional_fields(update_fields: Dict[str, Any], values: Dict[str, Any]) -> None:
+    for name, value in values.items():
+        if name in RSS_OPTIONAL_FIELDS:
+            update_fields[name] = value
+
+
+def parse_source_weight(value: Any) -> float:
+    weight = parse_float(clean_feishu_value(value))
+    if weight is None or weight < 0:
+        return 1.0
+    return weight
 
 
 def normalize_source(record: Dict[str, Any]) -> Dict[str, Any]:
@@ -1410,19 +1777,25 @@ def normalize_source(record: Dict[str, Any]) -> Dict[str, Any]:
         "content_hash_algo": config.DEFAULT_CONTENT_HASH_ALGO,
         "consecutive_fail_count": consecutive_fail,
         "failed_items": fields.get(config.RSS_FIELD_FAILED_ITEMS),
+        "etag": clean_feishu_value(fields.get(config.RSS_FIELD_ETAG)).strip(),
+        "last_modified": clean_feishu_value(fields.get(config.RSS_FIELD_LAST_MODIFIED)).strip(),
+        "feed_bytes": parse_int(fields.get(config.RSS_FIELD_FEED_BYTES)) or 0,
+        "feed_parse_ms": parse_int(fields.get(config.RSS_FIELD_FEED_PARSE_MS)) or 0,
+        "weight": parse_source_weight(fields.get(config.RSS_FIELD_WEIGHT)),
+        "fields": fields,
     }
 
 
-def should_fetch(source: Dict[str, Any], now_ms: int) -> bool:
-    if not source.get("enabled"):
-        return False
-    interval_min = config.DEFAULT_FETCH_INTERVAL_MIN
-    last_item_pub = source.get("last_item_pub_time") or 0
-    last_fetch = source.get("last_fetch_time") or 0
-    last_base = last_item_pub or last_fetch
-    if last_base <= 0:
-        return True
-    return now_ms - last_base >= interval_min * 60 * 1000
+def should_fetch(source: Dict[str, Any], now_ms: int) -> bool:
+    if not source.get("enabled"):
+        return False
+    interval_min = config.DEFAULT_FETCH_INTERVAL_MIN
+    last_item_pub = source.get("last_item_pub_time") or 0
+    last_fetch = source.get("last_fetch_time") or 0
+    last_base = last_item_pub or last_fetch
+    if last_base <= 0:
+        return True
+    return now_ms - last_base >= interval_min * 60 * 1000
 
 
 def build_news_fields(article: Dict[str, Any], analysis: Dict[str, Any], item_key: str) -> Dict[str, Any]:
@@ -1460,7 +1833,7 @@ def build_news_fields(article: Dict[str, Any], analysis: Dict[str, Any], item_ke
     }
 
 
-def prefetch_recent_item_keys(tenant_token: str) -> set:
+def prefetch_recent_item_keys(tenant_token: TenantToken) -> set:
     sort_field = config.NEWS_FIELD_CREATED_TIME or config.NEWS_FIELD_PUBLISHED_MS
     sort = [{"field_name": sort_field, "order": "desc"}]
     records = list_bitable_records(
@@ -1472,6 +1845,8 @@ def prefetch_recent_item_keys(tenant_token: str) -> set:
         page_size=config.NEWS_ITEM_KEY_PREFETCH_LIMIT,
         max_pages=1,
         sort=sort,
+        field_names=[config.NEWS_FIELD_ITEM_KEY],
+        automatic_fields=False,
     )
     keys = set()
     for record in records:
@@ -1483,10 +1858,178 @@ def prefetch_recent_item_keys(tenant_token: str) -> set:
     return keys
 
 
+def load_existing_keys(tenant_token: TenantToken) -> Any:
+    if config.DEDUP_MODE == "search":
+        log("[Dedup] search mode, check candidates after queue build")
+        return set()
+    if config.DEDUP_MODE == "index":
+        index = None
+        try:
+            index = ItemKeyIndex(config.DEDUP_INDEX_PATH)
+            cold = index.high_watermark() <= 0
+            added = index.sync(tenant_token, full=cold)
+            log(f"[Dedup] index synced {'full' if cold else 'incremental'} added={added} total={len(index)}")
+            return index
+        except Exception as exc:
+            if index is not None and len(index) > 0:
+                log(f"[Dedup] index sync failed, using local keys={len(index)}: {exc}")
+                return index
+            log(f"[Dedup] index sync failed, fallback to prefetch: {exc}")
+    try:
+        existing_keys = prefetch_recent_item_keys(tenant_token)
+        log(f"[Dedup] prefetched keys: {len(existing_keys)}")
+    except Exception as exc:
+        log(f"[Dedup] prefetch failed: {exc}")
+        existing_keys = set()
+    return existing_keys
+
+
+def record_created_key(existing_keys: Any, item_key: str) -> None:
+    # 本地索引只落盘写入飞书成功的 key；其余条目由 add 记在本轮内存里
+    if isinstance(existing_keys, ItemKeyIndex):
+        existing_keys.record(item_key)
+
+
+def close_existing_keys(existing_keys: Any) -> None:
+    if isinstance(existing_keys, ItemKeyIndex):
+        existing_keys.close()
+
+
+def search_existing_item_keys(keys: List[str], tenant_token: TenantToken) -> set:
+    unique = sorted({k for k in keys if k})
+    if not unique:
+        return set()
+    size = max(1, config.DEDUP_SEARCH_CHUNK)
+    chunks = [unique[i : i + size] for i in range(0, len(unique), size)]
+
+    def search_chunk(chunk: List[str]) -> set:
+        filter_obj = {
+            "conjunction": "or",
+            "conditions": [
+                {"field_name": config.NEWS_FIELD_ITEM_KEY, "operator": "is", "value": [key]}
+                for key in chunk
+            ],
+        }
+        records = list_bitable_records(
+            config.FEISHU_APP_TOKEN,
+            config.FEISHU_NEWS_TABLE_ID,
+            tenant_token,
+            config.HTTP_TIMEOUT,
+            config.HTTP_RETRIES,
+            page_size=500,
+            max_pages=10,
+            filter_obj=filter_obj,
+            field_names=[config.NEWS_FIELD_ITEM_KEY],
+            automatic_fields=False,
+        )
+        found = set()
+        for record in records:
+            key = clean_feishu_value((record.get("fields") or {}).get(config.NEWS_FIELD_ITEM_KEY)).strip()
+            if key:
+                found.add(key)
+        return found
+
+    found: set = set()
+    workers = max(1, min(config.DEDUP_SEARCH_CONCURRENCY, len(chunks)))
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        for part in executor.map(search_chunk, chunks):
+            found |= part
+    return found
+
+
+def filter_queue_by_search(
+    queue: List[Dict[str, Any]],
+    existing_keys: Any,
+    tenant_token: TenantToken,
+    stats: Dict[str, int],
+) -> List[Dict[str, Any]]:
+    try:
+        found = search_existing_item_keys([item["item_key"] for item in queue], tenant_token)
+    except Exception as exc:
+        log(f"[Dedup] search failed, fallback to prefetch: {exc}")
+        try:
+            found = prefetch_recent_item_keys(tenant_token)
+        except Exception as inner:
+            log(f"[Dedup] prefetch failed: {inner}")
+            return queue
+    for key in found:
+        existing_keys.add(key)
+    kept = [item for item in queue if item["item_key"] not in found]
+    stats["dedup_search_hits"] = len(queue) - len(kept)
+    stats["queue_total"] = len(kept)
+    log(f"[Dedup] search candidates={len(queue)} existing={len(queue) - len(kept)}")
+    return kept
+
+
+def feed_host(url: str) -> str:
+    return (urlparse(url).hostname or "").lower()
+
+
+def fetch_source_feed(source: Dict[str, Any]) -> Dict[str, Any]:
+    etag = ""
+    modified = ""
+    # 失败池非空时不带条件头：304 分支不会重试失败池，条目可能在 feed 变化前就滚出
+    if config.ENABLE_CONDITIONAL_GET and not parse_failed_items(source.get("failed_items")):
+        if config.RSS_FIELD_ETAG in RSS_OPTIONAL_FIELDS:
+            etag = source.get("etag") or ""
+        if config.RSS_FIELD_LAST_MODIFIED in RSS_OPTIONAL_FIELDS:
+            modified = source.get("last_modified") or ""
+
+    log(f"[RSS] fetching {source.get('name') or source.get('feed_url')}")
+    try:
+        feed = fetch_feed(
+            source["feed_url"],
+            config.HTTP_TIMEOUT,
+            config.HTTP_RETRIES,
+            headers={"User-Agent": "NewsDataRSS/1.0"},
+            etag=etag,
+            modified=modified,
+        )
+    except Exception as exc:
+        return {"feed": None, "error": exc}
+    return {"feed": feed, "error": None}
+
+
+def fetch_sources_parallel(sources: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    if not sources:
+        return []
+    # 按 host 排队：某个 host 在途数达到上限时暂不提交它的源，线程不会卡在 host 限制上，
+    # 空闲线程去抓其他 host；结果按输入顺序返回，合并时与串行抓取一致
+    per_host = max(1, config.FETCH_PER_HOST_LIMIT)
+    workers = max(1, min(config.FETCH_CONCURRENCY, len(sources)))
+    waiting: Dict[str, deque] = {}
+    for idx, source in enumerate(sources):
+        waiting.setdefault(feed_host(source["feed_url"]), deque()).append(idx)
+    active: Dict[str, int] = {}
+    results: List[Dict[str, Any]] = [{} for _ in sources]
+    running: Dict[Future, Tuple[int, str]] = {}
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+
+        def submit_ready() -> None:
+            for host in list(waiting):
+                pending = waiting[host]
+                while pending and active.get(host, 0) < per_host and len(running) < workers:
+                    idx = pending.popleft()
+                    active[host] = active.get(host, 0) + 1
+                    running[executor.submit(fetch_source_feed, sources[idx])] = (idx, host)
+                if not pending:
+                    del waiting[host]
+
+        submit_ready()
+        while running:
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                idx, host = running.pop(future)
+                active[host] -= 1
+                results[idx] = future.result()
+            submit_ready()
+    return results
+
+
 def split_sources_and_queue(
     sources: List[Dict[str, Any]],
     existing_keys: set,
-    tenant_token: str,
+    tenant_token: TenantToken,
 ) -> tuple[list, dict, dict]:
     queue: List[Dict[str, Any]] = []
     source_states: Dict[str, Dict[str, Any]] = {}
@@ -1495,8 +2038,15 @@ def split_sources_and_queue(
         "sources_skipped": 0,
         "entries_fetched": 0,
         "queue_total": 0,
+        "sources_not_modified": 0,
+        "feed_bytes": 0,
+        "feed_parse_ms": 0,
+        "feed_bytes_saved": 0,
+        "feed_parse_ms_saved": 0,
     }
 
+    due: List[tuple] = []
+    updates: List[Dict[str, Any]] = []
     for source in sources:
         if not source.get("feed_url"):
             stats["sources_skipped"] += 1
@@ -1504,16 +2054,11 @@ def split_sources_and_queue(
 
         now_ms = int(time.time() * 1000)
         if not source.get("enabled"):
-            update_bitable_record_fields(
-                config.FEISHU_APP_TOKEN,
-                config.FEISHU_RSS_TABLE_ID,
-                tenant_token,
+            queue_record_update(
+                updates,
                 source["record_id"],
-                {
-                    config.RSS_FIELD_STATUS: config.STATUS_IDLE,
-                },
-                config.HTTP_TIMEOUT,
-                config.HTTP_RETRIES,
+                source.get("fields"),
+                {config.RSS_FIELD_STATUS: config.STATUS_IDLE},
             )
             stats["sources_skipped"] += 1
             continue
@@ -1521,36 +2066,56 @@ def split_sources_and_queue(
         if not should_fetch(source, now_ms):
             stats["sources_skipped"] += 1
             continue
+        due.append((source, now_ms))
 
+    results = fetch_sources_parallel([source for source, _ in due])
+    for (source, now_ms), result in zip(due, results):
         last_item_pub_time = source.get("last_item_pub_time") or 0
         cutoff_ms = last_item_pub_time or (source.get("last_fetch_time") or 0)
         consecutive_fail = source.get("consecutive_fail_count") or 0
 
-        try:
-            log(f"[RSS] fetching {source.get('name') or source.get('feed_url')}")
-            feed = fetch_feed(source["feed_url"], config.HTTP_TIMEOUT, config.HTTP_RETRIES, headers={"User-Agent": "NewsDataRSS/1.0"})
-        except Exception as exc:
+        feed = result["feed"]
+        exc = result["error"]
+        if exc is not None:
             fail_count = consecutive_fail + 1
             status = derive_overall_status(fail_count, True)
             fetch_status = derive_fetch_status(exc)
-            update_bitable_record_fields(
-                config.FEISHU_APP_TOKEN,
-                config.FEISHU_RSS_TABLE_ID,
-                tenant_token,
+            queue_record_update(
+                updates,
                 source["record_id"],
+                source.get("fields"),
                 {
                     config.RSS_FIELD_STATUS: status,
                     config.RSS_FIELD_LAST_FETCH_STATUS: fetch_status,
                     config.RSS_FIELD_CONSECUTIVE_FAIL_COUNT: fail_count,
                     config.RSS_FIELD_LAST_FETCH_TIME: now_ms,
                 },
-                config.HTTP_TIMEOUT,
-                config.HTTP_RETRIES,
             )
             log(f"[RSS] fetch failed {source['feed_url']}: {exc}")
             stats["sources_skipped"] += 1
             continue
 
+        if feed.get("not_modified"):
+            log(f"[RSS] not modified {source.get('name') or source.get('feed_url')}")
+            stats["sources_not_modified"] += 1
+            stats["feed_bytes_saved"] += source.get("feed_bytes") or 0
+            stats["feed_parse_ms_saved"] += source.get("feed_parse_ms") or 0
+            source_states[source["record_id"]] = {
+                "source": source,
+                "now_ms": now_ms,
+                "not_modified": True,
+                "etag": feed.get("etag") or "",
+                "modified": feed.get("modified") or "",
+                "latest_pub_ms": 0,
+                "latest_key": "",
+                "updated_failed_items": [],
+                "new_count": 0,
+            }
+            stats["sources_processed"] += 1
+            continue
+
+        stats["feed_bytes"] += feed.get("bytes") or 0
+        stats["feed_parse_ms"] += feed.get("parse_ms") or 0
         entries = feed.entries or []
         log(f"[RSS] fetched entries={len(entries)} for {source.get('name') or source.get('feed_url')}")
         stats["entries_fetched"] += len(entries)
@@ -1584,10 +2149,13 @@ def split_sources_and_queue(
                 if item_key in existing_keys:
                     processed_keys.add(item_key)
                     continue
-                if retry_budget <= 0:
-                    updated_failed_items.append(item)
-                    continue
-                retry_budget -= 1
+                # 截止顺延的条目（fail_count=0）不占重试名额
+                prior_fails = int(item.get("fail_count") or 0)
+                if prior_fails > 0:
+                    if retry_budget <= 0:
+                        updated_failed_items.append(item)
+                        continue
+                    retry_budget -= 1
 
                 entry_ts = entry_published_ts(entry)
                 entry_ts_ms = entry_ts * 1000 if entry_ts else 0
@@ -1607,6 +2175,7 @@ def split_sources_and_queue(
                         "entry_ts": entry_ts,
                         "entry_ts_ms": entry_ts_ms,
                         "from_failed": True,
+                        "fail_count": prior_fails,
                     }
                 )
                 processed_keys.add(item_key)
@@ -1655,6 +2224,11 @@ def split_sources_and_queue(
         source_states[source["record_id"]] = {
             "source": source,
             "now_ms": now_ms,
+            "not_modified": False,
+            "etag": feed.get("etag") or "",
+            "modified": feed.get("modified") or "",
+            "feed_bytes": feed.get("bytes") or 0,
+            "feed_parse_ms": feed.get("parse_ms") or 0,
             "latest_pub_ms": latest_pub_ms,
             "latest_key": latest_key,
             "updated_failed_items": updated_failed_items,
@@ -1662,30 +2236,213 @@ def split_sources_and_queue(
         }
         stats["sources_processed"] += 1
 
+    flush_record_updates(config.FEISHU_RSS_TABLE_ID, tenant_token, updates, "sources")
     stats["queue_total"] = len(queue)
     return queue, source_states, stats
 
 
+def build_raw_embedding_text(article: Dict[str, Any]) -> str:
+    # 原始标题 + 导语（第一个像样的段落，跳过图注 / 署名这类短段）
+    title = (article.get("title") or "").strip()
+    html = article.get("content") or ""
+    lead = ""
+    for block in re.split(r"(?i)</p\s*>|<br\s*/?>|\n\s*\n", html):
+        text = clean_html_to_text(block)
+        if len(text) >= 40:
+            lead = text
+            break
+    if not lead:
+        lead = clean_html_to_text(html)
+    return f"{title}\n{lead[: config.PRE_LLM_DEDUP_LEAD_CHARS]}".strip()
+
+
+def pre_llm_semantic_dedup(queue: List[Dict[str, Any]], existing_keys: set, stats: Dict[str, int]) -> List[Dict[str, Any]]:
+    # 分析前按原始文本去重：与已分析文章（raw 命名空间）或本轮队列中更早的条目近似重复则丢弃；
+    # 保留条目的向量挂在 item["raw_embedding"]，分析成功后写入索引
+    if not queue:
+        return queue
+    texts = [build_raw_embedding_text(item["article"]) for item in queue]
+    if config.ENABLE_EMBED_BATCH:
+        embeddings = cf_embed_texts(texts, concurrency=config.PRE_LLM_DEDUP_CONCURRENCY)
+    else:
+        with ThreadPoolExecutor(max_workers=max(1, config.PRE_LLM_DEDUP_CONCURRENCY)) as executor:
+            embeddings = list(executor.map(cf_embed_text, texts))
+
+    threshold = config.PRE_LLM_DEDUP_THRESHOLD
+    accepted = VectorSet()
+    kept: List[Dict[str, Any]] = []
+    history_dropped = 0
+    queue_dropped = 0
+    for item, emb in zip(queue, embeddings):
+        if not emb:
+            kept.append(item)
+            continue
+        title = item["article"].get("title") or ""
+        in_queue = accepted.best(emb)
+        if in_queue is not None and in_queue >= threshold:
+            log(f"[PreDedup] skip queue similar={in_queue:.3f} title={title}")
+            queue_dropped += 1
+            existing_keys.add(item["item_key"])
+            continue
+        best_sim = semantic_dedup_query(emb, RAW_NAMESPACE)
+        if best_sim is not None and best_sim >= threshold:
+            log(f"[PreDedup] skip history similar={best_sim:.3f} title={title}")
+            history_dropped += 1
+            existing_keys.add(item["item_key"])
+            continue
+        accepted.add(emb)
+        item["raw_embedding"] = emb
+        kept.append(item)
+    stats["pre_llm_dropped"] += history_dropped + queue_dropped
+    log(
+        f"[PreDedup] items={len(queue)} embedded={sum(1 for e in embeddings if e)} "
+        f"dropped_history={history_dropped} dropped_queue={queue_dropped} kept={len(kept)}"
+    )
+    return kept
+
+
+def item_priority(item: Dict[str, Any], source_states: Dict[str, Dict[str, Any]], now_ms: int) -> float:
+    source = (source_states.get(item["source_id"]) or {}).get("source") or {}
+    weight = source.get("weight", 1.0)
+    half_life = config.PRIORITY_HALF_LIFE_HOURS
+    entry_ts_ms = item.get("entry_ts_ms") or 0
+    # 没有发布时间的条目按“一个半衰期前”计
+    age_hours = max(0.0, (now_ms - entry_ts_ms) / 3600000) if entry_ts_ms else half_life
+    recency = 0.5 ** (age_hours / half_life) if half_life > 0 else 1.0
+    boost = config.PRIORITY_RETRY_BOOST if item.get("from_failed") else 0.0
+    return weight * (recency + boost)
+
+
+def prioritize_queue(
+    queue: List[Dict[str, Any]],
+    source_states: Dict[str, Dict[str, Any]],
+    now_ms: int,
+) -> List[Dict[str, Any]]:
+    return sorted(queue, key=lambda item: item_priority(item, source_states, now_ms), reverse=True)
+
+
+def estimate_queue_capacity(work_sec: float) -> Optional[int]:
+    # 按剩余分析时间 × 并发上限（自适应并发时为 AIMD 上限）/ 单次请求估算耗时，
+    # 估算本轮还能发出多少次分析请求；不限时返回 None
+    if work_sec == float("inf") or config.LLM_EST_ITEM_SEC <= 0:
+        return None
+    return int(work_sec * max(1, worker_count()) / config.LLM_EST_ITEM_SEC)
+
+
+def title_triage_queue(
+    queue: List[Dict[str, Any]],
+    audit: Optional[TriageAudit],
+) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+    # 返回 (保留, 丢弃)；请求或解析失败的块全部保留
+    adapter = resolve_provider(config.TITLE_TRIAGE_PROVIDER or config.LLM_PROVIDER)
+    if not adapter.api_key():
+        log(f"[TitleTriage] skipped, missing {adapter.key_env}")
+        return queue, []
+    size = max(1, config.TITLE_TRIAGE_CHUNK)
+    chunks = [queue[i:i + size] for i in range(0, len(queue), size)]
+
+    def triage_chunk(chunk: List[Dict[str, Any]]) -> Dict[int, Tuple[bool, Optional[float]]]:
+        raw_text, _, _ = run_llm_request(
+            adapter,
+            build_title_triage_prompt(chunk),
+            TASK_SUMMARY,
+            service=f"TitleTriage:{adapter.name}",
+            model=config.TITLE_TRIAGE_MODEL,
+        )
+        return parse_title_triage(raw_text or "", len(chunk))
+
+    with ThreadPoolExecutor(max_workers=worker_count()) as executor:
+        results = list(executor.map(triage_chunk, chunks))
+
+    kept: List[Dict[str, Any]] = []
+    dropped: List[Dict[str, Any]] = []
+    for chunk, decisions in zip(chunks, results):
+        for idx, item in enumerate(chunk):
+            keep, score = decisions.get(idx, (True, None))
+            drop = should_drop(keep, score, config.TITLE_TRIAGE_MIN_SCORE)
+            # 抽检：部分被丢弃的条目照常分析，用完整分析分数评估初筛
+            audited = drop and random.random() < config.TITLE_TRIAGE_AUDIT_RATE
+            if audit is not None:
+                audit.record_decision(item["item_key"], item["article"].get("title") or "", not drop, score, audited)
+            if drop and not audited:
+                dropped.append(item)
+                continue
+            item["title_triaged"] = True
+            kept.append(item)
+    log(f"[TitleTriage] requests={len(chunks)} kept={len(kept)} dropped={len(dropped)}")
+    return kept, dropped
+
+
+def open_title_triage_audit() -> Optional[TriageAudit]:
+    if not config.TITLE_TRIAGE_AUDIT_PATH:
+        return None
+    try:
+        return TriageAudit(config.TITLE_TRIAGE_AUDIT_PATH)
+    except OSError as exc:
+        log(f"[TitleTriage] audit disabled: {exc}")
+        return None
+
+
 def run_llm_queue(
     queue: List[Dict[str, Any]],
     source_states: Dict[str, Dict[str, Any]],
-    tenant_token: str,
+    tenant_token: TenantToken,
     existing_keys: set,
     featured_candidates: List[Dict[str, str]],
     stats: Dict[str, int],
 ) -> None:
-    total = len(queue)
-    if total <= 0:
+    if not queue:
         log("[LLM] queue empty")
         return
 
     lock = threading.Lock()
+    writer = BatchRecordWriter(
+        config.FEISHU_APP_TOKEN,
+        config.FEISHU_NEWS_TABLE_ID,
+        tenant_token,
+        config.HTTP_TIMEOUT,
+        config.HTTP_RETRIES,
+        batch_size=config.FEISHU_BATCH_SIZE,
+        max_age_sec=config.FEISHU_BATCH_MAX_AGE_SEC,
+        log=log,
+    )
+
+    deadline = get_run_deadline()
+    stopped = threading.Event()
+    triage_audit: Optional[TriageAudit] = None
+    # 本轮已通过语义去重的向量：并发 worker 查询远端索引时彼此的结果尚未写入，需在本地互查
+    run_vectors = VectorSet()
 
-    def handle_item(item: Dict[str, Any]) -> None:
+    def defer_item(item: Dict[str, Any], reason: str = "deadline") -> None:
+        # 截止前未完成 / 被削峰的条目放回来源的失败池，下一轮优先重试
+        state = source_states[item["source_id"]]
+        article = item["article"]
+        with lock:
+            stats[f"{reason}_deferred"] += 1
+            upsert_failed_item(
+                state["updated_failed_items"],
+                item["item_key"],
+                item["entry_ts_ms"],
+                article.get("title") or "",
+                article.get("link") or "",
+                reason,
+                state["now_ms"],
+                count_failure=False,
+            )
+            # 从失败池取出的条目保留原有失败次数
+            for entry in state["updated_failed_items"]:
+                if entry.get("item_key") == item["item_key"]:
+                    entry["fail_count"] = max(int(entry.get("fail_count") or 0), int(item.get("fail_count") or 0))
+
+    def handle_item(item: Dict[str, Any], analysis: Dict[str, Any]) -> None:
         state = source_states[item["source_id"]]
         article = item["article"]
-        analysis = analyze_with_llm(article)
         categories = analysis.get("categories") or []
+        if isinstance(categories, list) and DEADLINE_CATEGORY in categories:
+            defer_item(item)
+            return
+        if triage_audit is not None and item.get("title_triaged") and is_cacheable_analysis(analysis):
+            triage_audit.record_analysis(item["item_key"], float(analysis.get("score", 0.0) or 0.0))
         if isinstance(categories, list) and any(c in FAILED_CATEGORIES for c in categories):
             with lock:
                 stats["llm_failed"] += 1
@@ -1703,52 +2460,71 @@ def run_llm_queue(
         with lock:
             stats["llm_success"] += 1
 
+        # 分析过的文章（无论分数高低）都记入原始向量索引，之后的转载在分析前即可丢弃
+        if item.get("raw_embedding"):
+            semantic_dedup_add(
+                item["item_key"],
+                item["raw_embedding"],
+                {"title": article.get("title") or "", "source": article.get("source") or "", "published": item.get("entry_ts") or 0},
+                RAW_NAMESPACE,
+            )
+
         score = float(analysis.get("score", 0.0) or 0.0)
         emb_vec = None
         if score >= config.FEISHU_MIN_SCORE:
             if config.ENABLE_VECTORIZE_DEDUP:
                 embed_text = build_embedding_text(article, analysis)
-                emb_vec = cf_embed_text(embed_text)
+                emb_vec = embed_text_batched(embed_text)
                 if emb_vec:
-                    best_sim = vectorize_query(emb_vec)
+                    best_sim = semantic_dedup_query(emb_vec)
                     if best_sim is not None and best_sim >= config.CF_VECTORIZE_SIM_THRESHOLD:
                         log(f"[Vectorize] skip similar={best_sim:.3f} title={article.get('title','')}")
                         with lock:
                             existing_keys.add(item["item_key"])
                             stats["vectorize_skipped"] += 1
                         return
+                    # 只有通过历史去重的条目才登记；查询与登记在同一把锁内完成，两个近似条目不会同时通过
+                    with lock:
+                        run_sim = run_vectors.best(emb_vec)
+                        run_dup = run_sim is not None and run_sim >= config.CF_VECTORIZE_SIM_THRESHOLD
+                        if run_dup:
+                            existing_keys.add(item["item_key"])
+                            stats["vectorize_skipped"] += 1
+                        else:
+                            run_vectors.add(emb_vec, item["item_key"])
+                    if run_dup:
+                        log(f"[Vectorize] skip in-run similar={run_sim:.3f} title={article.get('title','')}")
+                        return
                 else:
                     log("[Vectorize] embedding unavailable, fallback to exact dedup only")
 
             fields = build_news_fields(article, analysis, item["item_key"])
-            ok, record_id = create_bitable_record_with_id(
-                config.FEISHU_APP_TOKEN,
-                config.FEISHU_NEWS_TABLE_ID,
-                tenant_token,
-                fields,
-                config.HTTP_TIMEOUT,
-                config.HTTP_RETRIES,
-            )
-            if not ok:
-                with lock:
-                    stats["feishu_create_failed"] += 1
-            else:
+
+            def on_created(record_id: Optional[str]) -> None:
+                if not record_id:
+                    # 写入失败的条目不应再压制本轮后续的近似条目
+                    with lock:
+                        stats["feishu_create_failed"] += 1
+                        run_vectors.discard(item["item_key"])
+                    return
+                record_created_key(existing_keys, item["item_key"])
                 if config.ENABLE_VECTORIZE_DEDUP and emb_vec:
                     metadata = {
                         "title": article.get("title") or "",
                         "source": article.get("source") or "",
                         "published": item.get("entry_ts") or 0,
                     }
-                    vectorize_upsert(item["item_key"], emb_vec, metadata)
-                if record_id:
-                    with lock:
-                        featured_candidates.append(
-                            {
-                                "record_id": record_id,
-                                "title": clean_feishu_value(fields.get(config.NEWS_FIELD_TITLE)).strip(),
-                                "summary": clean_feishu_value(fields.get(config.NEWS_FIELD_SUMMARY)).strip(),
-                            }
-                        )
+                    semantic_dedup_add(item["item_key"], emb_vec, metadata)
+                with lock:
+                    featured_candidates.append(
+                        {
+                            "record_id": record_id,
+                            "title": clean_feishu_value(fields.get(config.NEWS_FIELD_TITLE)).strip(),
+                            "summary": clean_feishu_value(fields.get(config.NEWS_FIELD_SUMMARY)).strip(),
+                        }
+                    )
+
+            writer.add(fields, on_created)
 
         with lock:
             existing_keys.add(item["item_key"])
@@ -1756,17 +2532,91 @@ def run_llm_queue(
             stats["entries_new"] += 1
             state["new_count"] += 1
 
+    def handle_batch(batch: List[Dict[str, Any]]) -> None:
+        if deadline.expired():
+            if not stopped.is_set():
+                stopped.set()
+                log(f"[Deadline] stop dispatching, elapsed={deadline.elapsed():.0f}s remaining={deadline.remaining():.0f}s")
+            for item in batch:
+                defer_item(item)
+            return
+        started = time.monotonic()
+        analyses = analyze_articles([item["article"] for item in batch])
+        if config.LLM_QUEUE_RECORD_PATH:
+            latency = (time.monotonic() - started) / len(batch)
+            with lock:
+                for item in batch:
+                    queue_records.append(
+                        {
+                            "rank": ranks.get(id(item), 0),
+                            "source_id": item["source_id"],
+                            "item_key": item["item_key"],
+                            "content_len": item_size(item),
+                            "from_failed": bool(item.get("from_failed")),
+                            "entry_ts_ms": item.get("entry_ts_ms") or 0,
+                            "latency_sec": round(latency, 3),
+                        }
+                    )
+        for item, analysis in zip(batch, analyses):
+            try:
+                handle_item(item, analysis)
+            except Exception as exc:
+                with lock:
+                    stats["llm_failed"] += 1
+                log(f"[LLM] task failed: {exc}")
+
+    if config.ENABLE_TITLE_TRIAGE:
+        triage_audit = open_title_triage_audit()
+        queue, dropped = title_triage_queue(queue, triage_audit)
+        for item in dropped:
+            existing_keys.add(item["item_key"])
+        stats["title_dropped"] += len(dropped)
+
+    if config.ENABLE_QUEUE_PRIORITY:
+        queue = prioritize_queue(queue, source_states, int(time.time() * 1000))
+        capacity = estimate_queue_capacity(deadline.work_remaining())
+        if capacity is not None:
+            # 容量按请求数计：批量模式下一次请求分析多篇，按计划好的批次截断
+            planned = plan_llm_batches(queue)
+            if len(planned) > capacity:
+                keep = sum(len(batch) for batch in planned[:capacity])
+                for item in queue[keep:]:
+                    defer_item(item, "shed")
+                queue = queue[:keep]
+        log(
+            f"[Queue] priority order, capacity={capacity if capacity is not None else 'unbounded'} requests "
+            f"shed={stats['shed_deferred']}"
+        )
+    total = len(queue)
+    if total <= 0:
+        log("[LLM] nothing to analyze before deadline")
+        writer.close()
+        return
+
+    # ranks 记录优先级顺序，录制的队列据此回放各策略
+    policy = resolve_schedule_policy(config.LLM_SCHEDULE_POLICY)
+    if policy != config.LLM_SCHEDULE_POLICY:
+        log(f"[Queue] unknown policy={config.LLM_SCHEDULE_POLICY}, fallback to {policy}")
+    ranks = {id(item): rank for rank, item in enumerate(queue)}
+    queue_records: List[Dict[str, Any]] = []
+    queue = apply_schedule_policy(queue, policy)
+    log(f"[Queue] policy={policy} items={total}")
+
+    batches = plan_llm_batches(queue)
+    if len(batches) < total:
+        log(f"[LLM] batched mode: {total} items in {len(batches)} requests")
+
     done = 0
-    with ThreadPoolExecutor(max_workers=config.LLM_CONCURRENCY) as executor:
-        futures = [executor.submit(handle_item, item) for item in queue]
+    with ThreadPoolExecutor(max_workers=worker_count()) as executor:
+        futures = {executor.submit(handle_batch, batch): len(batch) for batch in batches}
         for future in as_completed(futures):
             try:
                 future.result()
             except Exception as exc:
                 with lock:
-                    stats["llm_failed"] += 1
+                    stats["llm_failed"] += futures[future]
                 log(f"[LLM] task failed: {exc}")
-            done += 1
+            done += futures[future]
             bar = render_progress(done, total, width=config.PROGRESS_BAR_WIDTH)
             msg = f"[LLM] {bar} ok={stats['llm_success']} fail={stats['llm_failed']}"
             if sys.stdout.isatty():
@@ -1777,11 +2627,70 @@ def run_llm_queue(
         if sys.stdout.isatty():
             sys.stdout.write("\n")
             sys.stdout.flush()
+    writer.close()
+    # 分析阶段结束：把积压的向量写入提交掉，后续阶段（精选等）不必等待
+    if VECTORIZE_WRITER is not None:
+        VECTORIZE_WRITER.flush()
+    if EMBED_BATCHER is not None and EMBED_BATCHER.stats["texts"]:
+        embed_stats = EMBED_BATCHER.stats
+        log(
+            f"[Embed] texts={embed_stats['texts']} requests={embed_stats['requests']} "
+            f"avg_batch={embed_stats['texts'] / embed_stats['requests']:.1f} request_sec={embed_stats['request_sec']:.1f}"
+        )
+    if config.LLM_QUEUE_RECORD_PATH and queue_records:
+        try:
+            write_queue_record(config.LLM_QUEUE_RECORD_PATH, queue_records)
+            log(f"[Queue] recorded {len(queue_records)} items to {config.LLM_QUEUE_RECORD_PATH}")
+        except OSError as exc:
+            log(f"[Queue] record failed: {exc}")
+    for name, item in controller_stats().items():
+        log(
+            f"[Concurrency] provider={name} final={item['final']} peak={item['peak']} "
+            f"increases={item['increases']} decreases={item['decreases']} range={item['min']}-{item['max']}"
+        )
+    for name, limiter in limiter_stats().items():
+        log(
+            f"[RateLimit] provider={name} requests={limiter['acquired']} "
+            f"wait_sec={limiter['wait_sec']:.1f} throttled={limiter['throttled']}"
+        )
+    with LLM_PARSE_LOCK:
+        parse_stats = {name: dict(item) for name, item in LLM_PARSE_STATS.items()}
+    for name, item in parse_stats.items():
+        responses = sum(item.values())
+        broken = responses - item["ok"]
+        repaired = item["local_repaired"] + item["llm_repaired"]
+        log(
+            f"[LLMParse] provider={name} responses={responses} "
+            f"parse_fail_rate={broken / max(1, responses):.1%} repair_rate={repaired / max(1, broken):.1%} "
+            f"local_repaired={item['local_repaired']} llm_repaired={item['llm_repaired']} failed={item['failed']}"
+        )
+    if CASCADE_STATS["triaged"]:
+        log(
+            "[Cascade] "
+            f"triaged={CASCADE_STATS['triaged']} rejected={CASCADE_STATS['rejected']} "
+            f"passed={CASCADE_STATS['passed']} triage_failed={CASCADE_STATS['triage_failed']} "
+            f"expensive_calls_avoided={CASCADE_STATS['rejected']} threshold={config.LLM_TRIAGE_MIN_SCORE}"
+        )
+    if LLM_BATCH_STATS["requests"]:
+        per_article = LLM_BATCH_STATS["prompt_tokens"] // max(1, LLM_BATCH_STATS["articles"])
+        log(
+            "[LLMBatch] "
+            f"requests={LLM_BATCH_STATS['requests']} articles={LLM_BATCH_STATS['articles']} "
+            f"fallback={LLM_BATCH_STATS['fallback']} failed={LLM_BATCH_STATS['failed']} est_prompt_tokens_per_article={per_article} "
+            f"single_prompt_overhead={estimate_tokens(SYSTEM_PROMPT)}"
+        )
+    if stats["deadline_deferred"]:
+        log(f"[Deadline] deferred={stats['deadline_deferred']} to failed pool")
+    log(
+        "[Feishu] batch create "
+        f"batches={writer.stats['batches']} rows_ok={writer.stats['rows_ok']} "
+        f"rows_failed={writer.stats['rows_failed']} splits={writer.stats['splits']}"
+    )
 
 
 def process_source(
     source: Dict[str, Any],
-    tenant_token: str,
+    tenant_token: TenantToken,
     existing_keys: set,
 ) -> None:
     if not source.get("feed_url"):
@@ -1847,6 +2756,32 @@ def process_source(
     latest_key = ""
     new_count = 0
     processed_keys: set = set()
+    writer = BatchRecordWriter(
+        config.FEISHU_APP_TOKEN,
+        config.FEISHU_NEWS_TABLE_ID,
+        tenant_token,
+        config.HTTP_TIMEOUT,
+        config.HTTP_RETRIES,
+        batch_size=config.FEISHU_BATCH_SIZE,
+        max_age_sec=0,
+        log=log,
+    )
+
+    def make_created_callback(article: Dict[str, Any], item_key: str, entry_ts: int, emb_vec: Optional[List[float]]):
+        def on_created(record_id: Optional[str]) -> None:
+            if not record_id:
+                log(f"[Feishu] create record failed: {article.get('title','')}")
+                return
+            record_created_key(existing_keys, item_key)
+            if config.ENABLE_VECTORIZE_DEDUP and emb_vec:
+                metadata = {
+                    "title": article.get("title") or "",
+                    "source": article.get("source") or "",
+                    "published": entry_ts or 0,
+                }
+                semantic_dedup_add(item_key, emb_vec, metadata)
+
+        return on_created
 
     if failed_items:
         retry_budget = config.FAILED_ITEMS_RETRY_LIMIT
@@ -1879,7 +2814,7 @@ def process_source(
                 "source": source.get("name") or source.get("feed_url"),
             }
 
-            analysis = analyze_with_llm(article)
+            analysis = analyze_article(article)
             categories = analysis.get("categories") or []
             if isinstance(categories, list) and any(c in FAILED_CATEGORIES for c in categories):
                 upsert_failed_item(
@@ -1901,7 +2836,7 @@ def process_source(
                     embed_text = build_embedding_text(article, analysis)
                     emb_vec = cf_embed_text(embed_text)
                     if emb_vec:
-                        best_sim = vectorize_query(emb_vec)
+                        best_sim = semantic_dedup_query(emb_vec)
                         if best_sim is not None and best_sim >= config.CF_VECTORIZE_SIM_THRESHOLD:
                             log(f"[Vectorize] skip similar={best_sim:.3f} title={article.get('title','')}")
                             existing_keys.add(item_key)
@@ -1911,24 +2846,7 @@ def process_source(
                         log("[Vectorize] embedding unavailable, fallback to exact dedup only")
 
                 fields = build_news_fields(article, analysis, item_key)
-                ok = create_bitable_record(
-                    config.FEISHU_APP_TOKEN,
-                    config.FEISHU_NEWS_TABLE_ID,
-                    tenant_token,
-                    fields,
-                    config.HTTP_TIMEOUT,
-                    config.HTTP_RETRIES,
-                )
-                if not ok:
-                    log(f"[Feishu] create record failed: {article.get('title','')}")
-                else:
-                    if config.ENABLE_VECTORIZE_DEDUP and emb_vec:
-                        metadata = {
-                            "title": article.get("title") or "",
-                            "source": article.get("source") or "",
-                            "published": entry_ts or 0,
-                        }
-                        vectorize_upsert(item_key, emb_vec, metadata)
+                writer.add(fields, make_created_callback(article, item_key, entry_ts, emb_vec))
 
             existing_keys.add(item_key)
             processed_keys.add(item_key)
@@ -1962,7 +2880,7 @@ def process_source(
             "source": source.get("name") or source.get("feed_url"),
         }
 
-        analysis = analyze_with_llm(article)
+        analysis = analyze_article(article)
         categories = analysis.get("categories") or []
         if isinstance(categories, list) and any(c in FAILED_CATEGORIES for c in categories):
             log(f"[LLM:{config.LLM_PROVIDER}] skipped due to failure category: {categories}")
@@ -1975,7 +2893,7 @@ def process_source(
                 embed_text = build_embedding_text(article, analysis)
                 emb_vec = cf_embed_text(embed_text)
                 if emb_vec:
-                    best_sim = vectorize_query(emb_vec)
+                    best_sim = semantic_dedup_query(emb_vec)
                     if best_sim is not None and best_sim >= config.CF_VECTORIZE_SIM_THRESHOLD:
                         log(f"[Vectorize] skip similar={best_sim:.3f} title={article.get('title','')}")
                         existing_keys.add(item_key)
@@ -1984,24 +2902,7 @@ def process_source(
                     log("[Vectorize] embedding unavailable, fallback to exact dedup only")
 
             fields = build_news_fields(article, analysis, item_key)
-            ok = create_bitable_record(
-                config.FEISHU_APP_TOKEN,
-                config.FEISHU_NEWS_TABLE_ID,
-                tenant_token,
-                fields,
-                config.HTTP_TIMEOUT,
-                config.HTTP_RETRIES,
-            )
-            if not ok:
-                log(f"[Feishu] create record failed: {article.get('title','')}")
-            else:
-                if config.ENABLE_VECTORIZE_DEDUP and emb_vec:
-                    metadata = {
-                        "title": article.get("title") or "",
-                        "source": article.get("source") or "",
-                        "published": entry_ts or 0,
-                    }
-                    vectorize_upsert(item_key, emb_vec, metadata)
+            writer.add(fields, make_created_callback(article, item_key, entry_ts, emb_vec))
         existing_keys.add(item_key)
         new_count += 1
 
@@ -2009,6 +2910,8 @@ def process_source(
             latest_pub_ms = entry_ts_ms
             latest_key = item_key
 
+    writer.close()
+
     update_fields: Dict[str, Any] = {
         config.RSS_FIELD_STATUS: config.STATUS_OK,
         config.RSS_FIELD_LAST_FETCH_STATUS: config.FETCH_STATUS_SUCCESS,
@@ -2034,19 +2937,30 @@ def process_source(
 
 
 def main() -> None:
+    deadline = start_run_deadline()
     if config.ENABLE_VECTORIZE_DEDUP:
         missing = []
         if not config.CF_ACCOUNT_ID:
             missing.append("CF_ACCOUNT_ID")
         if not config.CF_API_TOKEN:
             missing.append("CF_API_TOKEN")
-        if not config.CF_VECTORIZE_INDEX:
+        # local 后端只需要 Workers AI 生成向量，不依赖 Vectorize 索引
+        local_backend = config.VECTOR_DEDUP_BACKEND == "local" and vector_index_available()
+        if not config.CF_VECTORIZE_INDEX and not local_backend:
             missing.append("CF_VECTORIZE_INDEX")
         if missing:
             log(f"[Vectorize] disabled, missing: {', '.join(missing)}")
             config.ENABLE_VECTORIZE_DEDUP = False
 
-    tenant_token = get_tenant_access_token(config.FEISHU_APP_ID, config.FEISHU_APP_SECRET, config.HTTP_TIMEOUT, config.HTTP_RETRIES)
+    tenant_token = TenantTokenProvider(
+        config.FEISHU_APP_ID,
+        config.FEISHU_APP_SECRET,
+        config.HTTP_TIMEOUT,
+        config.HTTP_RETRIES,
+        cache_path=config.FEISHU_TOKEN_CACHE_PATH,
+        refresh_margin_sec=config.FEISHU_TOKEN_REFRESH_MARGIN_SEC,
+    )
+    tenant_token.get()
     set_notify_tenant_token(tenant_token)
     required = []
     if not config.FEISHU_APP_TOKEN:
@@ -2059,25 +2973,27 @@ def main() -> None:
         notify_config_missing("missing: " + ", ".join(required))
         log(f"[Config] missing: {', '.join(required)}")
         return
+    rss_table_fields = list_rss_field_names(tenant_token)
+    if config.ENABLE_CONDITIONAL_GET:
+        ensure_rss_optional_fields(tenant_token, rss_table_fields)
     records = list_bitable_records(
         config.FEISHU_APP_TOKEN,
         config.FEISHU_RSS_TABLE_ID,
         tenant_token,
         config.HTTP_TIMEOUT,
         config.HTTP_RETRIES,
+        field_names=rss_read_field_names(rss_table_fields),
+        automatic_fields=False,
     )
 
     sources = [normalize_source(r) for r in records if r.get("record_id")]
     enabled_sources = [s for s in sources if s.get("enabled")]
     log(f"[RSS] sources total={len(sources)} enabled={len(enabled_sources)}")
-    try:
-        existing_keys = prefetch_recent_item_keys(tenant_token)
-        log(f"[Dedup] prefetched keys: {len(existing_keys)}")
-    except Exception as exc:
-        log(f"[Dedup] prefetch failed: {exc}")
-        existing_keys = set()
+    existing_keys = load_existing_keys(tenant_token)
 
     queue, source_states, fetch_stats = split_sources_and_queue(enabled_sources, existing_keys, tenant_token)
+    if config.DEDUP_MODE == "search":
+        queue = filter_queue_by_search(queue, existing_keys, tenant_token, fetch_stats)
     stats = {
         "llm_success": 0,
         "llm_failed": 0,
@@ -2085,37 +3001,72 @@ def main() -> None:
         "entries_processed": 0,
         "entries_new": 0,
         "vectorize_skipped": 0,
+        "deadline_deferred": 0,
+        "shed_deferred": 0,
+        "title_dropped": 0,
+        "pre_llm_dropped": 0,
     }
     stats.update(fetch_stats)
     log(f"[Queue] total={stats['queue_total']} sources_processed={stats['sources_processed']} sources_skipped={stats['sources_skipped']}")
 
     featured_candidates: List[Dict[str, str]] = []
-    run_llm_queue(queue, source_states, tenant_token, existing_keys, featured_candidates, stats)
-
+    cache = open_llm_cache()
+    open_vector_index()
+    open_vectorize_writer()
+    try:
+        # 放在精确去重之后，避免为已存在的条目生成向量
+        if config.ENABLE_PRE_LLM_DEDUP and config.ENABLE_VECTORIZE_DEDUP:
+            queue = pre_llm_semantic_dedup(queue, existing_keys, stats)
+        run_llm_queue(queue, source_states, tenant_token, existing_keys, featured_candidates, stats)
+    finally:
+        if cache is not None:
+            cache.close()
+        close_vector_index()
+        close_vectorize_writer()
+        close_existing_keys(existing_keys)
+    cache_stats = cache.stats if cache is not None else {"hit": 0, "miss": 0, "coalesced": 0}
+
+    source_updates: List[Dict[str, Any]] = []
     for state in source_states.values():
         source = state["source"]
-        update_fields: Dict[str, Any] = {
-            config.RSS_FIELD_STATUS: config.STATUS_OK,
-            config.RSS_FIELD_LAST_FETCH_STATUS: config.FETCH_STATUS_SUCCESS,
-            config.RSS_FIELD_CONSECUTIVE_FAIL_COUNT: 0,
-            config.RSS_FIELD_LAST_FETCH_TIME: state["now_ms"],
-            config.RSS_FIELD_FAILED_ITEMS: serialize_failed_items(prune_failed_items(state["updated_failed_items"], state["now_ms"])),
-        }
-        if state["latest_pub_ms"]:
-            update_fields[config.RSS_FIELD_LAST_ITEM_PUB_TIME] = state["latest_pub_ms"]
-        if state["latest_key"]:
-            update_fields[config.RSS_FIELD_LAST_ITEM_GUID] = state["latest_key"]
+        if state.get("not_modified"):
+            update_fields: Dict[str, Any] = {
+                config.RSS_FIELD_STATUS: config.STATUS_OK,
+                config.RSS_FIELD_LAST_FETCH_STATUS: config.FETCH_STATUS_NOT_MODIFIED,
+                config.RSS_FIELD_CONSECUTIVE_FAIL_COUNT: 0,
+                config.RSS_FIELD_LAST_FETCH_TIME: state["now_ms"],
+            }
+        else:
+            update_fields = {
+                config.RSS_FIELD_STATUS: config.STATUS_OK,
+                config.RSS_FIELD_LAST_FETCH_STATUS: config.FETCH_STATUS_SUCCESS,
+                config.RSS_FIELD_CONSECUTIVE_FAIL_COUNT: 0,
+                config.RSS_FIELD_LAST_FETCH_TIME: state["now_ms"],
+                config.RSS_FIELD_FAILED_ITEMS: serialize_failed_items(prune_failed_items(state["updated_failed_items"], state["now_ms"])),
+            }
+            if state["latest_pub_ms"]:
+                update_fields[config.RSS_FIELD_LAST_ITEM_PUB_TIME] = state["latest_pub_ms"]
+            if state["latest_key"]:
+                update_fields[config.RSS_FIELD_LAST_ITEM_GUID] = state["latest_key"]
+            set_optional_fields(
+                update_fields,
+                {
+                    config.RSS_FIELD_FEED_BYTES: state.get("feed_bytes") or 0,
+                    config.RSS_FIELD_FEED_PARSE_MS: state.get("feed_parse_ms") or 0,
+                },
+            )
+        if config.ENABLE_CONDITIONAL_GET:
+            set_optional_fields(
+                update_fields,
+                {
+                    config.RSS_FIELD_ETAG: state.get("etag") or "",
+                    config.RSS_FIELD_LAST_MODIFIED: state.get("modified") or "",
+                },
+            )
 
-        update_bitable_record_fields(
-            config.FEISHU_APP_TOKEN,
-            config.FEISHU_RSS_TABLE_ID,
-            tenant_token,
-            source["record_id"],
-            update_fields,
-            config.HTTP_TIMEOUT,
-            config.HTTP_RETRIES,
-        )
+        queue_record_update(source_updates, source["record_id"], source.get("fields"), update_fields)
         log(f"[RSS] {source.get('name') or source.get('feed_url')} new={state['new_count']}")
+    flush_record_updates(config.FEISHU_RSS_TABLE_ID, tenant_token, source_updates, "sources")
 
     if featured_candidates:
         log(f"[Featured] candidates={len(featured_candidates)} ids={[c.get('record_id') for c in featured_candidates]}")
@@ -2131,6 +3082,7 @@ def main() -> None:
 
     log(
         "[Summary] "
+        f"schedule_policy={resolve_schedule_policy(config.LLM_SCHEDULE_POLICY)} "
         f"sources_done={stats['sources_processed']} "
         f"sources_skipped={stats['sources_skipped']} "
         f"entries_fetched={stats['entries_fetched']} "
@@ -2140,7 +3092,28 @@ def main() -> None:
         f"llm_ok={stats['llm_success']} "
         f"llm_failed={stats['llm_failed']} "
         f"feishu_failed={stats['feishu_create_failed']} "
-        f"vectorize_skipped={stats['vectorize_skipped']}"
+        f"vectorize_skipped={stats['vectorize_skipped']} "
+        f"llm_cache_hit={cache_stats['hit']} "
+        f"llm_cache_miss={cache_stats['miss']} "
+        f"llm_cache_coalesced={cache_stats['coalesced']} "
+        f"deadline_deferred={stats['deadline_deferred']} "
+        f"shed_deferred={stats['shed_deferred']} "
+        f"title_dropped={stats['title_dropped']} "
+        f"pre_llm_dropped={stats['pre_llm_dropped']} "
+        f"elapsed_sec={deadline.elapsed():.0f}"
+    )
+    log(
+        "[Fetch] "
+        f"not_modified={stats['sources_not_modified']} "
+        f"bytes={stats['feed_bytes']} "
+        f"parse_ms={stats['feed_parse_ms']} "
+        f"bytes_saved={stats['feed_bytes_saved']} "
+        f"parse_ms_saved={stats['feed_parse_ms_saved']}"
+    )
+    conn = http_pool.connection_stats()
+    log(
+        f"[HTTP] requests={conn['requests']} conn_new={conn['new']} conn_reused={conn['reused']} "
+        f"token_refreshes={tenant_token.refreshes}"
     )
 
 
@@ -5,19 +5,51 @@ import time
 from typing import Any, Dict, Optional
 
 import feedparser
-import requests
 
+import http_pool
+
+
+def fetch_feed(
+    url: str,
+    timeout: int,
+    retries: int,
+    headers: Optional[Dict[str, str]] = None,
+    etag: str = "",
+    modified: str = "",
+) -> feedparser.FeedParserDict:
+    req_headers = dict(headers or {})
+    if etag:
+        req_headers["If-None-Match"] = etag
+    if modified:
+        req_headers["If-Modified-Since"] = modified
 
-def fetch_feed(url: str, timeout: int, retries: int, headers: Optional[Dict[str, str]] = None) -> feedparser.FeedParserDict:
     last_err: Optional[Exception] = None
     for attempt in range(retries):
         try:
-            resp = requests.get(url, headers=headers, timeout=timeout)
+            resp = http_pool.get(url, headers=req_headers, timeout=timeout)
+            if resp.status_code == 304 and (etag or modified):
+                return feedparser.FeedParserDict(
+                    entries=[],
+                    status=304,
+                    not_modified=True,
+                    etag=resp.headers.get("ETag") or etag,
+                    modified=resp.headers.get("Last-Modified") or modified,
+                    bytes=0,
+                    parse_ms=0,
+                )
             if resp.status_code != 200:
                 raise RuntimeError(f"HTTP {resp.status_code}: {resp.text[:200]}")
+            parse_start = time.perf_counter()
             feed = feedparser.parse(resp.content)
+            parse_ms = int((time.perf_counter() - parse_start) * 1000)
             if feed.bozo:
                 raise RuntimeError(f"Feed parse error: {feed.bozo_exception}")
+            feed["status"] = resp.status_code
+            feed["not_modified"] = False
+            feed["etag"] = resp.headers.get("ETag") or ""
+            feed["modified"] = resp.headers.get("Last-Modified") or ""
+            feed["bytes"] = len(resp.content)
+            feed["parse_ms"] = parse_ms
             return feed
         except Exception as exc:
             last_err = exc
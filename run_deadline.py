@@ -0,0 +1,86 @@
+# -*- coding: utf-8 -*-
+import math
+import threading
+import time
+from typing import Callable, Optional
+
+import config
+
+
+# 整轮运行的时间预算：budget_sec 为硬截止（应小于 Actions 的 timeout-minutes），
+# 最后 reserve_sec 留给收尾（写回源状态、精选），分析阶段不得占用。
+class RunDeadline:
+    def __init__(
+        self,
+        budget_sec: float,
+        reserve_sec: float = 0.0,
+        min_call_sec: float = 0.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.clock = clock
+        self.started = clock()
+        self.budget_sec = budget_sec
+        self.reserve_sec = max(0.0, reserve_sec)
+        self.min_call_sec = max(0.0, min_call_sec)
+
+    @property
+    def enabled(self) -> bool:
+        return self.budget_sec > 0
+
+    def elapsed(self) -> float:
+        return self.clock() - self.started
+
+    def remaining(self) -> float:
+        # 距硬截止的秒数；未启用时为 inf
+        if not self.enabled:
+            return math.inf
+        return max(0.0, self.budget_sec - self.elapsed())
+
+    def work_remaining(self) -> float:
+        # 分析阶段可用的秒数（扣除收尾预留）
+        return max(0.0, self.remaining() - self.reserve_sec)
+
+    def expired(self) -> bool:
+        # 临近截止：不再派发新的队列条目
+        return self.work_remaining() <= self.min_call_sec
+
+    def call_timeout(self, timeout: float, reserve: bool = True) -> Optional[float]:
+        # 单次请求的超时按剩余时间封顶；剩余不足 min_call_sec 时返回 None，表示不应再发起请求
+        left = self.work_remaining() if reserve else self.remaining()
+        if left <= self.min_call_sec:
+            return None
+        return min(float(timeout), left)
+
+
+_DEADLINE: Optional[RunDeadline] = None
+_DEADLINE_LOCK = threading.Lock()
+
+
+def _new_deadline() -> RunDeadline:
+    return RunDeadline(
+        config.RUN_DEADLINE_MIN * 60,
+        reserve_sec=config.RUN_DEADLINE_RESERVE_SEC,
+        min_call_sec=config.RUN_DEADLINE_MIN_CALL_SEC,
+    )
+
+
+def start_run_deadline() -> RunDeadline:
+    global _DEADLINE
+    with _DEADLINE_LOCK:
+        _DEADLINE = _new_deadline()
+        return _DEADLINE
+
+
+def get_run_deadline() -> RunDeadline:
+    # 未显式 start 时（测试、单独调用分析函数）按进程内首次访问计时
+    global _DEADLINE
+    with _DEADLINE_LOCK:
+        if _DEADLINE is None:
+            _DEADLINE = _new_deadline()
+        return _DEADLINE
+
+
+def reset_run_deadline() -> None:
+    global _DEADLINE
+    with _DEADLINE_LOCK:
+        _DEADLINE = None
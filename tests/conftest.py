@@ -0,0 +1,22 @@
+class FakeClock:
+    # 可调的单调时钟：clock() 读当前时间，clock.sleep(n) 推进时间
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.now += seconds
+
+
+class FakeChatResponse:
+    # OpenAI 兼容的 chat/completions 成功响应
+    def __init__(self, content):
+        self.status_code = 200
+        self.headers = {}
+        self.text = ""
+        self._data = {"choices": [{"message": {"content": content}}]}
+
+    def json(self):
+        return self._data
@@ -0,0 +1,83 @@
+import os
+import sys
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import bitable_writer
+from bitable_writer import BatchRecordWriter
+
+
+def test_writer_flushes_by_count_and_maps_record_ids(monkeypatch):
+    calls = []
+
+    def fake_batch_create(app_token, table_id, token, records, timeout, retries):
+        calls.append(len(records))
+        return True, [f"rec_{r['k']}" for r in records]
+
+    monkeypatch.setattr(bitable_writer, "batch_create_bitable_records", fake_batch_create)
+    writer = BatchRecordWriter("app", "tbl", "t", 5, 1, batch_size=2, max_age_sec=0)
+    got = {}
+    for k in ("a", "b", "c"):
+        writer.add({"k": k}, lambda rid, k=k: got.__setitem__(k, rid))
+    assert calls == [2]
+    writer.close()
+    assert calls == [2, 1]
+    assert got == {"a": "rec_a", "b": "rec_b", "c": "rec_c"}
+
+
+def test_writer_splits_failed_batch(monkeypatch):
+    def fake_batch_create(app_token, table_id, token, records, timeout, retries):
+        if any(r["k"] == "bad" for r in records):
+            return False, []
+        return True, [f"rec_{r['k']}" for r in records]
+
+    monkeypatch.setattr(bitable_writer, "batch_create_bitable_records", fake_batch_create)
+    writer = BatchRecordWriter("app", "tbl", "t", 5, 1, batch_size=10, max_age_sec=0)
+    got = {}
+    for k in ("a", "bad", "c", "d"):
+        writer.add({"k": k}, lambda rid, k=k: got.__setitem__(k, rid))
+    writer.close()
+    assert got == {"a": "rec_a", "bad": None, "c": "rec_c", "d": "rec_d"}
+    assert writer.stats["rows_failed"] == 1
+    assert writer.stats["rows_ok"] == 3
+
+
+def test_writer_retries_whole_batch_on_rate_limit(monkeypatch):
+    calls = []
+
+    def fake_batch_create(app_token, table_id, token, records, timeout, retries):
+        calls.append(len(records))
+        if len(calls) == 1:
+            raise RuntimeError("[Feishu] batch create rejected: code=99991400")
+        return True, [f"rec_{r['k']}" for r in records]
+
+    monkeypatch.setattr(bitable_writer, "batch_create_bitable_records", fake_batch_create)
+    writer = BatchRecordWriter("app", "tbl", "t", 5, 3, batch_size=10, max_age_sec=0, backoff_sec=0)
+    got = {}
+    for k in ("a", "b", "c", "d"):
+        writer.add({"k": k}, lambda rid, k=k: got.__setitem__(k, rid))
+    writer.close()
+    assert calls == [4, 4]
+    assert writer.stats["splits"] == 0
+    assert writer.stats["backoffs"] == 1
+    assert got == {"a": "rec_a", "b": "rec_b", "c": "rec_c", "d": "rec_d"}
+
+
+def test_writer_fails_batches_without_splitting_during_outage(monkeypatch):
+    calls = []
+
+    def fake_batch_create(app_token, table_id, token, records, timeout, retries):
+        calls.append(len(records))
+        raise RuntimeError("HTTP POST failed after retries")
+
+    monkeypatch.setattr(bitable_writer, "batch_create_bitable_records", fake_batch_create)
+    writer = BatchRecordWriter("app", "tbl", "t", 5, 2, batch_size=2, max_age_sec=0, backoff_sec=0)
+    got = {}
+    for k in ("a", "b", "c", "d"):
+        writer.add({"k": k}, lambda rid, k=k: got.__setitem__(k, rid))
+    writer.close()
+    # 第一批退避重试一次后失败，之后的批次只请求一次
+    assert calls == [2, 2, 2]
+    assert writer.stats["splits"] == 0
+    assert writer.stats["rows_failed"] == 4
+    assert got == {"a": None, "b": None, "c": None, "d": None}
@@ -21,3 +21,11 @@ def test_defaults_keep_qwen_and_concurrency_defaults():
     cfg = reload_config({"LLM_PROVIDER": "nvidia"})
     assert cfg.LLM_CONCURRENCY == 4
     assert cfg.LLM_PROVIDER == "nvidia"
+
+
+def test_triage_threshold_capped_at_feishu_min_score():
+    cfg = reload_config({"LLM_TRIAGE_MIN_SCORE": "9"})
+    assert cfg.LLM_TRIAGE_MIN_SCORE == cfg.FEISHU_MIN_SCORE
+    cfg = reload_config({"LLM_TRIAGE_MIN_SCORE": "3"})
+    assert cfg.LLM_TRIAGE_MIN_SCORE == 3.0
+    reload_config({})
@@ -0,0 +1,67 @@
+import os
+import sqlite3
+import sys
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import dedup_index
+from dedup_index import ItemKeyIndex
+
+
+def test_index_persists_keys_and_watermark(tmp_path):
+    path = tmp_path / "keys.sqlite3"
+    index = ItemKeyIndex(str(path))
+    index.record("a")
+    index.add("b")
+    assert "a" in index and "b" in index
+    index.set_high_watermark(123)
+    index.close()
+
+    reopened = ItemKeyIndex(str(path))
+    assert "a" in reopened
+    # add 只在本轮内存中生效，不落盘
+    assert "b" not in reopened
+    assert reopened.high_watermark() == 123
+    reopened.close()
+
+
+def test_sync_is_incremental_from_watermark(tmp_path, monkeypatch):
+    calls = []
+
+    def fake_list(app_token, table_id, token, timeout, retries, **kwargs):
+        calls.append(kwargs.get("filter_obj"))
+        return [
+            {"fields": {"item_key": [{"text": "k1", "type": "text"}], "创建时间": 1000}},
+            {"fields": {"item_key": "k2", "创建时间": 5000}},
+        ]
+
+    monkeypatch.setattr(dedup_index, "list_bitable_records", fake_list)
+    index = ItemKeyIndex(str(tmp_path / "keys.sqlite3"))
+    assert index.sync("t") == 2
+    assert calls[0] is None
+    assert index.high_watermark() == 5000
+    assert index.sync("t") == 0
+    assert calls[1]["conditions"][0]["operator"] == "isGreater"
+    assert "k1" in index and "k2" in index
+    index.close()
+
+
+def test_recorded_keys_are_committed_in_batches(tmp_path):
+    path = str(tmp_path / "keys.sqlite3")
+
+    def saved():
+        conn = sqlite3.connect(path)
+        try:
+            return {row[0] for row in conn.execute("SELECT item_key FROM item_keys")}
+        finally:
+            conn.close()
+
+    index = ItemKeyIndex(path, commit_every=3)
+    index.record("a")
+    index.record("b")
+    assert saved() == set()
+    index.record("c")
+    assert saved() == {"a", "b", "c"}
+    index.record("d")
+    index.close()
+    assert saved() == {"a", "b", "c", "d"}
@@ -0,0 +1,67 @@
+import os
+import sys
+import threading
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import config
+import rss_ingest
+from embed_batcher import EmbeddingBatcher
+
+
+def test_batcher_merges_concurrent_requests():
+    calls = []
+
+    def embed_many(texts):
+        calls.append(list(texts))
+        return [[float(len(t))] for t in texts]
+
+    batcher = EmbeddingBatcher(embed_many, batch_size=4, max_wait_sec=1.0)
+    results = {}
+
+    def worker(text):
+        results[text] = batcher.embed(text)
+
+    threads = [threading.Thread(target=worker, args=("x" * n,)) for n in range(1, 9)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert sorted(len(c) for c in calls) == [4, 4]
+    assert all(results["x" * n] == [float(n)] for n in range(1, 9))
+    assert batcher.stats["requests"] == 2 and batcher.stats["texts"] == 8
+
+
+def test_batcher_flushes_partial_batch_after_wait():
+    batcher = EmbeddingBatcher(lambda texts: [None for _ in texts], batch_size=10, max_wait_sec=0.01)
+    assert batcher.embed("a") is None
+    assert batcher.stats["requests"] == 1
+
+
+def test_cf_embed_texts_chunks_in_order_and_falls_back(monkeypatch):
+    monkeypatch.setattr(config, "CF_EMBED_BATCH_SIZE", 2)
+    monkeypatch.setattr(config, "CF_EMBED_BATCH_MAX_CHARS", 1000)
+    posts = []
+
+    def fake_post(url, payload, timeout, retries):
+        texts = payload["text"]
+        posts.append(texts)
+        if "bad" in texts and len(texts) > 1:
+            raise RuntimeError("batch rejected")
+        if texts == ["bad"]:
+            raise RuntimeError("bad text")
+        return {"result": {"shape": [len(texts), 1], "data": [[float(len(t))] for t in texts]}}
+
+    monkeypatch.setattr(rss_ingest, "cf_post", fake_post)
+    vectors = rss_ingest.cf_embed_texts(["a", "bb", "", "ccc", "bad"], concurrency=2)
+
+    assert vectors == [[1.0], [2.0], None, [3.0], None]
+    assert ["a", "bb"] in posts and ["ccc", "bad"] in posts
+    assert ["ccc"] in posts and ["bad"] in posts
+
+
+def test_plan_embedding_chunks_respects_char_budget(monkeypatch):
+    monkeypatch.setattr(config, "CF_EMBED_BATCH_SIZE", 100)
+    monkeypatch.setattr(config, "CF_EMBED_BATCH_MAX_CHARS", 10)
+    assert rss_ingest.plan_embedding_chunks(["aaaa", "bbbb", "cccc", "d" * 20]) == [[0, 1], [2], [3]]
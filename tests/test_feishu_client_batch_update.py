@@ -0,0 +1,74 @@
+import os
+import sys
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import feishu_client
+
+
+def make_records(*ids):
+    return [{"record_id": rid, "fields": {"k": rid}} for rid in ids]
+
+
+def sent_ids(body):
+    return [r["record_id"] for r in body["records"]]
+
+
+def test_batch_update_splits_only_on_row_errors(monkeypatch):
+    calls = []
+
+    def fake_request(method, url, token, timeout, retries, json_body=None, params=None):
+        calls.append(sent_ids(json_body))
+        if "bad" in sent_ids(json_body):
+            return {"code": 1254045, "msg": "field error"}
+        return {"code": 0}
+
+    monkeypatch.setattr(feishu_client, "feishu_request", fake_request)
+    ok, failed = feishu_client.batch_update_bitable_records("app", "tbl", "t", make_records("a", "bad", "c", "d"), 5, 2)
+    assert (ok, failed) == (3, ["bad"])
+    assert calls[0] == ["a", "bad", "c", "d"]
+
+
+def test_batch_update_backs_off_on_rate_limit(monkeypatch):
+    calls = []
+    monkeypatch.setattr(feishu_client, "_sleep_backoff", lambda attempt: None)
+
+    def fake_request(method, url, token, timeout, retries, json_body=None, params=None):
+        calls.append(sent_ids(json_body))
+        return {"code": 99991400, "msg": "rate limited"} if len(calls) == 1 else {"code": 0}
+
+    monkeypatch.setattr(feishu_client, "feishu_request", fake_request)
+    ok, failed = feishu_client.batch_update_bitable_records("app", "tbl", "t", make_records("a", "b", "c"), 5, 3)
+    assert (ok, failed) == (3, [])
+    assert calls == [["a", "b", "c"], ["a", "b", "c"]]
+
+
+def test_batch_update_fails_whole_chunks_during_outage(monkeypatch):
+    calls = []
+    monkeypatch.setattr(feishu_client, "_sleep_backoff", lambda attempt: None)
+
+    def fake_request(method, url, token, timeout, retries, json_body=None, params=None):
+        calls.append(sent_ids(json_body))
+        raise RuntimeError("HTTP POST failed after retries")
+
+    monkeypatch.setattr(feishu_client, "feishu_request", fake_request)
+    records = make_records("a", "b", "c", "d")
+    ok, failed = feishu_client.batch_update_bitable_records("app", "tbl", "t", records, 5, 2, batch_size=2)
+    assert (ok, failed) == (0, ["a", "b", "c", "d"])
+    # 第一批退避重试一次，降级后第二批只请求一次，都不拆分
+    assert calls == [["a", "b"], ["a", "b"], ["c", "d"]]
+
+
+def test_bitable_throttle_codes_are_batch_level():
+    for code in (99991400, 1254290, 1254291, 99991663):
+        assert feishu_client.is_batch_level_error(code)
+    assert not feishu_client.is_batch_level_error(1254045)
+
+
+def test_batch_create_raises_on_bitable_throttle(monkeypatch):
+    monkeypatch.setattr(feishu_client, "feishu_request", lambda *args, **kwargs: {"code": 1254290, "msg": "TooManyRequest"})
+    try:
+        feishu_client.batch_create_bitable_records("app", "tbl", "t", [{"k": "a"}, {"k": "b"}], 5, 1)
+        assert False, "throttle should raise"
+    except RuntimeError as exc:
+        assert "1254290" in str(exc)
@@ -0,0 +1,44 @@
+import os
+import sys
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import feishu_client
+import rss_ingest
+
+
+class FakeResponse:
+    def json(self):
+        return {"code": 0, "data": {"items": [{"record_id": "r1", "fields": {"item_key": "k1"}}], "has_more": False}}
+
+
+def test_list_bitable_records_sends_projection(monkeypatch):
+    bodies = []
+
+    def fake_post(url, headers, body, timeout, retries):
+        bodies.append(body)
+        return FakeResponse()
+
+    monkeypatch.setattr(feishu_client, "http_post", fake_post)
+    records = feishu_client.list_bitable_records(
+        "app", "tbl", "token", 5, 0, field_names=["item_key"], automatic_fields=False
+    )
+    assert records[0]["record_id"] == "r1"
+    assert bodies[0]["field_names"] == ["item_key"]
+    assert bodies[0]["automatic_fields"] is False
+
+
+def test_list_bitable_records_without_projection(monkeypatch):
+    bodies = []
+    monkeypatch.setattr(feishu_client, "http_post", lambda url, headers, body, timeout, retries: bodies.append(body) or FakeResponse())
+    feishu_client.list_bitable_records("app", "tbl", "token", 5, 0)
+    assert "field_names" not in bodies[0]
+    assert "automatic_fields" not in bodies[0]
+
+
+def test_rss_read_field_names_skips_missing_columns(monkeypatch):
+    monkeypatch.setattr(rss_ingest, "RSS_OPTIONAL_FIELDS", {"etag"})
+    table_fields = {"name", "feed_url", "enabled", "failed_items", "description"}
+    names = rss_ingest.rss_read_field_names(table_fields)
+    assert names == ["name", "feed_url", "enabled", "failed_items", "etag"]
+    assert rss_ingest.rss_read_field_names(None) is None
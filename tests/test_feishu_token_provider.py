@@ -0,0 +1,80 @@
+import os
+import sys
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import feishu_client
+from feishu_client import TenantTokenProvider
+
+
+class FakeResponse:
+    def __init__(self, data):
+        self._data = data
+
+    def json(self):
+        return self._data
+
+
+def make_issuer(calls):
+    def fake_request(app_id, app_secret, timeout, retries):
+        calls.append(app_id)
+        return f"t{len(calls)}", 7200
+
+    return fake_request
+
+
+def test_provider_caches_until_margin(monkeypatch):
+    calls = []
+    monkeypatch.setattr(feishu_client, "request_tenant_access_token", make_issuer(calls))
+    provider = TenantTokenProvider("app", "secret", 5, 1, refresh_margin_sec=300)
+    assert provider.get() == "t1"
+    assert provider.get() == "t1"
+    assert calls == ["app"]
+
+    provider._expires_at = feishu_client.time.time() + 100
+    assert provider.get() == "t2"
+    assert provider.refreshes == 2
+
+
+def test_provider_file_cache(monkeypatch, tmp_path):
+    calls = []
+    monkeypatch.setattr(feishu_client, "request_tenant_access_token", make_issuer(calls))
+    path = tmp_path / "token.json"
+    TenantTokenProvider("app", "secret", 5, 1, cache_path=str(path)).get()
+
+    second = TenantTokenProvider("app", "secret", 5, 1, cache_path=str(path))
+    assert second.get() == "t1"
+    assert len(calls) == 1
+
+    other_app = TenantTokenProvider("other", "secret", 5, 1, cache_path=str(path))
+    assert other_app.get() == "t2"
+
+
+def test_request_retries_once_on_invalid_token(monkeypatch):
+    calls = []
+    monkeypatch.setattr(feishu_client, "request_tenant_access_token", make_issuer(calls))
+    seen = []
+
+    def fake_post(url, headers, body, timeout, retries):
+        seen.append(headers["Authorization"])
+        if len(seen) == 1:
+            return FakeResponse({"code": 99991663, "msg": "invalid access token"})
+        return FakeResponse({"code": 0, "data": {}})
+
+    monkeypatch.setattr(feishu_client, "http_post", fake_post)
+    provider = TenantTokenProvider("app", "secret", 5, 1)
+    ok = feishu_client.create_bitable_record("app_token", "tbl", provider, {"a": 1}, 5, 1)
+    assert ok is True
+    assert seen == ["Bearer t1", "Bearer t2"]
+
+
+def test_plain_string_token_is_not_retried(monkeypatch):
+    seen = []
+
+    def fake_post(url, headers, body, timeout, retries):
+        seen.append(headers["Authorization"])
+        return FakeResponse({"code": 99991663})
+
+    monkeypatch.setattr(feishu_client, "http_post", fake_post)
+    assert feishu_client.create_bitable_record("app_token", "tbl", "raw", {"a": 1}, 5, 1) is False
+    assert seen == ["Bearer raw"]
@@ -0,0 +1,50 @@
+import os
+import sys
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import http_pool
+
+
+def test_get_session_is_shared_per_host():
+    a = http_pool.get_session("https://open.feishu.cn/open-apis/x")
+    b = http_pool.get_session("https://OPEN.feishu.cn/other")
+    c = http_pool.get_session("https://api.cloudflare.com/client/v4")
+    assert a is b
+    assert a is not c
+    assert "gzip" in a.headers["Accept-Encoding"]
+
+
+class KeepAliveHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        body = b"ok"
+        self.send_response(200)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def test_connection_stats_counts_reused_keep_alive_connections():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), KeepAliveHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    url = f"http://127.0.0.1:{server.server_address[1]}/"
+    try:
+        before = http_pool.connection_stats()
+        for _ in range(5):
+            assert http_pool.get(url, timeout=5).text == "ok"
+        after = http_pool.connection_stats()
+    finally:
+        server.shutdown()
+        server.server_close()
+        http_pool.close_all()
+    assert after["requests"] - before["requests"] == 5
+    assert after["new"] - before["new"] == 1
+    assert after["reused"] - before["reused"] == 4
@@ -0,0 +1,33 @@
+import os
+import sys
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from json_repair import repair_json, repair_json_detail
+
+
+def test_repair_trailing_commas_and_wrapper_text():
+    raw = '结果如下：\n```json\n{"score": 7, "categories": ["AI",], }\n```'
+    assert repair_json(raw) == {"score": 7, "categories": ["AI"]}
+
+
+def test_repair_unescaped_quotes_and_newlines_in_strings():
+    raw = '{"summary": "他说"你好"吧\n第二行", "score": 1}'
+    assert repair_json(raw) == {"summary": '他说"你好"吧\n第二行', "score": 1}
+
+
+def test_repair_truncated_output():
+    assert repair_json('{"score": 7, "points": ["a", "b') == {"score": 7, "points": ["a", "b"]}
+    assert repair_json('{"score": 7, "points": ["a"], "title_zh": ') == {"score": 7, "points": ["a"]}
+    assert repair_json('[{"id": "1", "score": 3}, {"id": "2", "sc') == [{"id": "1", "score": 3}, {"id": "2"}]
+
+
+def test_repair_detail_flags_truncated_output():
+    assert repair_json_detail('{"score": 7, "categories": ["AI",], }') == ({"score": 7, "categories": ["AI"]}, False)
+    assert repair_json_detail('{"score": 8, "one_liner": "截断的一') == ({"score": 8, "one_liner": "截断的一"}, True)
+    assert repair_json_detail('[{"id": "1"}, {"id": "2"') == ([{"id": "1"}, {"id": "2"}], True)
+
+
+def test_repair_gives_up_without_json():
+    assert repair_json("no json here") is None
+    assert repair_json("") is None
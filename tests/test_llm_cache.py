@@ -0,0 +1,79 @@
+import os
+import sys
+import threading
+import time
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import llm_cache
+from llm_cache import AnalysisCache, analysis_cache_key
+
+
+def test_cache_key_normalizes_content_and_tracks_prompt_and_model():
+    base = analysis_cache_key("Hello  World", "Body\n text", "prompt", "nvidia", "m1")
+    assert analysis_cache_key(" hello world ", "body text", "prompt", "nvidia", "m1") == base
+    assert analysis_cache_key("Hello World", "Body text", "prompt v2", "nvidia", "m1") != base
+    assert analysis_cache_key("Hello World", "Body text", "prompt", "nvidia", "m2") != base
+
+
+def test_get_or_compute_hits_after_store(tmp_path):
+    cache = AnalysisCache(str(tmp_path / "llm.sqlite3"), ttl_sec=3600, max_entries=100)
+    calls = []
+
+    def compute():
+        calls.append(1)
+        return {"score": 7.5, "categories": ["AI"]}
+
+    assert cache.get_or_compute("k", compute)["score"] == 7.5
+    assert cache.get_or_compute("k", compute)["score"] == 7.5
+    assert len(calls) == 1
+    assert cache.stats["hit"] == 1 and cache.stats["miss"] == 1
+    cache.close()
+
+    reopened = AnalysisCache(str(tmp_path / "llm.sqlite3"), ttl_sec=3600, max_entries=100)
+    assert reopened.get("k") == {"score": 7.5, "categories": ["AI"]}
+
+
+def test_failed_results_are_not_stored(tmp_path):
+    cache = AnalysisCache(str(tmp_path / "llm.sqlite3"), ttl_sec=3600, max_entries=100)
+    result = cache.get_or_compute("k", lambda: {"categories": ["调用失败"]}, lambda r: False)
+    assert result == {"categories": ["调用失败"]}
+    assert cache.get("k") is None
+
+
+def test_ttl_and_size_eviction(tmp_path, monkeypatch):
+    cache = AnalysisCache(str(tmp_path / "llm.sqlite3"), ttl_sec=10, max_entries=2)
+    now = [1000.0]
+    monkeypatch.setattr(llm_cache.time, "time", lambda: now[0])
+    for key in ("a", "b", "c"):
+        cache.put(key, {"key": key})
+        now[0] += 1
+    assert cache.evict() == 1
+    assert cache.get("a") is None
+    now[0] += 20
+    assert cache.get("b") is None
+    assert len(cache) == 1
+
+
+def test_concurrent_identical_requests_coalesce(tmp_path):
+    cache = AnalysisCache(str(tmp_path / "llm.sqlite3"), ttl_sec=3600, max_entries=100)
+    calls = []
+    started = threading.Event()
+
+    def compute():
+        calls.append(1)
+        started.set()
+        time.sleep(0.2)
+        return {"score": 8}
+
+    results = []
+    owner = threading.Thread(target=lambda: results.append(cache.get_or_compute("k", compute)))
+    owner.start()
+    started.wait(1)
+    follower = threading.Thread(target=lambda: results.append(cache.get_or_compute("k", compute)))
+    follower.start()
+    owner.join()
+    follower.join()
+    assert results == [{"score": 8}, {"score": 8}]
+    assert len(calls) == 1
+    assert cache.stats["coalesced"] == 1
@@ -0,0 +1,79 @@
+import os
+import sys
+import threading
+import time
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from llm_concurrency import OUTCOME_ERROR, OUTCOME_OK, OUTCOME_OVERLOAD, AIMDController
+from conftest import FakeClock
+
+
+def make(initial=4, min_limit=1, max_limit=8, clock=None):
+    logs = []
+    controller = AIMDController("p", initial, min_limit, max_limit, clock=clock or FakeClock(), log=logs.append)
+    return controller, logs
+
+
+def run_ok(controller, count, latency=1.0):
+    for _ in range(count):
+        controller.acquire()
+        controller.release(OUTCOME_OK, latency)
+
+
+def test_additive_increase_bounded_by_max():
+    controller, logs = make(initial=2, max_limit=4)
+    run_ok(controller, 2)
+    assert controller.current == 2
+    run_ok(controller, 1)
+    assert controller.current == 3
+    run_ok(controller, 50)
+    assert controller.current == 4
+    assert controller.stats["increases"] == 2
+    assert logs and "2 -> 3" in logs[0]
+
+
+def test_multiplicative_decrease_with_cooldown_and_floor():
+    clock = FakeClock()
+    controller, _ = make(initial=8, min_limit=2, clock=clock)
+    clock.now = 10.0
+    controller.acquire()
+    controller.release(OUTCOME_OVERLOAD, 1.0)
+    assert controller.current == 4
+    controller.acquire()
+    controller.release(OUTCOME_OVERLOAD, 1.0)
+    assert controller.current == 4
+    clock.now = 20.0
+    controller.acquire()
+    controller.release(OUTCOME_OVERLOAD, 1.0)
+    clock.now = 30.0
+    controller.acquire()
+    controller.release(OUTCOME_OVERLOAD, 1.0)
+    assert controller.current == 2
+
+
+def test_errors_and_slow_latency_do_not_grow():
+    controller, _ = make(initial=2)
+    controller.acquire()
+    controller.release(OUTCOME_ERROR, 1.0)
+    run_ok(controller, 1, latency=1.0)
+    run_ok(controller, 20, latency=10.0)
+    assert controller.current == 2
+
+
+def test_acquire_blocks_at_limit():
+    controller, _ = make(initial=1, max_limit=1)
+    controller.acquire()
+    entered = threading.Event()
+
+    def worker():
+        controller.acquire()
+        entered.set()
+
+    thread = threading.Thread(target=worker)
+    thread.start()
+    time.sleep(0.05)
+    assert not entered.is_set()
+    controller.release(OUTCOME_OK, 1.0)
+    thread.join(1)
+    assert entered.is_set()
@@ -0,0 +1,174 @@
+import os
+import sys
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import config
+import rate_limiter
+import rss_ingest
+from llm_providers import PROVIDERS, TASK_FEATURED, TASK_SUMMARY
+
+
+class FakeResponse:
+    def __init__(self, status_code, data=None, headers=None, text=""):
+        self.status_code = status_code
+        self._data = data or {}
+        self.headers = headers or {}
+        self.text = text
+
+    def json(self):
+        return self._data
+
+
+def test_every_provider_is_registered():
+    assert set(PROVIDERS) == {"gemini", "iflow", "openai", "deepseek", "zhipu", "nvidia"}
+
+
+def test_nvidia_adapter_payload_and_think_stripping():
+    adapter = PROVIDERS["nvidia"]
+    summary = adapter.build_payload("p", adapter.model(TASK_SUMMARY), TASK_SUMMARY)
+    featured = adapter.build_payload("p", adapter.model(TASK_FEATURED), TASK_FEATURED)
+    assert summary["max_tokens"] == 4096
+    assert "max_tokens" not in featured
+    text = adapter.parse_text({"choices": [{"message": {"content": "<think>x</think>{\"score\": 1}"}}]})
+    assert text == '{"score": 1}'
+
+
+def test_openai_and_gemini_parse_text():
+    assert PROVIDERS["openai"].parse_text({"output": [{"content": [{"text": "a"}, {"text": "b"}]}]}) == "ab"
+    data = {"candidates": [{"content": {"parts": [{"text": "x"}, {"text": "y"}]}}]}
+    assert PROVIDERS["gemini"].parse_text(data) == "xy"
+
+
+def test_engine_retries_rate_limit_then_parses(monkeypatch):
+    monkeypatch.setattr(config, "DEEPSEEK_API_KEY", "k")
+    monkeypatch.setattr(config, "DEEPSEEK_RETRIES", 3)
+    monkeypatch.setattr(rss_ingest.time, "sleep", lambda s: None)
+    rate_limiter.reset_limiters()
+    responses = [
+        FakeResponse(429, headers={"Retry-After": "0"}),
+        FakeResponse(200, {"choices": [{"message": {"content": '{"score": 7, "categories": ["AI"]}'}}]}),
+    ]
+    monkeypatch.setattr(rss_ingest.http_pool, "post", lambda url, **kwargs: responses.pop(0))
+    result = rss_ingest.analyze_with_deepseek({"title": "t", "content": "c"})
+    assert result["score"] == 7
+    assert not responses
+    assert rate_limiter.limiter_stats()["deepseek"]["throttled"] == 1
+
+
+def test_engine_missing_key_and_exhausted(monkeypatch):
+    monkeypatch.setattr(rss_ingest, "notify_root_cause", lambda *args, **kwargs: None)
+    monkeypatch.setattr(config, "ZHIPU_API_KEY", "")
+    assert rss_ingest.analyze_with_zhipu({"title": "t"})["summary"] == "missing ZHIPU_API_KEY"
+
+    monkeypatch.setattr(config, "ZHIPU_API_KEY", "k")
+    monkeypatch.setattr(config, "ZHIPU_RETRIES", 2)
+    monkeypatch.setattr(rss_ingest.time, "sleep", lambda s: None)
+
+    def boom(url, **kwargs):
+        raise RuntimeError("connection reset")
+
+    monkeypatch.setattr(rss_ingest.http_pool, "post", boom)
+    result = rss_ingest.analyze_with_zhipu({"title": "t"})
+    assert result["categories"] == ["调用异常"]
+    assert result["summary"] == "connection reset"
+
+
+def test_json_mode_payloads():
+    gemini = PROVIDERS["gemini"].build_payload("p", "m", TASK_SUMMARY)
+    assert PROVIDERS["gemini"].enable_json_mode(gemini)
+    assert gemini["generationConfig"]["responseMimeType"] == "application/json"
+    deepseek = PROVIDERS["deepseek"].build_payload("p", "m", TASK_SUMMARY)
+    assert PROVIDERS["deepseek"].enable_json_mode(deepseek)
+    assert deepseek["response_format"] == {"type": "json_object"}
+    nvidia = PROVIDERS["nvidia"].build_payload("p", "m", TASK_SUMMARY)
+    assert not PROVIDERS["nvidia"].enable_json_mode(nvidia)
+    assert "response_format" not in nvidia
+
+
+FULL_FIELDS = '"title_zh": "标题", "one_liner": "一句话", "points": ["要点"]'
+
+
+def test_broken_json_repaired_locally_then_by_fix_call(monkeypatch):
+    monkeypatch.setattr(config, "DEEPSEEK_API_KEY", "k")
+    monkeypatch.setattr(config, "ENABLE_LLM_JSON_FIX", True)
+    monkeypatch.setattr(rss_ingest, "notify_root_cause", lambda *args, **kwargs: None)
+    rss_ingest.LLM_PARSE_STATS.clear()
+    sent = []
+    responses = [
+        FakeResponse(200, {"choices": [{"message": {"content": '{"score": 7, "categories": ["AI",], ' + FULL_FIELDS + ",}"}}]}),
+        FakeResponse(200, {"choices": [{"message": {"content": "score seven, AI"}}]}),
+        FakeResponse(200, {"choices": [{"message": {"content": '{"score": 5, "categories": ["AI"], ' + FULL_FIELDS + "}"}}]}),
+    ]
+
+    def fake_post(url, **kwargs):
+        sent.append(kwargs["json"])
+        return responses.pop(0)
+
+    monkeypatch.setattr(rss_ingest.http_pool, "post", fake_post)
+    assert rss_ingest.analyze_with_deepseek({"title": "t", "content": "c"})["score"] == 7
+    assert rss_ingest.analyze_with_deepseek({"title": "t", "content": "c"})["score"] == 5
+    assert sent[0]["response_format"] == {"type": "json_object"}
+    assert sent[2]["messages"][0]["content"].startswith(rss_ingest.JSON_FIX_PROMPT)
+    stats = rss_ingest.LLM_PARSE_STATS["deepseek"]
+    assert (stats["local_repaired"], stats["llm_repaired"], stats["failed"]) == (1, 1, 0)
+
+
+def test_truncated_output_is_not_accepted_as_analysis(monkeypatch):
+    monkeypatch.setattr(config, "DEEPSEEK_API_KEY", "k")
+    monkeypatch.setattr(config, "ENABLE_LLM_JSON_FIX", False)
+    monkeypatch.setattr(rss_ingest, "notify_root_cause", lambda *args, **kwargs: None)
+    rss_ingest.LLM_PARSE_STATS.clear()
+    truncated = '{"score": 8, "categories": ["AI"], "title_zh": "完整标题", "one_liner": "截断的一'
+    monkeypatch.setattr(
+        rss_ingest.http_pool,
+        "post",
+        lambda url, **kwargs: FakeResponse(200, {"choices": [{"message": {"content": truncated}}]}),
+    )
+    analysis = rss_ingest.analyze_with_deepseek({"title": "t", "content": "c"})
+    assert not rss_ingest.is_cacheable_analysis(analysis)
+    stats = rss_ingest.LLM_PARSE_STATS["deepseek"]
+    assert (stats["local_repaired"], stats["failed"]) == (0, 1)
+
+
+def test_rejected_json_mode_falls_back_to_plain_request(monkeypatch):
+    monkeypatch.setattr(config, "ZHIPU_API_KEY", "k")
+    rss_ingest.JSON_MODE_REJECTED.discard("zhipu")
+    sent = []
+    responses = [
+        FakeResponse(400, text='{"error": {"message": "response_format type json_object is not supported"}}'),
+        FakeResponse(200, {"choices": [{"message": {"content": '{"score": 3, "categories": []}'}}]}),
+    ]
+
+    def fake_post(url, **kwargs):
+        sent.append(kwargs["json"])
+        return responses.pop(0)
+
+    monkeypatch.setattr(rss_ingest.http_pool, "post", fake_post)
+    try:
+        assert rss_ingest.analyze_with_zhipu({"title": "t", "content": "c"})["score"] == 3
+    finally:
+        rss_ingest.JSON_MODE_REJECTED.discard("zhipu")
+    assert "response_format" in sent[0]
+    assert "response_format" not in sent[1]
+
+
+def test_unrelated_error_keeps_json_mode(monkeypatch):
+    monkeypatch.setattr(config, "ZHIPU_API_KEY", "k")
+    monkeypatch.setattr(rss_ingest, "notify_root_cause", lambda *args, **kwargs: None)
+    rss_ingest.JSON_MODE_REJECTED.discard("zhipu")
+    sent = []
+    responses = [FakeResponse(400, text='{"error": {"message": "prompt too long"}}'), FakeResponse(404, text="not found")]
+
+    def fake_post(url, **kwargs):
+        sent.append(kwargs["json"])
+        return responses.pop(0)
+
+    monkeypatch.setattr(rss_ingest.http_pool, "post", fake_post)
+    adapter = PROVIDERS["zhipu"]
+    for _ in range(2):
+        text, status, _ = rss_ingest.run_llm_request(adapter, "p", TASK_SUMMARY, json_mode=True)
+        assert (text, status) == (None, "bad_status")
+    assert "zhipu" not in rss_ingest.JSON_MODE_REJECTED
+    assert len(sent) == 2
+    assert all("response_format" in payload for payload in sent)
@@ -0,0 +1,51 @@
+import os
+import sys
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from queue_policy import (
+    apply_schedule_policy,
+    load_queue_record,
+    resolve_schedule_policy,
+    simulate_drain,
+    write_queue_record,
+)
+
+
+def make_item(key, source_id, length):
+    return {"item_key": key, "source_id": source_id, "article": {"title": "", "content": "x" * length}}
+
+
+def keys(queue):
+    return [item["item_key"] for item in queue]
+
+
+def test_round_robin_interleaves_sources_keeping_order():
+    queue = [make_item("a1", "a", 1), make_item("a2", "a", 1), make_item("a3", "a", 1), make_item("b1", "b", 1)]
+    assert keys(apply_schedule_policy(queue, "round_robin")) == ["a1", "b1", "a2", "a3"]
+
+
+def test_lpt_puts_longest_first_and_unknown_falls_back():
+    queue = [make_item("short", "a", 10), make_item("long", "a", 1000), make_item("mid", "b", 100)]
+    assert keys(apply_schedule_policy(queue, "lpt")) == ["long", "mid", "short"]
+    assert resolve_schedule_policy("nope") == "priority"
+    assert keys(apply_schedule_policy(queue, "nope")) == ["short", "long", "mid"]
+
+
+def test_simulated_drain_prefers_lpt_makespan_and_round_robin_fairness():
+    queue = [make_item(f"a{i}", "a", 10) for i in range(6)] + [make_item("b", "b", 10), make_item("big", "c", 60)]
+
+    def cost(item):
+        return len(item["article"]["content"])
+
+    fifo = simulate_drain(queue, 2, cost)
+    lpt = simulate_drain(apply_schedule_policy(queue, "lpt"), 2, cost)
+    rr = simulate_drain(apply_schedule_policy(queue, "round_robin"), 2, cost)
+    assert lpt["makespan"] < fifo["makespan"]
+    assert rr["max_source_first"] < fifo["max_source_first"]
+
+
+def test_queue_record_round_trip_sorted_by_rank(tmp_path):
+    path = tmp_path / "queue.jsonl"
+    write_queue_record(str(path), [{"rank": 1, "item_key": "b"}, {"rank": 0, "item_key": "a"}])
+    assert keys(load_queue_record(str(path))) == ["a", "b"]
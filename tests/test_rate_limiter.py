@@ -0,0 +1,55 @@
+import os
+import sys
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from rate_limiter import ProviderRateLimiter, parse_reset_duration, parse_retry_after
+from conftest import FakeClock
+
+
+def test_parse_headers():
+    assert parse_retry_after("3") == 3.0
+    assert parse_retry_after("Wed, 21 Oct 2015 07:28:00 GMT", now=1445412470.0) == 10.0
+    assert parse_retry_after("soon") is None
+    assert parse_reset_duration("6m0s") == 360.0
+    assert parse_reset_duration("20ms") == 0.02
+    assert parse_reset_duration("1h2m3.5s") == 3723.5
+
+
+def test_request_bucket_spaces_out_calls():
+    clock = FakeClock()
+    limiter = ProviderRateLimiter("p", rpm=60, clock=clock, sleep=clock.sleep)
+    waits = [limiter.acquire() for _ in range(12)]
+    # 60 rpm 允许 10 秒的突发，之后每秒一次
+    assert waits[:10] == [0.0] * 10
+    assert waits[10] == 1.0 and waits[11] == 1.0
+    assert limiter.stats["wait_sec"] == 2.0
+
+
+def test_token_bucket_limits_large_requests():
+    clock = FakeClock()
+    limiter = ProviderRateLimiter("p", tpm=6000, clock=clock, sleep=clock.sleep)
+    assert limiter.acquire(1000) == 0.0
+    assert limiter.acquire(1000) == 10.0
+
+
+def test_429_pauses_everyone_and_honors_retry_after():
+    clock = FakeClock()
+    limiter = ProviderRateLimiter("p", clock=clock, sleep=clock.sleep)
+    assert limiter.observe(429, {"Retry-After": "7"}) == 7.0
+    assert limiter.acquire() == 7.0
+    assert limiter.stats["throttled"] == 1
+
+    limiter.observe(200, {})
+    assert limiter.observe(429, {}) == 2.0
+    assert limiter.observe(429, {}) == 4.0
+    limiter.observe(200, {})
+    assert limiter.observe(429, {}) == 2.0
+
+
+def test_remaining_zero_pauses_until_reset():
+    clock = FakeClock()
+    limiter = ProviderRateLimiter("p", clock=clock, sleep=clock.sleep)
+    delay = limiter.observe(200, {"x-ratelimit-remaining-requests": "0", "x-ratelimit-reset-requests": "1.5s"})
+    assert delay == 1.5
+    assert limiter.acquire() == 1.5
@@ -0,0 +1,169 @@
+import json
+import os
+import sys
+import threading
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import config
+import rss_ingest
+from llm_cache import AnalysisCache
+
+
+def make_item(title, content="x"):
+    return {"article": {"title": title, "content": content}}
+
+
+def test_plan_llm_batches_respects_count_and_token_budget(monkeypatch):
+    monkeypatch.setattr(config, "ENABLE_LLM_BATCH", True)
+    monkeypatch.setattr(config, "LLM_BATCH_MAX_ITEMS", 3)
+    overhead = rss_ingest.estimate_tokens(rss_ingest.SYSTEM_PROMPT)
+    monkeypatch.setattr(config, "LLM_BATCH_MAX_TOKENS", overhead + 200)
+    queue = [make_item(f"t{i}") for i in range(5)] + [make_item("long", "y" * 4000)]
+    batches = rss_ingest.plan_llm_batches(queue)
+    assert [len(b) for b in batches] == [3, 2, 1]
+
+    monkeypatch.setattr(config, "ENABLE_LLM_BATCH", False)
+    assert [len(b) for b in rss_ingest.plan_llm_batches(queue)] == [1] * 6
+
+
+def full(**element):
+    element.update({"title_zh": "标题", "one_liner": "一句话", "points": ["要点"]})
+    return element
+
+
+def test_parse_batch_results_maps_ids_and_skips_bad_elements():
+    raw = json.dumps(
+        [
+            full(id="2", score=7, categories=["AI新闻"]),
+            full(id=1, score=5, categories=["AI工具"]),
+            full(id="3", categories=["AI工具"]),
+            {"id": "3", "score": 4, "categories": ["AI工具"]},
+            full(id="9", score=1, categories=[]),
+        ]
+    )
+    results = rss_ingest.parse_batch_results("```json\n" + raw + "\n```", 3)
+    assert set(results) == {0, 1}
+    assert results[1]["score"] == 7
+    assert "id" not in results[0]
+    assert rss_ingest.parse_batch_results("not json", 2) == {}
+
+
+def test_parse_batch_results_drops_truncated_last_element():
+    first = json.dumps(full(id="1", score=5, categories=["AI工具"]), ensure_ascii=False)
+    raw = "[" + first + ', {"id": "2", "score": 7, "categories": ["AI新闻"], "title_zh": "标题二", "one_liner": "被截'
+    assert set(rss_ingest.parse_batch_results(raw, 2)) == {0}
+    # 截断恰好落在元素之间时，最后一个完整元素同样不可信
+    second = json.dumps(full(id="2", score=7, categories=["AI新闻"]), ensure_ascii=False)
+    assert set(rss_ingest.parse_batch_results("[" + first + ", " + second, 2)) == {0}
+
+
+def test_analyze_articles_falls_back_per_item(monkeypatch):
+    monkeypatch.setattr(rss_ingest, "LLM_CACHE", None)
+    monkeypatch.setattr(
+        rss_ingest,
+        "analyze_batch_with_provider",
+        lambda adapter, articles: ({0: {"score": 8, "categories": ["AI新闻"]}}, None),
+    )
+    singles = []
+
+    def fake_single(article):
+        singles.append(article["title"])
+        return {"score": 3, "categories": ["AI工具"]}
+
+    monkeypatch.setattr(rss_ingest, "analyze_with_llm", fake_single)
+    results = rss_ingest.analyze_articles([{"title": "a"}, {"title": "b"}])
+    assert results[0]["score"] == 8
+    assert results[1]["score"] == 3
+    assert singles == ["b"]
+
+
+def test_failed_batch_request_is_not_resent_per_article(monkeypatch):
+    monkeypatch.setattr(rss_ingest, "LLM_CACHE", None)
+    monkeypatch.setattr(config, "ENABLE_LLM_CASCADE", False)
+    monkeypatch.setattr(config, "NVIDIA_API_KEY", "k")
+    monkeypatch.setattr(config, "LLM_PROVIDER", "nvidia")
+    requests_sent = []
+
+    def fake_request(adapter, prompt, task="", service="", json_mode=False, model=""):
+        requests_sent.append(prompt)
+        return None, "exhausted", "HTTP 429"
+
+    monkeypatch.setattr(rss_ingest, "run_llm_request", fake_request)
+    results = rss_ingest.analyze_articles([{"title": "a"}, {"title": "b"}, {"title": "c"}])
+    assert len(requests_sent) == 1
+    assert [r["categories"] for r in results] == [["调用异常"]] * 3
+    assert not any(rss_ingest.is_cacheable_analysis(r) for r in results)
+
+    def deadline_request(adapter, prompt, task="", service="", json_mode=False, model=""):
+        return None, "deadline", ""
+
+    monkeypatch.setattr(rss_ingest, "run_llm_request", deadline_request)
+    results = rss_ingest.analyze_articles([{"title": "a"}, {"title": "b"}])
+    assert [r["categories"] for r in results] == [[rss_ingest.DEADLINE_CATEGORY]] * 2
+
+
+def test_batch_fallback_counts_one_miss_and_keeps_keys_apart(monkeypatch, tmp_path):
+    cache = AnalysisCache(str(tmp_path / "cache.sqlite3"), ttl_sec=0, max_entries=0)
+    monkeypatch.setattr(rss_ingest, "LLM_CACHE", cache)
+    monkeypatch.setattr(config, "ENABLE_LLM_CASCADE", False)
+    monkeypatch.setattr(
+        rss_ingest,
+        "analyze_batch_with_provider",
+        lambda adapter, articles: ({0: {"score": 8, "categories": ["AI新闻"]}}, None),
+    )
+    monkeypatch.setattr(rss_ingest, "analyze_with_llm", lambda article: {"score": 3, "categories": ["AI工具"]})
+    a, b = {"title": "a", "content": "x"}, {"title": "b", "content": "y"}
+    try:
+        rss_ingest.analyze_articles([a, b])
+        assert cache.stats["miss"] == 2
+        # 批量结果只存在批量提示词的 key 下，单篇回退结果存在单篇 key 下
+        assert cache.get(rss_ingest.article_cache_key(a)) is None
+        assert cache.get(rss_ingest.article_cache_key(a, batched=True))["score"] == 8
+        assert cache.get(rss_ingest.article_cache_key(b))["score"] == 3
+
+        assert [r["score"] for r in rss_ingest.analyze_articles([a, b])] == [8, 3]
+        assert (cache.stats["hit"], cache.stats["miss"]) == (2, 2)
+    finally:
+        cache.close()
+
+
+def test_identical_articles_in_concurrent_batches_are_analyzed_once(monkeypatch, tmp_path):
+    cache = AnalysisCache(str(tmp_path / "cache.sqlite3"), ttl_sec=0, max_entries=0)
+    monkeypatch.setattr(rss_ingest, "LLM_CACHE", cache)
+    monkeypatch.setattr(config, "ENABLE_LLM_CASCADE", False)
+    in_batch = threading.Event()
+    second_started = threading.Event()
+    batches = []
+    singles = []
+
+    def fake_batch(adapter, articles):
+        batches.append([a["title"] for a in articles])
+        in_batch.set()
+        # 第二个批次认领完 key 后才返回，保证两边的分析确实重叠
+        second_started.wait(timeout=2)
+        return {pos: {"score": 8, "categories": ["AI新闻"]} for pos in range(len(articles))}, None
+
+    def fake_single(article):
+        singles.append(article["title"])
+        second_started.set()
+        return {"score": 3, "categories": ["AI工具"]}
+
+    monkeypatch.setattr(rss_ingest, "analyze_batch_with_provider", fake_batch)
+    monkeypatch.setattr(rss_ingest, "analyze_with_llm", fake_single)
+    a, b, c = {"title": "a", "content": "x"}, {"title": "b", "content": "y"}, {"title": "c", "content": "z"}
+    results = {}
+    first = threading.Thread(target=lambda: results.update(first=rss_ingest.analyze_articles([a, b])))
+    second = threading.Thread(target=lambda: results.update(second=rss_ingest.analyze_articles([a, c])))
+    try:
+        first.start()
+        assert in_batch.wait(timeout=2)
+        second.start()
+        first.join(timeout=5)
+        second.join(timeout=5)
+        assert batches == [["a", "b"]]
+        assert singles == ["c"]
+        assert [r["score"] for r in results["second"]] == [8, 3]
+        assert cache.stats["coalesced"] == 1
+    finally:
+        cache.close()
@@ -0,0 +1,49 @@
+import os
+import sys
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import config
+import rss_ingest
+from conftest import FakeChatResponse
+
+
+def setup_cascade(monkeypatch, triage_scores):
+    monkeypatch.setattr(config, "ENABLE_LLM_CASCADE", True)
+    monkeypatch.setattr(config, "LLM_PROVIDER", "deepseek")
+    monkeypatch.setattr(config, "LLM_TRIAGE_PROVIDER", "deepseek")
+    monkeypatch.setattr(config, "LLM_TRIAGE_MODEL", "cheap-model")
+    monkeypatch.setattr(config, "LLM_TRIAGE_MIN_SCORE", 5.0)
+    monkeypatch.setattr(config, "DEEPSEEK_API_KEY", "k")
+    monkeypatch.setattr(rss_ingest, "LLM_CACHE", None)
+    for key in rss_ingest.CASCADE_STATS:
+        rss_ingest.CASCADE_STATS[key] = 0
+    calls = []
+
+    def fake_post(url, **kwargs):
+        payload = kwargs["json"]
+        calls.append(payload["model"])
+        if payload["model"] == "cheap-model":
+            return FakeChatResponse('{"score": %s, "categories": ["AI新闻"]}' % triage_scores.pop(0))
+        return FakeChatResponse('{"score": 8, "categories": ["AI新闻"], "title_zh": "t", "points": ["p"]}')
+
+    monkeypatch.setattr(rss_ingest.http_pool, "post", fake_post)
+    return calls
+
+
+def test_cascade_rejects_low_scores_without_expensive_call(monkeypatch):
+    calls = setup_cascade(monkeypatch, [2.5, 7.0])
+    low = rss_ingest.analyze_with_llm({"title": "gossip", "content": "x"})
+    high = rss_ingest.analyze_with_llm({"title": "launch", "content": "y"})
+    assert low["score"] == 2.5 and low["stage"] == "triage"
+    assert high["score"] == 8 and high["title_zh"] == "t"
+    assert calls == ["cheap-model", "cheap-model", config.DEEPSEEK_MODEL]
+    assert rss_ingest.CASCADE_STATS == {"triaged": 2, "rejected": 1, "passed": 1, "triage_failed": 0}
+
+
+def test_cascade_in_batch_triages_each_article_once(monkeypatch):
+    calls = setup_cascade(monkeypatch, [1.0, 9.0, 3.0])
+    out = rss_ingest.analyze_articles([{"title": "a"}, {"title": "b"}, {"title": "c"}])
+    assert [item["score"] for item in out] == [1.0, 8, 3.0]
+    assert calls.count("cheap-model") == 3
+    assert calls.count(config.DEEPSEEK_MODEL) == 1
@@ -0,0 +1,28 @@
+import os
+import sys
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import rss_ingest
+
+
+def test_filter_queue_by_search_chunks_candidates(monkeypatch):
+    seen_chunks = []
+
+    def fake_list(app_token, table_id, token, timeout, retries, **kwargs):
+        conditions = kwargs["filter_obj"]["conditions"]
+        assert kwargs["filter_obj"]["conjunction"] == "or"
+        keys = [c["value"][0] for c in conditions]
+        seen_chunks.append(keys)
+        return [{"fields": {"item_key": k}} for k in keys if k in {"k1", "k4"}]
+
+    monkeypatch.setattr(rss_ingest, "list_bitable_records", fake_list)
+    monkeypatch.setattr(rss_ingest.config, "DEDUP_SEARCH_CHUNK", 2)
+    queue = [{"item_key": f"k{i}"} for i in range(5)]
+    existing = set()
+    stats = {}
+    kept = rss_ingest.filter_queue_by_search(queue, existing, "t", stats)
+    assert [i["item_key"] for i in kept] == ["k0", "k2", "k3"]
+    assert existing == {"k1", "k4"}
+    assert stats["dedup_search_hits"] == 2
+    assert sorted(len(c) for c in seen_chunks) == [1, 2, 2]
@@ -0,0 +1,82 @@
+import os
+import sys
+import threading
+import time
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import rss_ingest
+
+
+def test_fetch_sources_parallel_keeps_order_and_host_limit(monkeypatch):
+    active = {}
+    peak = {}
+    lock = threading.Lock()
+
+    def fake_fetch_feed(url, timeout, retries, headers=None, etag="", modified=""):
+        host = rss_ingest.feed_host(url)
+        with lock:
+            active[host] = active.get(host, 0) + 1
+            peak[host] = max(peak.get(host, 0), active[host])
+        time.sleep(0.02)
+        with lock:
+            active[host] -= 1
+        if url.endswith("bad"):
+            raise RuntimeError("HTTP 500")
+        return {"url": url}
+
+    monkeypatch.setattr(rss_ingest, "fetch_feed", fake_fetch_feed)
+    monkeypatch.setattr(rss_ingest.config, "FETCH_CONCURRENCY", 8)
+    monkeypatch.setattr(rss_ingest.config, "FETCH_PER_HOST_LIMIT", 2)
+    urls = [f"https://a.example.com/{i}" for i in range(6)] + ["https://b.example.com/bad"]
+    sources = [{"feed_url": u, "record_id": u} for u in urls]
+
+    results = rss_ingest.fetch_sources_parallel(sources)
+    assert [r["feed"]["url"] for r in results[:6]] == urls[:6]
+    assert results[6]["feed"] is None
+    assert isinstance(results[6]["error"], RuntimeError)
+    assert peak["a.example.com"] <= 2
+
+
+def test_busy_host_does_not_block_workers_for_other_hosts(monkeypatch):
+    # 两个 worker、同一 host 限 1：前面排着的 slow host 源不应占住第二个线程
+    while_blocked = {}
+    release = threading.Event()
+
+    def fake_fetch_feed(url, timeout, retries, headers=None, etag="", modified=""):
+        while_blocked[url] = not release.is_set()
+        if "slow" in url:
+            release.wait(timeout=2)
+        return {"url": url}
+
+    monkeypatch.setattr(rss_ingest, "fetch_feed", fake_fetch_feed)
+    monkeypatch.setattr(rss_ingest.config, "FETCH_CONCURRENCY", 2)
+    monkeypatch.setattr(rss_ingest.config, "FETCH_PER_HOST_LIMIT", 1)
+    urls = [f"https://slow.example.com/{i}" for i in range(3)] + [f"https://fast.example.com/{i}" for i in range(3)]
+    timer = threading.Timer(0.3, release.set)
+    timer.start()
+    try:
+        results = rss_ingest.fetch_sources_parallel([{"feed_url": u, "record_id": u} for u in urls])
+    finally:
+        timer.cancel()
+    assert [r["feed"]["url"] for r in results] == urls
+    # 快 host 的源在慢 host 的第一个请求返回前就已全部抓完
+    assert all(while_blocked[u] for u in urls[3:])
+
+
+def test_fetch_source_feed_skips_validators_when_failed_pool_pending(monkeypatch):
+    sent = []
+
+    def fake_fetch_feed(url, timeout, retries, headers=None, etag="", modified=""):
+        sent.append((etag, modified))
+        return {"url": url}
+
+    monkeypatch.setattr(rss_ingest, "fetch_feed", fake_fetch_feed)
+    monkeypatch.setattr(rss_ingest.config, "ENABLE_CONDITIONAL_GET", True)
+    monkeypatch.setattr(
+        rss_ingest, "RSS_OPTIONAL_FIELDS", {rss_ingest.config.RSS_FIELD_ETAG, rss_ingest.config.RSS_FIELD_LAST_MODIFIED}
+    )
+    source = {"feed_url": "https://a.example.com/rss", "etag": "v1", "last_modified": "Mon"}
+    rss_ingest.fetch_source_feed(source)
+    rss_ingest.fetch_source_feed(dict(source, failed_items='[{"item_key": "k", "fail_count": 0}]'))
+    assert sent == [("v1", "Mon"), ("", "")]
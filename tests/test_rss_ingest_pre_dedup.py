@@ -0,0 +1,103 @@
+import os
+import sys
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import config
+import rss_ingest
+from vector_index import VectorSet
+
+VECTORS = {
+    "OpenAI launches model": [1.0, 0.0, 0.0],
+    "OpenAI unveils new model": [0.99, 0.05, 0.0],
+    "Chip export rules": [0.0, 1.0, 0.0],
+    "Old story rewritten": [0.0, 0.0, 1.0],
+}
+
+
+def make_item(key, title):
+    return {"source_id": "s", "item_key": key, "article": {"title": title, "content": "<p>x</p>"}, "entry_ts_ms": 0}
+
+
+def test_build_raw_embedding_text_uses_lead_paragraph(monkeypatch):
+    monkeypatch.setattr(config, "PRE_LLM_DEDUP_LEAD_CHARS", 20)
+    article = {
+        "title": " Title ",
+        "content": "<p>Photo: Reuters</p><p>The first real paragraph of the story goes here.</p><p>Second.</p>",
+    }
+    assert rss_ingest.build_raw_embedding_text(article) == "Title\nThe first real parag"
+    assert rss_ingest.build_raw_embedding_text({"title": "T", "content": "short"}) == "T\nshort"
+
+
+def test_pre_llm_dedup_drops_history_and_queue_duplicates(monkeypatch):
+    monkeypatch.setattr(config, "PRE_LLM_DEDUP_THRESHOLD", 0.9)
+    monkeypatch.setattr(rss_ingest, "cf_embed_texts", lambda texts, concurrency=1: [VECTORS.get(t.split("\n")[0]) for t in texts])
+    queries = []
+
+    def fake_query(embedding, namespace=""):
+        queries.append(namespace)
+        return 0.95 if embedding == VECTORS["Old story rewritten"] else 0.1
+
+    monkeypatch.setattr(rss_ingest, "semantic_dedup_query", fake_query)
+    queue = [
+        make_item("a", "OpenAI launches model"),
+        make_item("b", "OpenAI unveils new model"),
+        make_item("c", "Chip export rules"),
+        make_item("d", "Old story rewritten"),
+        make_item("e", "No embedding"),
+    ]
+    existing = set()
+    stats = {"pre_llm_dropped": 0}
+
+    kept = rss_ingest.pre_llm_semantic_dedup(queue, existing, stats)
+
+    assert [item["item_key"] for item in kept] == ["a", "c", "e"]
+    assert existing == {"b", "d"}
+    assert stats["pre_llm_dropped"] == 2
+    assert set(queries) == {rss_ingest.RAW_NAMESPACE}
+    assert kept[0]["raw_embedding"] == VECTORS["OpenAI launches model"]
+    assert "raw_embedding" not in kept[2]
+
+
+def test_vectorize_query_ignores_raw_vectors_in_default_namespace(monkeypatch):
+    monkeypatch.setattr(config, "ENABLE_PRE_LLM_DEDUP", True)
+    payloads = []
+
+    def fake_post(url, payload, timeout, retries):
+        payloads.append(payload)
+        return {
+            "result": {
+                "matches": [
+                    {"score": 0.97, "metadata": {"kind": "raw"}},
+                    {"score": 0.81, "metadata": {"title": "t"}},
+                ]
+            }
+        }
+
+    monkeypatch.setattr(rss_ingest, "cf_post", fake_post)
+    assert rss_ingest.vectorize_query([1.0]) == 0.81
+    assert payloads[-1]["returnMetadata"] == "all"
+    assert rss_ingest.vectorize_query([1.0], rss_ingest.RAW_NAMESPACE) == 0.97
+    assert payloads[-1]["namespace"] == rss_ingest.RAW_NAMESPACE
+
+
+def test_vector_set_best_match():
+    vectors = VectorSet()
+    assert vectors.best([1.0, 0.0]) == 0.0
+    for i in range(100):
+        assert vectors.add([float(i), 1.0])
+    assert vectors.best([0.0, 1.0]) == 1.0
+    assert vectors.best([1.0, 0.0, 0.0]) is None
+    assert not vectors.add([0.0, 0.0])
+    assert len(vectors) == 100
+
+
+def test_vector_set_discard():
+    vectors = VectorSet()
+    vectors.add([1.0, 0.0], "a")
+    vectors.add([0.0, 1.0], "b")
+    assert vectors.discard("a")
+    assert not vectors.discard("a")
+    assert len(vectors) == 1
+    assert vectors.best([1.0, 0.0]) == 0.0
+    assert vectors.best([0.0, 1.0]) == 1.0
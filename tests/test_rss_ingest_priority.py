@@ -0,0 +1,158 @@
+import os
+import sys
+import time
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import config
+import rss_ingest
+import run_deadline
+
+HOUR_MS = 3600 * 1000
+NOW_MS = 1000 * HOUR_MS
+
+
+def make_item(key, source_id, age_hours, from_failed=False):
+    return {
+        "source_id": source_id,
+        "item_key": key,
+        "article": {"title": key},
+        "entry_ts": 0,
+        "entry_ts_ms": NOW_MS - age_hours * HOUR_MS,
+        "from_failed": from_failed,
+    }
+
+
+def make_states(weights):
+    return {
+        source_id: {"source": {"weight": weight}, "now_ms": NOW_MS, "updated_failed_items": [], "new_count": 0}
+        for source_id, weight in weights.items()
+    }
+
+
+def test_parse_source_weight_defaults_to_one():
+    assert rss_ingest.parse_source_weight(None) == 1.0
+    assert rss_ingest.parse_source_weight("2.5") == 2.5
+    assert rss_ingest.parse_source_weight(-1) == 1.0
+    assert rss_ingest.parse_source_weight(0) == 0.0
+
+
+def test_prioritize_queue_by_recency_weight_and_retry(monkeypatch):
+    monkeypatch.setattr(config, "PRIORITY_HALF_LIFE_HOURS", 12)
+    monkeypatch.setattr(config, "PRIORITY_RETRY_BOOST", 0.5)
+    states = make_states({"chatty": 0.5, "core": 2.0})
+    queue = [
+        make_item("chatty-new", "chatty", 0),
+        make_item("core-old", "core", 12),
+        make_item("core-new", "core", 0),
+        make_item("chatty-retry", "chatty", 48, from_failed=True),
+    ]
+    ordered = rss_ingest.prioritize_queue(queue, states, NOW_MS)
+    assert [item["item_key"] for item in ordered] == ["core-new", "core-old", "chatty-new", "chatty-retry"]
+
+
+def test_queue_sheds_lowest_priority_beyond_capacity(monkeypatch):
+    monkeypatch.setattr(config, "ENABLE_QUEUE_PRIORITY", True)
+    monkeypatch.setattr(config, "ENABLE_LLM_BATCH", False)
+    monkeypatch.setattr(rss_ingest, "estimate_queue_capacity", lambda work_sec: 1)
+    monkeypatch.setattr(rss_ingest.time, "time", lambda: NOW_MS / 1000)
+    analyzed = []
+
+    def fake_analyze(articles):
+        analyzed.extend(a["title"] for a in articles)
+        return [rss_ingest.llm_failure() for _ in articles]
+
+    monkeypatch.setattr(rss_ingest, "analyze_articles", fake_analyze)
+    run_deadline.reset_run_deadline()
+    states = make_states({"s": 1.0})
+    queue = [make_item("old", "s", 48), make_item("new", "s", 1)]
+    stats = {"llm_success": 0, "llm_failed": 0, "deadline_deferred": 0, "shed_deferred": 0}
+    try:
+        rss_ingest.run_llm_queue(queue, states, "t", set(), [], stats)
+    finally:
+        run_deadline.reset_run_deadline()
+    assert analyzed == ["new"]
+    assert stats["shed_deferred"] == 1
+    pool = {item["item_key"]: item for item in states["s"]["updated_failed_items"]}
+    assert (pool["old"]["last_error"], pool["old"]["fail_count"]) == ("shed", 0)
+    assert pool["new"]["fail_count"] == 1
+
+
+def test_capacity_uses_concurrency_ceiling(monkeypatch):
+    monkeypatch.setattr(config, "LLM_EST_ITEM_SEC", 20)
+    monkeypatch.setattr(config, "LLM_CONCURRENCY", 4)
+    monkeypatch.setattr(config, "LLM_CONCURRENCY_MAX", 12)
+    monkeypatch.setattr(config, "ENABLE_ADAPTIVE_CONCURRENCY", True)
+    assert rss_ingest.estimate_queue_capacity(100) == 60
+    monkeypatch.setattr(config, "ENABLE_ADAPTIVE_CONCURRENCY", False)
+    assert rss_ingest.estimate_queue_capacity(100) == 20
+    assert rss_ingest.estimate_queue_capacity(float("inf")) is None
+
+
+def test_batched_queue_sheds_by_planned_requests(monkeypatch):
+    monkeypatch.setattr(config, "ENABLE_QUEUE_PRIORITY", True)
+    monkeypatch.setattr(config, "ENABLE_TITLE_TRIAGE", False)
+    monkeypatch.setattr(config, "ENABLE_LLM_BATCH", True)
+    monkeypatch.setattr(config, "LLM_BATCH_MAX_ITEMS", 3)
+    monkeypatch.setattr(config, "LLM_BATCH_MAX_TOKENS", 100000)
+    monkeypatch.setattr(rss_ingest, "estimate_queue_capacity", lambda work_sec: 2)
+    monkeypatch.setattr(rss_ingest.time, "time", lambda: NOW_MS / 1000)
+    analyzed = []
+
+    def fake_analyze(articles):
+        analyzed.extend(a["title"] for a in articles)
+        return [rss_ingest.llm_failure() for _ in articles]
+
+    monkeypatch.setattr(rss_ingest, "analyze_articles", fake_analyze)
+    run_deadline.reset_run_deadline()
+    states = make_states({"s": 1.0})
+    queue = [make_item(f"k{i}", "s", i) for i in range(8)]
+    stats = {"llm_success": 0, "llm_failed": 0, "deadline_deferred": 0, "shed_deferred": 0, "title_dropped": 0}
+    try:
+        rss_ingest.run_llm_queue(queue, states, "t", set(), [], stats)
+    finally:
+        run_deadline.reset_run_deadline()
+    # 两次请求 × 每次 3 篇
+    assert sorted(analyzed) == [f"k{i}" for i in range(6)]
+    assert stats["shed_deferred"] == 2
+
+
+class FakeFeed(dict):
+    def __init__(self, entries):
+        super().__init__()
+        self.entries = entries
+
+
+def test_shed_items_beyond_failed_pool_cap_return_next_run(monkeypatch):
+    monkeypatch.setattr(config, "ENABLE_QUEUE_PRIORITY", True)
+    monkeypatch.setattr(config, "ENABLE_TITLE_TRIAGE", False)
+    monkeypatch.setattr(config, "FAILED_ITEMS_MAX", 50)
+    monkeypatch.setattr(config, "MAX_ENTRIES_PER_FEED", 0)
+    monkeypatch.setattr(rss_ingest, "batch_update_bitable_records", lambda *args, **kwargs: (0, []))
+    monkeypatch.setattr(rss_ingest, "estimate_queue_capacity", lambda work_sec: 0)
+    now = 1_700_000_000
+    entries = [
+        {"id": f"e{i}", "title": f"t{i}", "published_parsed": time.gmtime(now - 3600 + i)}
+        for i in range(60)
+    ]
+    monkeypatch.setattr(
+        rss_ingest, "fetch_sources_parallel", lambda sources: [{"feed": FakeFeed(entries), "error": None} for _ in sources]
+    )
+    source = {"record_id": "s", "feed_url": "u", "enabled": True, "item_id_strategy": "guid", "weight": 1.0}
+
+    queue, states, _ = rss_ingest.split_sources_and_queue([dict(source)], set(), "t")
+    assert len(queue) == 60
+    stats = {"llm_success": 0, "llm_failed": 0, "deadline_deferred": 0, "shed_deferred": 0, "title_dropped": 0}
+    run_deadline.reset_run_deadline()
+    try:
+        rss_ingest.run_llm_queue(queue, states, "t", set(), [], stats)
+    finally:
+        run_deadline.reset_run_deadline()
+    assert stats["shed_deferred"] == 60
+
+    state = states["s"]
+    pool = rss_ingest.prune_failed_items(state["updated_failed_items"], state["now_ms"])
+    next_source = dict(source, failed_items=rss_ingest.serialize_failed_items(pool), last_item_pub_time=state["latest_pub_ms"])
+    monkeypatch.setattr(rss_ingest, "should_fetch", lambda source, now_ms: True)
+    queue, _, _ = rss_ingest.split_sources_and_queue([next_source], set(), "t")
+    assert sorted(item["item_key"] for item in queue) == sorted(f"e{i}" for i in range(60))
@@ -19,8 +19,35 @@ def test_collect_queue_items_skips_existing_keys():
 
 def test_split_sources_and_queue_returns_queue(monkeypatch):
     monkeypatch.setattr(rss_ingest, "update_bitable_record_fields", lambda *args, **kwargs: None)
+    monkeypatch.setattr(rss_ingest, "batch_update_bitable_records", lambda *args, **kwargs: (1, []))
     sources = [{"feed_url": "x", "enabled": False, "record_id": "r1"}]
     queue, source_states, stats = split_sources_and_queue(sources, existing_keys=set(), tenant_token="t")
     assert isinstance(queue, list)
     assert isinstance(source_states, dict)
     assert isinstance(stats, dict)
+
+
+def test_split_sources_batches_idle_updates_and_skips_unchanged(monkeypatch):
+    sent = []
+
+    def fake_batch_update(app_token, table_id, token, records, timeout, retries):
+        sent.extend(records)
+        return len(records), []
+
+    monkeypatch.setattr(rss_ingest, "batch_update_bitable_records", fake_batch_update)
+    sources = [
+        {"feed_url": "x", "enabled": False, "record_id": "r1", "fields": {"status": "idle"}},
+        {"feed_url": "y", "enabled": False, "record_id": "r2", "fields": {"status": "ok"}},
+        {"feed_url": "z", "enabled": False, "record_id": "r3"},
+    ]
+    split_sources_and_queue(sources, existing_keys=set(), tenant_token="t")
+    assert [r["record_id"] for r in sent] == ["r2", "r3"]
+    assert sent[0]["fields"] == {rss_ingest.config.RSS_FIELD_STATUS: rss_ingest.config.STATUS_IDLE}
+
+
+def test_queue_record_update_only_sends_changed_fields():
+    updates = []
+    current = {"status": "ok", "consecutive_fail_count": "0", "failed_items": [{"text": "[]", "type": "text"}]}
+    desired = {"status": "ok", "consecutive_fail_count": 0, "failed_items": "[]", "last_fetch_time": 123}
+    assert rss_ingest.queue_record_update(updates, "r1", current, desired)
+    assert updates == [{"record_id": "r1", "fields": {"last_fetch_time": 123}}]
@@ -0,0 +1,166 @@
+import os
+import sys
+import threading
+import time
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import config
+import rss_ingest
+import run_deadline
+from dedup_index import ItemKeyIndex
+
+VECTORS = {
+    "a1": [1.0, 0.0, 0.0],
+    "a2": [0.99, 0.02, 0.0],
+    "b1": [0.0, 1.0, 0.0],
+    "b2": [0.0, 0.98, 0.05],
+    "c": [0.0, 0.0, 1.0],
+}
+
+
+class FakeWriter:
+    def __init__(self, *args, **kwargs):
+        self.stats = {"batches": 0, "rows_ok": 0, "rows_failed": 0, "splits": 0}
+
+    def add(self, fields, callback):
+        callback("rec")
+
+    def close(self):
+        pass
+
+
+def test_concurrent_near_duplicates_are_written_once(monkeypatch):
+    monkeypatch.setattr(config, "ENABLE_VECTORIZE_DEDUP", True)
+    monkeypatch.setattr(config, "ENABLE_QUEUE_PRIORITY", False)
+    monkeypatch.setattr(config, "ENABLE_TITLE_TRIAGE", False)
+    monkeypatch.setattr(config, "ENABLE_LLM_BATCH", False)
+    monkeypatch.setattr(config, "ENABLE_ADAPTIVE_CONCURRENCY", False)
+    monkeypatch.setattr(config, "LLM_CONCURRENCY", 5)
+    monkeypatch.setattr(config, "CF_VECTORIZE_SIM_THRESHOLD", 0.9)
+    monkeypatch.setattr(rss_ingest, "BatchRecordWriter", FakeWriter)
+    monkeypatch.setattr(rss_ingest, "build_news_fields", lambda article, analysis, item_key: {})
+    barrier = threading.Barrier(5)
+
+    def fake_analyze(articles):
+        # 所有条目同时完成分析，模拟同一新闻在多个源同时出现
+        barrier.wait(timeout=5)
+        return [{"score": 9, "categories": ["AI"], "title_zh": a["title"]} for a in articles]
+
+    monkeypatch.setattr(rss_ingest, "analyze_articles", fake_analyze)
+    monkeypatch.setattr(rss_ingest, "embed_text_batched", lambda text: VECTORS[text.split("\n")[0]])
+
+    def slow_remote_query(embedding, namespace=""):
+        time.sleep(0.05)
+        return 0.0
+
+    added = []
+    monkeypatch.setattr(rss_ingest, "semantic_dedup_query", slow_remote_query)
+    monkeypatch.setattr(rss_ingest, "semantic_dedup_add", lambda key, emb, meta, namespace="": added.append(key) or True)
+
+    states = {"s": {"source": {}, "now_ms": 0, "updated_failed_items": [], "new_count": 0}}
+    queue = [
+        {"source_id": "s", "item_key": key, "article": {"title": key}, "entry_ts": 0, "entry_ts_ms": 0}
+        for key in VECTORS
+    ]
+    stats = {
+        "llm_success": 0,
+        "llm_failed": 0,
+        "feishu_create_failed": 0,
+        "entries_processed": 0,
+        "entries_new": 0,
+        "vectorize_skipped": 0,
+        "deadline_deferred": 0,
+        "shed_deferred": 0,
+        "title_dropped": 0,
+    }
+    existing = set()
+    run_deadline.reset_run_deadline()
+    try:
+        rss_ingest.run_llm_queue(queue, states, "t", existing, [], stats)
+    finally:
+        run_deadline.reset_run_deadline()
+
+    assert stats["vectorize_skipped"] == 2
+    assert stats["entries_new"] == 3
+    assert len(added) == 3
+    assert len({k[0] for k in added}) == 3
+    assert existing == set(VECTORS)
+
+
+def run_sequential(monkeypatch, keys, remote_sim, record_ids, existing_keys=None):
+    monkeypatch.setattr(config, "ENABLE_VECTORIZE_DEDUP", True)
+    monkeypatch.setattr(config, "ENABLE_QUEUE_PRIORITY", False)
+    monkeypatch.setattr(config, "ENABLE_TITLE_TRIAGE", False)
+    monkeypatch.setattr(config, "ENABLE_LLM_BATCH", False)
+    monkeypatch.setattr(config, "ENABLE_ADAPTIVE_CONCURRENCY", False)
+    monkeypatch.setattr(config, "LLM_CONCURRENCY", 1)
+    monkeypatch.setattr(config, "CF_VECTORIZE_SIM_THRESHOLD", 0.9)
+
+    class SequencedWriter(FakeWriter):
+        def add(self, fields, callback):
+            callback(record_ids.pop(0))
+
+    monkeypatch.setattr(rss_ingest, "BatchRecordWriter", SequencedWriter)
+    monkeypatch.setattr(rss_ingest, "build_news_fields", lambda article, analysis, item_key: {})
+    monkeypatch.setattr(
+        rss_ingest,
+        "analyze_articles",
+        lambda articles: [{"score": 9, "categories": ["AI"], "title_zh": a["title"]} for a in articles],
+    )
+    monkeypatch.setattr(rss_ingest, "embed_text_batched", lambda text: VECTORS[text.split("\n")[0]])
+    monkeypatch.setattr(rss_ingest, "semantic_dedup_query", lambda embedding, namespace="": remote_sim(embedding))
+    added = []
+    monkeypatch.setattr(rss_ingest, "semantic_dedup_add", lambda key, emb, meta, namespace="": added.append(key) or True)
+
+    states = {"s": {"source": {}, "now_ms": 0, "updated_failed_items": [], "new_count": 0}}
+    queue = [{"source_id": "s", "item_key": key, "article": {"title": key}, "entry_ts": 0, "entry_ts_ms": 0} for key in keys]
+    stats = {
+        "llm_success": 0,
+        "llm_failed": 0,
+        "feishu_create_failed": 0,
+        "entries_processed": 0,
+        "entries_new": 0,
+        "vectorize_skipped": 0,
+        "deadline_deferred": 0,
+        "shed_deferred": 0,
+        "title_dropped": 0,
+    }
+    run_deadline.reset_run_deadline()
+    try:
+        rss_ingest.run_llm_queue(queue, states, "t", set() if existing_keys is None else existing_keys, [], stats)
+    finally:
+        run_deadline.reset_run_deadline()
+    return added, stats
+
+
+def test_remote_duplicate_does_not_suppress_later_similar_item(monkeypatch):
+    # a1 命中历史索引被跳过，不应登记到本轮向量里；与之近似的 a2 历史未命中，应正常写入
+    added, stats = run_sequential(
+        monkeypatch,
+        ["a1", "a2"],
+        lambda emb: 0.95 if emb == VECTORS["a1"] else 0.0,
+        ["rec"],
+    )
+    assert added == ["a2"]
+    assert stats["vectorize_skipped"] == 1
+
+
+def test_failed_create_releases_in_run_vector(monkeypatch):
+    added, stats = run_sequential(monkeypatch, ["a1", "a2"], lambda emb: 0.0, [None, "rec"])
+    assert added == ["a2"]
+    assert stats["feishu_create_failed"] == 1
+    assert stats["vectorize_skipped"] == 0
+
+
+def test_key_index_persists_only_created_items(monkeypatch, tmp_path):
+    path = str(tmp_path / "keys.sqlite3")
+    index = ItemKeyIndex(path)
+    run_sequential(monkeypatch, ["a1", "b1", "c"], lambda emb: 0.0, [None, "rec", "rec"], index)
+    # 本轮内三条都视为已处理，但写入失败的 a1 不落盘，下一轮可以重试
+    assert all(key in index for key in ("a1", "b1", "c"))
+    rss_ingest.close_existing_keys(index)
+    reopened = ItemKeyIndex(path)
+    assert "a1" not in reopened
+    assert "b1" in reopened and "c" in reopened
+    reopened.close()
@@ -0,0 +1,45 @@
+import os
+import sys
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import rss_parser
+
+
+class FakeResponse:
+    def __init__(self, status_code, content=b"", headers=None):
+        self.status_code = status_code
+        self.content = content
+        self.text = content.decode("utf-8")
+        self.headers = headers or {}
+
+
+def test_fetch_feed_sends_validators_and_handles_304(monkeypatch):
+    seen = {}
+
+    def fake_get(url, headers=None, timeout=None):
+        seen.update(headers or {})
+        return FakeResponse(304, headers={"ETag": "\"v2\""})
+
+    monkeypatch.setattr(rss_parser.http_pool, "get", fake_get)
+    feed = rss_parser.fetch_feed("http://x", 5, 1, etag="\"v1\"", modified="Mon, 01 Jan 2024 00:00:00 GMT")
+    assert seen["If-None-Match"] == "\"v1\""
+    assert seen["If-Modified-Since"] == "Mon, 01 Jan 2024 00:00:00 GMT"
+    assert feed.not_modified is True
+    assert feed.entries == []
+    assert feed.etag == "\"v2\""
+
+
+def test_fetch_feed_records_validators_on_200(monkeypatch):
+    body = b"<rss version='2.0'><channel><title>t</title><item><title>a</title><guid>g1</guid></item></channel></rss>"
+
+    def fake_get(url, headers=None, timeout=None):
+        return FakeResponse(200, content=body, headers={"ETag": "e1", "Last-Modified": "lm"})
+
+    monkeypatch.setattr(rss_parser.http_pool, "get", fake_get)
+    feed = rss_parser.fetch_feed("http://x", 5, 1)
+    assert feed.not_modified is False
+    assert feed.etag == "e1"
+    assert feed.modified == "lm"
+    assert feed.bytes == len(body)
+    assert len(feed.entries) == 1
@@ -0,0 +1,77 @@
+import os
+import sys
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import config
+import rss_ingest
+import run_deadline
+from llm_providers import PROVIDERS
+from run_deadline import RunDeadline
+from conftest import FakeClock
+
+
+def test_deadline_caps_timeout_and_keeps_reserve():
+    clock = FakeClock()
+    deadline = RunDeadline(600, reserve_sec=120, min_call_sec=15, clock=clock)
+    assert deadline.call_timeout(300) == 300
+    clock.now = 400
+    assert deadline.call_timeout(300) == 80
+    assert deadline.call_timeout(300, reserve=False) == 200
+    clock.now = 470
+    assert deadline.expired()
+    assert deadline.call_timeout(300) is None
+    assert deadline.call_timeout(300, reserve=False) == 130
+
+
+def test_disabled_deadline_never_expires():
+    deadline = RunDeadline(0, reserve_sec=120)
+    assert not deadline.expired()
+    assert deadline.call_timeout(300) == 300
+
+
+def test_engine_stops_at_deadline_without_posting(monkeypatch):
+    monkeypatch.setattr(config, "DEEPSEEK_API_KEY", "k")
+    monkeypatch.setattr(config, "RUN_DEADLINE_MIN", 1)
+    monkeypatch.setattr(config, "RUN_DEADLINE_RESERVE_SEC", 60)
+    run_deadline.reset_run_deadline()
+    calls = []
+    monkeypatch.setattr(rss_ingest.http_pool, "post", lambda url, **kwargs: calls.append(kwargs))
+    try:
+        result = rss_ingest.analyze_with_provider(PROVIDERS["deepseek"], {"title": "t", "content": "c"})
+    finally:
+        run_deadline.reset_run_deadline()
+    assert calls == []
+    assert result["categories"] == [rss_ingest.DEADLINE_CATEGORY]
+
+
+def test_upsert_failed_item_can_skip_fail_count():
+    items = rss_ingest.upsert_failed_item([], "k", 1, "t", "l", "deadline", 2, count_failure=False)
+    assert items[0]["fail_count"] == 0
+    rss_ingest.upsert_failed_item(items, "k", 1, "t", "l", "llm_failed", 3)
+    assert items[0]["fail_count"] == 1
+
+
+def test_queue_defers_items_to_failed_pool_after_deadline(monkeypatch):
+    monkeypatch.setattr(config, "RUN_DEADLINE_MIN", 1)
+    monkeypatch.setattr(config, "RUN_DEADLINE_RESERVE_SEC", 60)
+    monkeypatch.setattr(config, "ENABLE_LLM_BATCH", False)
+    monkeypatch.setattr(config, "ENABLE_QUEUE_PRIORITY", False)
+    monkeypatch.setattr(rss_ingest, "analyze_articles", lambda articles: 1 / 0)
+    run_deadline.reset_run_deadline()
+    state = {"now_ms": 5, "updated_failed_items": [], "new_count": 0}
+    queue = [
+        {"source_id": "s", "item_key": "a", "article": {"title": "A"}, "entry_ts": 0, "entry_ts_ms": 1},
+        {"source_id": "s", "item_key": "b", "article": {"title": "B"}, "entry_ts": 0, "entry_ts_ms": 2, "fail_count": 2},
+    ]
+    stats = {"llm_success": 0, "llm_failed": 0, "deadline_deferred": 0, "shed_deferred": 0}
+    try:
+        rss_ingest.run_llm_queue(queue, {"s": state}, "t", set(), [], stats)
+    finally:
+        run_deadline.reset_run_deadline()
+    assert stats["deadline_deferred"] == 2
+    assert stats["llm_failed"] == 0
+    pool = {item["item_key"]: item for item in state["updated_failed_items"]}
+    assert pool["a"]["fail_count"] == 0
+    assert pool["b"]["fail_count"] == 2
+    assert pool["a"]["last_error"] == "deadline"
@@ -0,0 +1,65 @@
+import os
+import sys
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import config
+import rss_ingest
+from title_triage import TriageAudit, load_audit, parse_title_triage, should_drop, summarize_audit
+from conftest import FakeChatResponse
+
+
+def make_item(key, title):
+    return {"source_id": "s", "item_key": key, "article": {"title": title, "source": "feed"}, "entry_ts_ms": 0}
+
+
+def test_parse_title_triage_and_drop_rule():
+    raw = '[{"id": "1", "keep": false, "score": 2}, {"id": "2", "keep": "true", "score": 7}, {"id": "9", "keep": false}]'
+    decisions = parse_title_triage(raw, 2)
+    assert decisions == {0: (False, 2.0), 1: (True, 7.0)}
+    assert should_drop(False, 2.0, 4.0)
+    assert not should_drop(False, 5.0, 4.0)
+    assert not should_drop(True, 1.0, 4.0)
+    assert should_drop(False, None, 4.0)
+
+
+def test_title_triage_queue_chunks_and_audits(monkeypatch, tmp_path):
+    monkeypatch.setattr(config, "DEEPSEEK_API_KEY", "k")
+    monkeypatch.setattr(config, "TITLE_TRIAGE_PROVIDER", "deepseek")
+    monkeypatch.setattr(config, "TITLE_TRIAGE_CHUNK", 2)
+    monkeypatch.setattr(config, "TITLE_TRIAGE_MIN_SCORE", 4.0)
+    monkeypatch.setattr(config, "TITLE_TRIAGE_AUDIT_RATE", 0.0)
+    prompts = []
+
+    def fake_post(url, **kwargs):
+        prompt = kwargs["json"]["messages"][0]["content"]
+        prompts.append(prompt)
+        if "gossip" in prompt:
+            return FakeChatResponse('[{"id": "1", "keep": true, "score": 8}, {"id": "2", "keep": false, "score": 1}]')
+        return FakeChatResponse("not json")
+
+    monkeypatch.setattr(rss_ingest.http_pool, "post", fake_post)
+    audit = TriageAudit(str(tmp_path / "audit.jsonl"))
+    queue = [make_item("a", "launch"), make_item("b", "gossip"), make_item("c", "other")]
+    kept, dropped = rss_ingest.title_triage_queue(queue, audit)
+    assert len(prompts) == 2
+    assert [item["item_key"] for item in kept] == ["a", "c"]
+    assert [item["item_key"] for item in dropped] == ["b"]
+    records = load_audit(str(tmp_path / "audit.jsonl"))
+    assert [(r["item_key"], r["keep"]) for r in records] == [("a", True), ("b", False), ("c", True)]
+
+
+def test_summarize_audit_precision():
+    records = [
+        {"event": "triage", "item_key": "a", "keep": True},
+        {"event": "triage", "item_key": "b", "keep": True},
+        {"event": "triage", "item_key": "c", "keep": False, "audited": True},
+        {"event": "triage", "item_key": "d", "keep": False},
+        {"event": "analysis", "item_key": "a", "score": 8},
+        {"event": "analysis", "item_key": "b", "score": 3},
+        {"event": "analysis", "item_key": "c", "score": 2},
+    ]
+    summary = summarize_audit(records, 6.0)
+    assert summary["keep_precision"] == 0.5
+    assert summary["drop_precision"] == 1.0
+    assert summary["drop_rate"] == 0.5
@@ -0,0 +1,113 @@
+import os
+import sys
+import time
+import weakref
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import pytest
+
+import config
+import rss_ingest
+import vector_index
+from vector_index import LocalVectorIndex
+
+pytest.importorskip("numpy")
+
+
+def test_query_returns_best_cosine(tmp_path):
+    index = LocalVectorIndex(str(tmp_path))
+    assert index.query([1.0, 0.0, 0.0]) == 0.0
+    index.add("a", [2.0, 0.0, 0.0])
+    index.add("b", [0.0, 1.0, 0.0])
+    assert index.query([1.0, 0.0, 0.0]) == pytest.approx(1.0)
+    assert index.query([1.0, 1.0, 0.0]) == pytest.approx(0.7071, abs=1e-3)
+    assert not index.add("a", [0.0, 0.0, 1.0])
+    assert len(index) == 2
+
+
+def test_save_reload_and_window(tmp_path):
+    index = LocalVectorIndex(str(tmp_path), window_days=1)
+    index.add("old", [1.0, 0.0], ts=time.time() - 3 * 86400)
+    for i in range(100):
+        index.add(f"k{i}", [1.0, float(i + 1)])
+    index.save()
+
+    reloaded = LocalVectorIndex(str(tmp_path), window_days=1)
+    assert len(reloaded) == 100
+    assert reloaded.query([1.0, 0.0]) < 0.99
+    assert reloaded.query([1.0, 100.0]) == pytest.approx(1.0)
+    reloaded.add("new", [1.0, 0.0])
+    assert reloaded.query([1.0, 0.0]) == pytest.approx(1.0)
+
+
+def test_save_releases_old_memmap_before_replace(tmp_path, monkeypatch):
+    index = LocalVectorIndex(str(tmp_path))
+    index.add("a", [1.0, 0.0])
+    index.save()
+
+    reloaded = LocalVectorIndex(str(tmp_path))
+    old = weakref.ref(reloaded._stored)
+    replace = os.replace
+    alive_at_replace = []
+
+    def checked_replace(src, dst):
+        # Windows 上仍被映射的文件无法替换，替换时旧 memmap 必须已释放
+        alive_at_replace.append(old() is not None)
+        replace(src, dst)
+
+    monkeypatch.setattr(vector_index.os, "replace", checked_replace)
+    reloaded.add("b", [0.0, 1.0])
+    reloaded.save()
+    assert alive_at_replace == [False, False]
+    assert len(LocalVectorIndex(str(tmp_path))) == 2
+    # 只有磁盘上的行、没有新增时同样可以重写
+    reloaded.save()
+    assert reloaded.query([0.0, 1.0]) == pytest.approx(1.0)
+
+
+def test_int8_close_to_float(tmp_path):
+    vecs = [[float((i * 7 + j * 3) % 11) - 5.0 for j in range(32)] for i in range(20)]
+    exact = LocalVectorIndex(str(tmp_path / "f32"))
+    quant = LocalVectorIndex(str(tmp_path / "i8"), int8=True)
+    for i, vec in enumerate(vecs):
+        exact.add(str(i), vec)
+        quant.add(str(i), vec)
+    probe = [float(j % 5) for j in range(32)]
+    assert quant.query(probe) == pytest.approx(exact.query(probe), abs=0.02)
+
+    quant.save()
+    as_float = LocalVectorIndex(str(tmp_path / "i8"))
+    assert as_float.query(probe) == pytest.approx(exact.query(probe), abs=0.02)
+
+
+def test_dimension_change_resets(tmp_path):
+    index = LocalVectorIndex(str(tmp_path))
+    index.add("a", [1.0, 0.0])
+    assert index.query([1.0, 0.0, 0.0]) is None
+    index.add("b", [1.0, 0.0, 0.0])
+    assert len(index) == 1
+    assert index.query([1.0, 0.0, 0.0]) == pytest.approx(1.0)
+
+
+def test_semantic_dedup_hook_uses_local_index(monkeypatch, tmp_path):
+    monkeypatch.setattr(config, "ENABLE_VECTORIZE_DEDUP", True)
+    monkeypatch.setattr(config, "VECTOR_DEDUP_BACKEND", "local")
+    monkeypatch.setattr(config, "VECTOR_INDEX_PATH", str(tmp_path / "vectors"))
+    monkeypatch.setattr(config, "VECTOR_INDEX_SYNC_VECTORIZE", False)
+
+    def fail(*args, **kwargs):
+        raise AssertionError("remote Vectorize should not be called")
+
+    monkeypatch.setattr(rss_ingest, "vectorize_query", fail)
+    monkeypatch.setattr(rss_ingest, "vectorize_upsert", fail)
+
+    assert rss_ingest.open_vector_index() is not None
+    try:
+        assert rss_ingest.semantic_dedup_query([0.0, 1.0]) == 0.0
+        assert rss_ingest.semantic_dedup_add("k", [0.0, 1.0], {"title": "t"})
+        assert rss_ingest.semantic_dedup_query([0.0, 2.0]) == pytest.approx(1.0)
+    finally:
+        rss_ingest.close_vector_index()
+    assert rss_ingest.VECTOR_INDEX is None
+    assert len(LocalVectorIndex(str(tmp_path / "vectors"))) == 1
@@ -0,0 +1,135 @@
+import os
+import sys
+import time
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import config
+import rss_ingest
+from vectorize_writer import VectorUpsertWriter
+
+
+def vec(i):
+    return {"id": str(i), "values": [float(i)]}
+
+
+def test_writer_batches_in_background():
+    batches = []
+    writer = VectorUpsertWriter(lambda vs: batches.append([v["id"] for v in vs]) or True, batch_size=3, max_age_sec=0.05)
+    for i in range(7):
+        writer.add(vec(i))
+    deadline = time.monotonic() + 2
+    while writer.pending() and time.monotonic() < deadline:
+        time.sleep(0.01)
+    writer.close()
+    assert [i for batch in batches for i in batch] == [str(i) for i in range(7)]
+    assert max(len(b) for b in batches) == 3
+    assert writer.stats["vectors_ok"] == 7
+
+
+def test_writer_splits_around_bad_vector_and_drops_it(tmp_path):
+    spill = tmp_path / "pending.jsonl"
+    calls = []
+
+    def upsert(vs):
+        calls.append(len(vs))
+        return all(v["id"] != "0" for v in vs)
+
+    writer = VectorUpsertWriter(upsert, batch_size=8, max_age_sec=60, spill_path=str(spill))
+    for i in range(8):
+        writer.add(vec(i))
+    writer.close()
+    # 坏向量在批首也只影响自己；收尾单独重试仍被拒后丢弃，不写入 spill
+    assert writer.stats["vectors_ok"] == 7
+    assert writer.stats["vectors_dropped"] == 1
+    assert writer.stats["vectors_failed"] == 0
+    assert calls == [8, 4, 2, 1, 1, 2, 4, 1]
+    assert not spill.exists()
+
+
+def test_writer_stops_splitting_when_service_down(tmp_path):
+    spill = tmp_path / "p.jsonl"
+    calls = []
+
+    def down(vs):
+        calls.append(len(vs))
+        raise RuntimeError("CF request failed: HTTP 503")
+
+    writer = VectorUpsertWriter(down, batch_size=8, max_age_sec=60, spill_path=str(spill))
+    for i in range(16):
+        writer.add(vec(i))
+    writer.flush()
+    # 整批失败不拆分，两批各请求一次
+    assert calls == [8, 8]
+    writer.close()
+    assert calls == [8, 8, 8, 8]
+    assert writer.stats["vectors_failed"] == 16
+    assert sum(1 for _ in open(spill)) == 16
+
+    sent = []
+    restored = VectorUpsertWriter(lambda vs: sent.extend(v["id"] for v in vs) or True, max_age_sec=60, spill_path=str(spill))
+    assert not spill.exists()
+    restored.close()
+    assert sent == [str(i) for i in range(16)]
+    assert restored.stats["restored"] == 16
+
+
+def test_retry_failed_clears_degraded_state():
+    state = {"down": True}
+    calls = []
+
+    def upsert(vs):
+        calls.append(len(vs))
+        if state["down"]:
+            raise RuntimeError("timeout")
+        return all(v["id"] != "1" for v in vs)
+
+    writer = VectorUpsertWriter(upsert, batch_size=4, max_age_sec=60)
+    for i in range(4):
+        writer.add(vec(i))
+    writer.flush()
+    state["down"] = False
+    writer.retry_failed()
+    # 服务恢复后按记录级失败正常拆分
+    assert writer.stats["vectors_ok"] == 3
+    assert writer.stats["splits"] == 2
+    writer.close()
+
+
+def test_vectorize_upsert_queues_when_writer_open(monkeypatch, tmp_path):
+    monkeypatch.setattr(config, "ENABLE_VECTORIZE_DEDUP", True)
+    monkeypatch.setattr(config, "CF_VECTORIZE_INDEX", "idx")
+    monkeypatch.setattr(config, "VECTORIZE_UPSERT_MAX_AGE_SEC", 60)
+    monkeypatch.setattr(config, "VECTORIZE_UPSERT_SPILL_PATH", str(tmp_path / "p.jsonl"))
+    posts = []
+    monkeypatch.setattr(rss_ingest, "cf_post", lambda url, payload, timeout, retries: posts.append(payload) or {})
+
+    assert rss_ingest.open_vectorize_writer() is not None
+    try:
+        assert rss_ingest.vectorize_upsert("a", [1.0], {"title": "t"})
+        assert rss_ingest.vectorize_upsert("a", [1.0], {"title": "t"}, rss_ingest.RAW_NAMESPACE)
+        assert posts == []
+    finally:
+        rss_ingest.close_vectorize_writer()
+    assert len(posts) == 1
+    ids = [v["id"] for v in posts[0]["vectors"]]
+    assert len(set(ids)) == 2
+    assert posts[0]["vectors"][1]["namespace"] == rss_ingest.RAW_NAMESPACE
+
+
+def test_upsert_many_separates_rejected_batches_from_outages(monkeypatch):
+    def rejected(url, payload, timeout, retries):
+        raise rss_ingest.CloudflareRequestError(400, "invalid vector")
+
+    monkeypatch.setattr(rss_ingest, "cf_post", rejected)
+    assert rss_ingest.vectorize_upsert_many([vec(1)]) is False
+
+    def outage(url, payload, timeout, retries):
+        raise RuntimeError("CF request failed: HTTP 503")
+
+    monkeypatch.setattr(rss_ingest, "cf_post", outage)
+    try:
+        rss_ingest.vectorize_upsert_many([vec(1)])
+        assert False, "outage should propagate"
+    except RuntimeError:
+        pass
@@ -0,0 +1,159 @@
+# -*- coding: utf-8 -*-
+import argparse
+import json
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import config
+from json_repair import repair_json
+
+# 标题初筛：一次请求判断几十个标题的去留，只有保留的条目才进入完整分析。
+# 每次决策写入审计 JSONL；保留的条目和按比例抽检的丢弃条目仍做完整分析并记录分数，用于评估初筛准确率。
+
+TITLE_TRIAGE_PROMPT = """你是 AI / 科技 / 商业资讯的初筛员，只看标题判断文章对 AI 创作者、开发者与商业决策者是否值得深入阅读。
+拿不准时保留（keep=true），只丢弃明显的噪音（八卦、促销、情绪文、与科技商业无关的内容）。
+score 为粗略价值分（0-10，口径：9+ 颠覆级，7.5+ 高价值，5+ 一般，5 以下噪音）。
+输入是 JSON 数组，每项带 id。输出 JSON 数组，每个输入恰好对应一个元素：{"id": "1", "keep": true, "score": 6}
+数组之外不要输出任何内容。
+"""
+
+
+def build_title_triage_prompt(items: List[Dict[str, Any]]) -> str:
+    rows = [
+        {"id": str(idx), "title": (item.get("article") or {}).get("title") or "", "source": (item.get("article") or {}).get("source") or ""}
+        for idx, item in enumerate(items, 1)
+    ]
+    return f"{TITLE_TRIAGE_PROMPT}\n# Input\n{json.dumps(rows, ensure_ascii=False)}\n"
+
+
+def parse_title_triage(raw_text: str, count: int) -> Dict[int, Tuple[bool, Optional[float]]]:
+    # 返回 {输入下标: (keep, score)}；缺失或格式不对的条目不出现在结果里（调用方按保留处理）
+    data = repair_json(raw_text or "")
+    if isinstance(data, dict):
+        data = next((v for v in data.values() if isinstance(v, list)), None)
+    if not isinstance(data, list):
+        return {}
+    decisions: Dict[int, Tuple[bool, Optional[float]]] = {}
+    for element in data:
+        if not isinstance(element, dict):
+            continue
+        try:
+            idx = int(str(element.get("id")).strip()) - 1
+        except ValueError:
+            continue
+        if idx < 0 or idx >= count or idx in decisions:
+            continue
+        keep = element.get("keep")
+        if isinstance(keep, str):
+            keep = keep.strip().lower() in {"true", "yes", "1", "keep"}
+        try:
+            score = float(element["score"]) if element.get("score") is not None else None
+        except (TypeError, ValueError):
+            score = None
+        if keep is None and score is None:
+            continue
+        decisions[idx] = (bool(keep) if keep is not None else True, score)
+    return decisions
+
+
+def should_drop(keep: bool, score: Optional[float], min_score: float) -> bool:
+    # 模型判定丢弃且粗略分数低于阈值才丢弃；没有分数时只看 keep
+    if keep:
+        return False
+    return score is None or score < min_score
+
+
+class TriageAudit:
+    def __init__(self, path: str) -> None:
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+
+    def _append(self, record: Dict[str, Any]) -> None:
+        record["ts"] = int(time.time())
+        line = json.dumps(record, ensure_ascii=False) + "\n"
+        with self._lock:
+            with self.path.open("a", encoding="utf-8") as f:
+                f.write(line)
+
+    def record_decision(self, item_key: str, title: str, keep: bool, score: Optional[float], audited: bool) -> None:
+        self._append({"event": "triage", "item_key": item_key, "title": title, "keep": keep, "score": score, "audited": audited})
+
+    def record_analysis(self, item_key: str, score: float) -> None:
+        self._append({"event": "analysis", "item_key": item_key, "score": score})
+
+
+def load_audit(path: str) -> List[Dict[str, Any]]:
+    records: List[Dict[str, Any]] = []
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                records.append(json.loads(line))
+            except ValueError:
+                continue
+    return records
+
+
+def summarize_audit(records: Iterable[Dict[str, Any]], min_score: float) -> Dict[str, Any]:
+    # 以完整分析分数 >= min_score 为“值得入库”，统计初筛的保留 / 丢弃准确率
+    decisions: Dict[str, Dict[str, Any]] = {}
+    full_scores: Dict[str, float] = {}
+    for record in records:
+        key = record.get("item_key")
+        if not key:
+            continue
+        if record.get("event") == "triage":
+            decisions[key] = record
+        elif record.get("event") == "analysis" and record.get("score") is not None:
+            full_scores[key] = float(record["score"])
+
+    summary = {
+        "decisions": len(decisions),
+        "kept": 0,
+        "dropped": 0,
+        "kept_analyzed": 0,
+        "kept_good": 0,
+        "dropped_audited": 0,
+        "dropped_good": 0,
+    }
+    for key, decision in decisions.items():
+        kept = bool(decision.get("keep"))
+        summary["kept" if kept else "dropped"] += 1
+        if key not in full_scores:
+            continue
+        good = full_scores[key] >= min_score
+        if kept:
+            summary["kept_analyzed"] += 1
+            summary["kept_good"] += int(good)
+        else:
+            summary["dropped_audited"] += 1
+            summary["dropped_good"] += int(good)
+    # drop_precision：被丢弃的条目里确实低于阈值的比例（按抽检估计）
+    audited = summary["dropped_audited"]
+    summary["keep_precision"] = summary["kept_good"] / summary["kept_analyzed"] if summary["kept_analyzed"] else None
+    summary["drop_precision"] = (audited - summary["dropped_good"]) / audited if audited else None
+    summary["drop_rate"] = summary["dropped"] / summary["decisions"] if summary["decisions"] else None
+    return summary
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Report title triage precision from the audit log.")
+    parser.add_argument("path", nargs="?", default=config.TITLE_TRIAGE_AUDIT_PATH, help="audit JSONL path")
+    parser.add_argument("--min-score", type=float, default=config.FEISHU_MIN_SCORE, help="full-analysis score counted as worth keeping")
+    args = parser.parse_args()
+
+    summary = summarize_audit(load_audit(args.path), args.min_score)
+    for key, value in summary.items():
+        if isinstance(value, float):
+            value = f"{value:.1%}"
+        print(f"{key}={value}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,263 @@
+# -*- coding: utf-8 -*-
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence
+
+try:
+    import numpy as np
+except ImportError:  # numpy 为可选依赖，缺失时调用方回退到远端 Vectorize
+    np = None
+
+INT8_SCALE = 127.0
+
+
+def vector_index_available() -> bool:
+    return np is not None
+
+
+def normalize_vector(values: Sequence[float]) -> Optional["np.ndarray"]:
+    vec = np.asarray(values, dtype=np.float32)
+    norm = float(np.linalg.norm(vec))
+    if vec.ndim != 1 or norm == 0.0:
+        return None
+    return vec / norm
+
+
+# 仅在内存中的向量集合（如本轮已接受的向量）：有 numpy 时按倍数扩容的矩阵 + 一次点积，
+# 否则退化为逐个比较（只适合小集合）
+class VectorSet:
+    def __init__(self) -> None:
+        self.dim = 0
+        self._rows: Any = [] if np is None else None
+        self._keys: List[str] = []
+        self._count = 0
+
+    def __len__(self) -> int:
+        return self._count
+
+    def _normalize(self, values: Sequence[float]) -> Any:
+        if np is not None:
+            return normalize_vector(values)
+        vec = [float(x) for x in values]
+        norm = sum(x * x for x in vec) ** 0.5
+        return [x / norm for x in vec] if norm else None
+
+    def best(self, values: Sequence[float]) -> Optional[float]:
+        vec = self._normalize(values)
+        if vec is None or (self.dim and len(vec) != self.dim):
+            return None
+        if not self._count:
+            return 0.0
+        if np is None:
+            return max(sum(a * b for a, b in zip(row, vec)) for row in self._rows)
+        return float((self._rows[: self._count] @ vec).max())
+
+    def add(self, values: Sequence[float], key: str = "") -> bool:
+        vec = self._normalize(values)
+        if vec is None or (self.dim and len(vec) != self.dim):
+            return False
+        self.dim = len(vec)
+        if np is None:
+            self._rows.append(vec)
+        else:
+            if self._rows is None:
+                self._rows = np.zeros((64, self.dim), dtype=np.float32)
+            elif self._count == len(self._rows):
+                grown = np.zeros((len(self._rows) * 2, self.dim), dtype=np.float32)
+                grown[: self._count] = self._rows
+                self._rows = grown
+            self._rows[self._count] = vec
+        self._keys.append(key)
+        self._count += 1
+        return True
+
+    def discard(self, key: str) -> bool:
+        # 用最后一行填补被删除的行，保持矩阵紧凑
+        if not key or key not in self._keys:
+            return False
+        idx = self._keys.index(key)
+        last = self._count - 1
+        self._rows[idx] = self._rows[last]
+        self._keys[idx] = self._keys[last]
+        self._keys.pop()
+        if np is None:
+            self._rows.pop()
+        self._count -= 1
+        return True
+
+
+# 本地语义去重索引：归一化向量矩阵（float32 或 int8 量化）+ 写入时间，
+# 查询为一次矩阵-向量点积；落盘为 .npy（加载时 memmap），超出时间窗口的向量在加载 / 保存时淘汰。
+class LocalVectorIndex:
+    def __init__(self, path: str, window_days: float = 30.0, int8: bool = False) -> None:
+        self.dir = Path(path)
+        self.dir.mkdir(parents=True, exist_ok=True)
+        self.window_sec = window_days * 86400
+        self.int8 = int8
+        self.dim = 0
+        self.stats = {"queries": 0, "query_sec": 0.0, "added": 0, "expired": 0}
+        self._lock = threading.Lock()
+        self._ids: List[str] = []
+        self._ts: List[float] = []
+        self._known: set = set()
+        # _stored 来自磁盘（只读 memmap），本轮新增的行追加到按倍数扩容的 _recent
+        self._stored: Optional["np.ndarray"] = None
+        self._recent: Optional["np.ndarray"] = None
+        self._recent_count = 0
+        self._load()
+
+    @property
+    def _dtype(self) -> Any:
+        return np.int8 if self.int8 else np.float32
+
+    def _vectors_path(self) -> Path:
+        return self.dir / "vectors.npy"
+
+    def _meta_path(self) -> Path:
+        return self.dir / "meta.json"
+
+    def _encode(self, vec: "np.ndarray") -> "np.ndarray":
+        if self.int8:
+            return np.clip(np.rint(vec * INT8_SCALE), -INT8_SCALE, INT8_SCALE).astype(np.int8)
+        return vec.astype(np.float32)
+
+    def _load(self) -> None:
+        if not self._vectors_path().exists() or not self._meta_path().exists():
+            return
+        with self._meta_path().open("r", encoding="utf-8") as f:
+            meta = json.load(f)
+        matrix = np.load(self._vectors_path(), mmap_mode="r")
+        ids = list(meta.get("ids") or [])
+        ts = [float(x) for x in meta.get("ts") or []]
+        if matrix.ndim != 2 or len(ids) != matrix.shape[0] or len(ts) != len(ids):
+            return
+        stored_int8 = meta.get("dtype") == "int8"
+        if stored_int8 != self.int8:
+            # 切换量化方式时整体转换一次
+            values = matrix.astype(np.float32) / INT8_SCALE if stored_int8 else np.asarray(matrix, dtype=np.float32)
+            matrix = self._encode(values)
+        keep = self._window_mask(ts)
+        if keep is not None:
+            self.stats["expired"] += len(ids) - int(keep.sum())
+            matrix = np.asarray(matrix[keep])
+            ids = [i for i, k in zip(ids, keep) if k]
+            ts = [t for t, k in zip(ts, keep) if k]
+        self.dim = int(matrix.shape[1])
+        self._stored = matrix
+        self._ids = ids
+        self._ts = ts
+        self._known = set(ids)
+
+    def _window_mask(self, ts: List[float]) -> Optional["np.ndarray"]:
+        if self.window_sec <= 0 or not ts:
+            return None
+        mask = np.asarray(ts, dtype=np.float64) >= time.time() - self.window_sec
+        return None if bool(mask.all()) else mask
+
+    def _blocks(self) -> List["np.ndarray"]:
+        blocks = []
+        if self._stored is not None and len(self._stored):
+            blocks.append(self._stored)
+        if self._recent is not None and self._recent_count:
+            blocks.append(self._recent[: self._recent_count])
+        return blocks
+
+    def _reset(self, dim: int) -> None:
+        self.dim = dim
+        self._stored = None
+        self._recent = None
+        self._recent_count = 0
+        self._ids, self._ts, self._known = [], [], set()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._ids)
+
+    def query(self, values: Sequence[float]) -> Optional[float]:
+        # 返回与索引中最相近向量的余弦相似度；索引为空时返回 0.0
+        vec = normalize_vector(values)
+        if vec is None:
+            return None
+        started = time.perf_counter()
+        best = 0.0
+        with self._lock:
+            if self.dim and vec.shape[0] != self.dim:
+                return None
+            for block in self._blocks():
+                scores = block @ vec
+                if self.int8:
+                    scores = scores / INT8_SCALE
+                best = max(best, float(scores.max()))
+            self.stats["queries"] += 1
+            self.stats["query_sec"] += time.perf_counter() - started
+        return best
+
+    def add(self, item_id: str, values: Sequence[float], ts: Optional[float] = None) -> bool:
+        vec = normalize_vector(values)
+        if vec is None:
+            return False
+        with self._lock:
+            if item_id in self._known:
+                return False
+            if self.dim and vec.shape[0] != self.dim:
+                # 向量维度变化说明换了 embedding 模型，旧向量不再可比
+                self._reset(vec.shape[0])
+            self.dim = vec.shape[0]
+            if self._recent is None:
+                self._recent = np.zeros((64, self.dim), dtype=self._dtype)
+            elif self._recent_count == len(self._recent):
+                grown = np.zeros((len(self._recent) * 2, self.dim), dtype=self._dtype)
+                grown[: self._recent_count] = self._recent
+                self._recent = grown
+            self._recent[self._recent_count] = self._encode(vec)
+            self._recent_count += 1
+            self._ids.append(item_id)
+            self._ts.append(time.time() if ts is None else ts)
+            self._known.add(item_id)
+            self.stats["added"] += 1
+        return True
+
+    def save(self) -> None:
+        with self._lock:
+            blocks = self._blocks()
+            if not blocks:
+                return
+            # 复制到内存，替换 vectors.npy 前要释放旧文件的 memmap（Windows 上仍被映射的文件无法替换）
+            matrix = np.concatenate([np.asarray(b) for b in blocks]) if len(blocks) > 1 else np.array(blocks[0])
+            del blocks
+            ids, ts = list(self._ids), list(self._ts)
+            keep = self._window_mask(ts)
+            if keep is not None:
+                self.stats["expired"] += len(ids) - int(keep.sum())
+                matrix = matrix[keep]
+                ids = [i for i, k in zip(ids, keep) if k]
+                ts = [t for t, k in zip(ts, keep) if k]
+            # 先写临时文件再替换，避免中途退出留下不一致的索引
+            tmp_vectors = self.dir / "vectors.tmp.npy"
+            tmp_meta = self.dir / "meta.tmp.json"
+            np.save(tmp_vectors, matrix)
+            with tmp_meta.open("w", encoding="utf-8") as f:
+                json.dump({"dim": self.dim, "dtype": "int8" if self.int8 else "float32", "ids": ids, "ts": ts}, f)
+            self._stored = None
+            os.replace(tmp_vectors, self._vectors_path())
+            os.replace(tmp_meta, self._meta_path())
+            self._stored = np.load(self._vectors_path(), mmap_mode="r")
+            self._recent = None
+            self._recent_count = 0
+            self._ids, self._ts, self._known = ids, ts, set(ids)
+
+    def summary(self) -> Dict[str, Any]:
+        with self._lock:
+            queries = self.stats["queries"]
+            return {
+                "size": len(self._ids),
+                "dim": self.dim,
+                "dtype": "int8" if self.int8 else "float32",
+                "queries": queries,
+                "avg_query_us": self.stats["query_sec"] / queries * 1e6 if queries else 0.0,
+                "added": self.stats["added"],
+                "expired": self.stats["expired"],
+            }
@@ -0,0 +1,173 @@
+# -*- coding: utf-8 -*-
+import json
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Set
+
+Vector = Dict[str, Any]
+
+
+# Vectorize 批量 upsert：worker 只入队，后台线程按条数或等待时长批量提交。
+# upsert_many 返回 False 表示记录级失败（请求被拒），对半拆分重试，单条坏数据只影响自己；
+# 抛出异常表示整批问题（网络、429、5xx），不拆分并进入降级，同批剩余部分直接留到收尾重试。
+# 单独提交仍被拒两次的向量直接丢弃；其余失败的向量在 close 时写入 spill 文件，下次启动时重新入队。
+class VectorUpsertWriter:
+    def __init__(
+        self,
+        upsert_many: Callable[[List[Vector]], bool],
+        batch_size: int = 100,
+        max_age_sec: float = 5.0,
+        spill_path: str = "",
+        log: Callable[[str], None] = print,
+    ) -> None:
+        self.upsert_many = upsert_many
+        self.batch_size = max(1, batch_size)
+        self.max_age_sec = max_age_sec
+        self.spill_path = Path(spill_path) if spill_path else None
+        self.log = log
+        self.stats = {"batches": 0, "vectors_ok": 0, "vectors_failed": 0, "vectors_dropped": 0, "splits": 0, "restored": 0}
+
+        self._pending: List[Vector] = []
+        self._failed: List[Vector] = []
+        self._oldest = 0.0
+        self._degraded = False
+        self._rejected: Set[str] = set()
+        self._cond = threading.Condition()
+        self._flush_lock = threading.Lock()
+        self._closed = False
+        self._restore()
+        self._thread = threading.Thread(target=self._loop, name="vectorize-writer", daemon=True)
+        self._thread.start()
+
+    def add(self, vector: Vector) -> None:
+        with self._cond:
+            first = not self._pending
+            if first:
+                self._oldest = time.monotonic()
+            self._pending.append(vector)
+            # 第一条入队时唤醒后台线程开始计时，凑满一批时立即提交
+            if first or len(self._pending) >= self.batch_size:
+                self._cond.notify()
+
+    def pending(self) -> int:
+        with self._cond:
+            return len(self._pending)
+
+    def flush(self) -> None:
+        with self._flush_lock:
+            while True:
+                with self._cond:
+                    batch = self._pending[: self.batch_size]
+                    self._pending = self._pending[self.batch_size:]
+                    if self._pending:
+                        self._oldest = time.monotonic()
+                if not batch:
+                    return
+                self._write(batch)
+
+    def close(self) -> None:
+        with self._cond:
+            self._closed = True
+            self._cond.notify()
+        self._thread.join()
+        self.flush()
+        self.retry_failed()
+        self._spill()
+
+    def retry_failed(self) -> None:
+        # 本轮失败的向量在收尾时再重试一次，服务可能已经恢复，先解除降级
+        with self._cond:
+            if not self._failed:
+                return
+            self._degraded = False
+            self.stats["vectors_failed"] -= len(self._failed)
+            self._pending.extend(self._failed)
+            self._failed = []
+        self.flush()
+
+    def _loop(self) -> None:
+        while True:
+            with self._cond:
+                while not self._closed and not self._due():
+                    self._cond.wait(timeout=self._wait_sec())
+                if self._closed:
+                    return
+            self.flush()
+
+    def _due(self) -> bool:
+        if not self._pending:
+            return False
+        if len(self._pending) >= self.batch_size:
+            return True
+        return self.max_age_sec <= 0 or time.monotonic() - self._oldest >= self.max_age_sec
+
+    def _wait_sec(self) -> Optional[float]:
+        if not self._pending:
+            return None
+        return max(0.05, self.max_age_sec - (time.monotonic() - self._oldest))
+
+    def _write(self, batch: List[Vector]) -> None:
+        self.stats["batches"] += 1
+        try:
+            ok = self.upsert_many(batch)
+        except Exception as exc:
+            self.log(f"[Vectorize] batch upsert failed: {exc}")
+            self._degraded = True
+            self._fail(batch)
+            return
+        self._degraded = False
+        if ok:
+            self.stats["vectors_ok"] += len(batch)
+            return
+        if len(batch) > 1:
+            self.stats["splits"] += 1
+            mid = len(batch) // 2
+            self._write(batch[:mid])
+            if self._degraded:
+                self._fail(batch[mid:])
+            else:
+                self._write(batch[mid:])
+            return
+        key = str(batch[0].get("id") or "")
+        if key in self._rejected:
+            self.stats["vectors_dropped"] += 1
+            self.log(f"[Vectorize] drop rejected vector id={key}")
+            return
+        self._rejected.add(key)
+        self._fail(batch)
+
+    def _fail(self, batch: List[Vector]) -> None:
+        self.stats["vectors_failed"] += len(batch)
+        self._failed.extend(batch)
+
+    def _restore(self) -> None:
+        if self.spill_path is None or not self.spill_path.exists():
+            return
+        try:
+            with self.spill_path.open("r", encoding="utf-8") as f:
+                vectors = [json.loads(line) for line in f if line.strip()]
+            self.spill_path.unlink()
+        except (OSError, ValueError) as exc:
+            self.log(f"[Vectorize] restore pending upserts failed: {exc}")
+            return
+        if vectors:
+            self._pending.extend(vectors)
+            self._oldest = time.monotonic()
+            self.stats["restored"] = len(vectors)
+            self.log(f"[Vectorize] restored {len(vectors)} pending upserts from {self.spill_path}")
+
+    def _spill(self) -> None:
+        if not self._failed:
+            return
+        if self.spill_path is None:
+            self.log(f"[Vectorize] dropped {len(self._failed)} failed upserts")
+            return
+        try:
+            self.spill_path.parent.mkdir(parents=True, exist_ok=True)
+            with self.spill_path.open("w", encoding="utf-8") as f:
+                for vector in self._failed:
+                    f.write(json.dumps(vector, ensure_ascii=False) + "\n")
+            self.log(f"[Vectorize] saved {len(self._failed)} failed upserts to {self.spill_path}")
+        except OSError as exc:
+            self.log(f"[Vectorize] save failed upserts failed: {exc}")